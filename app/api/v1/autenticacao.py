@@ -9,6 +9,7 @@ from app.db import get_db  # Função para obter sessão do banco
 from app import models as m  # Modelos ORM
 from app.core import security  # Funções de segurança (hash, JWT)
 from app.utils.logs import registrar_log  # Função para registrar logs de auditoria
+from app.core.escopo import vincular_por_email  # Vínculo usuário → paciente/médico
 
 roteador = APIRouter()  # Cria roteador FastAPI para este módulo
 
@@ -139,6 +140,8 @@ def registrar(
         email: str = Form(..., description="Email do novo usuário"),
         password: str = Form(..., description="Senha do novo usuário"),
         papel: Optional[str] = Form("PACIENTE", description="Papel do usuário: PACIENTE, MEDICO ou ADMIN"),
+        paciente_id: Optional[int] = Form(None, description="Paciente do usuário PACIENTE (padrão: mesmo email)"),
+        medico_id: Optional[int] = Form(None, description="Médico do usuário MEDICO (padrão: mesmo email)"),
         db: Session = Depends(get_db),
         current_user=Depends(obter_usuario_atual)
 ):
@@ -146,6 +149,8 @@ def registrar(
     🧾 **Registrar Novo Usuário**
 
     Cria novo usuário no sistema, respeitando permissões de ADMIN.
+    Usuários PACIENTE/MEDICO são vinculados ao cadastro informado (apenas ADMIN)
+    ou ao de mesmo email; o vínculo define o que o usuário vê nas listagens.
     """
     # Verifica duplicidade de email
     if db.query(m.Usuario).filter(m.Usuario.email == email).first():
@@ -159,9 +164,22 @@ def registrar(
     if papel not in ["PACIENTE", "MEDICO", "ADMIN"]:
         papel = "PACIENTE"
 
+    # Vínculo explícito com paciente/médico
+    if (paciente_id is not None or medico_id is not None) and current_user.get("papel") != "ADMIN":
+        raise HTTPException(status_code=403, detail="Apenas ADMIN pode vincular usuários a pacientes ou médicos")
+    if (paciente_id is not None and papel != "PACIENTE") or (medico_id is not None and papel != "MEDICO"):
+        raise HTTPException(status_code=400, detail="Vínculo incompatível com o papel do usuário")
+    if paciente_id is not None and not db.query(m.Paciente.id).filter(m.Paciente.id == paciente_id).first():
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    if medico_id is not None and not db.query(m.Medico.id).filter(m.Medico.id == medico_id).first():
+        raise HTTPException(status_code=404, detail="Médico não encontrado")
+
     # Criptografa senha e salva usuário
     hashed_password = security.hash_password(password)
-    usuario = m.Usuario(email=email, hashed_password=hashed_password, papel=papel)
+    usuario = m.Usuario(
+        email=email, hashed_password=hashed_password, papel=papel, paciente_id=paciente_id, medico_id=medico_id
+    )
+    vincular_por_email(db, usuario)  # Sem vínculo explícito: cadastro de mesmo email
 
     db.add(usuario)
     db.commit()
@@ -183,7 +201,13 @@ def registrar(
         detalhes=f"Usuário {usuario.email} criado com papel {papel}"
     )
 
-    return {"id": usuario.id, "email": usuario.email, "papel": usuario.papel}
+    return {
+        "id": usuario.id,
+        "email": usuario.email,
+        "papel": usuario.papel,
+        "paciente_id": usuario.paciente_id,
+        "medico_id": usuario.medico_id,
+    }
 
 
 # ----------------------------
@@ -222,7 +246,9 @@ def listar_usuarios(
             "email": u.email,
             "papel": u.papel,
             "ativo": u.ativo,
-            "criado_em": u.criado_em
+            "criado_em": u.criado_em,
+            "paciente_id": u.paciente_id,
+            "medico_id": u.medico_id
         } for u in usuarios
     ]
 
@@ -260,5 +286,7 @@ def obter_me(
         "email": usuario.email,
         "papel": usuario.papel,
         "ativo": usuario.ativo,
-        "criado_em": usuario.criado_em
+        "criado_em": usuario.criado_em,
+        "paciente_id": usuario.paciente_id,
+        "medico_id": usuario.medico_id
     }
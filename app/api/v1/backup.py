@@ -1,23 +1,36 @@
-import shutil  # Para cópia de arquivos
-import os  # Operações de sistema (diretórios, caminhos)
-from datetime import datetime  # Para timestamp do backup
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException  # FastAPI
-from fastapi.responses import FileResponse  # Para download de arquivos
+import uuid  # Nome do arquivo temporário da reconstrução
+import zlib  # Compressão em fluxo do banco reconstruído
+from datetime import datetime  # Momento da restauração
+from typing import Optional  # Parâmetros opcionais
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query  # FastAPI
+from fastapi.responses import StreamingResponse  # Download do banco reconstruído
+from sqlalchemy import func  # Totais do catálogo
 from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
 from app.db import get_db  # Função para obter sessão do banco
 from app import models as m  # Modelos ORM
 from app.core import security  # Funções de segurança (JWT, auth)
 from app.utils.logs import registrar_log  # Registro de logs de auditoria
+from app.utils.download import RespostaArquivo  # Download com Range e pathsend
+from app.db.catalogo import DIRETORIO_BACKUPS, SessaoCatalogo  # Diretório e catálogo dos backups
+from app.models import Backup, TipoBackup  # Modelo do catálogo
+from app.schemas.backup import BackupResponse, CatalogoBackups  # Schemas do catálogo
+from app.core.backup import (  # Backup online, incrementais e reconstrução
+    BackupInvalido,
+    BackupNaoEncontrado,
+    OrigemForaDaRetencao,
+    backup_no_momento,
+    caminho_backup,
+    gerar_backup_async,
+    no_worker_backup,
+    reconstruir,
+)
+from app.core.restauracao import BancoEmUso, RestauracaoInvalida, restaurar_arquivo  # Restauração com troca atômica
 
 # ----------------------------
 # Criação do roteador principal
 # ----------------------------
 roteador = APIRouter()
 
-# Diretório onde os arquivos de backup serão armazenados
-BACKUP_DIR = "backups"
-os.makedirs(BACKUP_DIR, exist_ok=True)  # Garante que a pasta exista
-
 
 # ----------------------------
 # Obter usuário atual com email garantido
@@ -45,77 +58,251 @@ def obter_usuario_atual(
     return current_user
 
 
+# Tipo de conteúdo do download por codec
+TIPOS_CODEC = {"gzip": "application/gzip", "zstd": "application/zstd", "nenhum": "application/vnd.sqlite3"}
+
+
+def responder_backup(backup: Backup):
+    """Download do arquivo de um backup do catálogo."""
+    caminho = caminho_backup(backup)
+    if not caminho.is_file():
+        raise HTTPException(status_code=404, detail="Arquivo do backup não encontrado")
+    return RespostaArquivo(
+        caminho,
+        headers={"X-Backup-Id": str(backup.id)},
+        filename=backup.arquivo,
+        media_type=TIPOS_CODEC.get(backup.codec, "application/octet-stream")
+    )
+
+
+# ----------------------------
+# Listar backups do catálogo
+# ----------------------------
+@roteador.get("/listar", response_model=CatalogoBackups, summary="Listar backups", tags=["Backup e Restauração"])
+def listar_backups(
+        tipo: Optional[TipoBackup] = Query(None, description="COMPLETO ou INCREMENTAL"),
+        limite: int = Query(100, ge=1, le=1000),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    📋 **Listar Backups**
+
+    Backups do catálogo, do mais recente para o mais antigo, com tamanho,
+    duração e checksum, além do espaço total ocupado.
+
+    **Somente usuários ADMIN podem executar esta ação.**
+    """
+    if usuario_atual["papel"] != "ADMIN":
+        raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+
+    with SessaoCatalogo() as catalogo:
+        consulta = catalogo.query(Backup)
+        if tipo:
+            consulta = consulta.filter(Backup.tipo == tipo)
+        itens = consulta.order_by(Backup.criado_em.desc(), Backup.id.desc()).limit(limite).all()
+        quantidade, tamanho_total = catalogo.query(func.count(Backup.id), func.coalesce(func.sum(Backup.tamanho), 0)).one()
+        return CatalogoBackups(
+            items=[BackupResponse.model_validate(item) for item in itens],
+            quantidade=quantidade,
+            tamanho_total=tamanho_total
+        )
+
+
 # ----------------------------
 # Gerar backup do banco de dados
 # ----------------------------
 @roteador.get("/exportar", summary="Gerar backup do banco de dados", tags=["Backup e Restauração"])
-def gerar_backup(
+async def gerar_backup(
+        desde: Optional[int] = Query(None, description="ID de um backup anterior: gera um incremental a partir dele"),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
     💾 **Gerar Backup do Banco de Dados**
 
-    Gera uma cópia completa do banco de dados atual e disponibiliza
-    o arquivo `.db` para download.
+    Gera uma cópia consistente do banco de dados em uso (API de backup do
+    SQLite, sem bloquear as escritas), verifica sua integridade e
+    disponibiliza o arquivo para download:
+
+    - sem `desde`: backup completo (`.db.gz`, o banco comprimido)
+    - com `desde`: incremental (`.inc.gz`), só com as páginas alteradas desde aquele backup;
+      400 se a cadeia de `desde` não é mais diária (a retenção não guarda incrementais nela)
+
+    O ID do backup gerado volta no cabeçalho `X-Backup-Id`.
 
     **Somente usuários ADMIN podem executar esta ação.**
     """
     if usuario_atual["papel"] != "ADMIN":
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
 
-    # Define nome do arquivo com timestamp
-    nome_arquivo = f"sghss_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-    caminho_destino = os.path.join(BACKUP_DIR, nome_arquivo)
-
-    # Copia banco de dados atual para backup
-    shutil.copy("sghss.db", caminho_destino)
+    # Cópia, verificação e compressão no worker de backup
+    try:
+        backup = await gerar_backup_async(desde)
+    except BackupNaoEncontrado as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except OrigemForaDaRetencao as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BackupInvalido as e:
+        raise HTTPException(status_code=500, detail=f"Backup falhou na verificação de integridade: {e}")
 
     # Registra log do backup
     registrar_log(
         db,
         usuario_atual["email"],
         "Backup",
+        registro_id=backup.id,
         acao="CREATE",
-        detalhes=f"Backup gerado: {nome_arquivo}"
+        detalhes=(
+            f"Backup {backup.tipo.value.lower()} gerado: {backup.arquivo} "
+            f"({backup.paginas_gravadas}/{backup.total_paginas} páginas, {backup.tamanho} bytes em {backup.duracao:.1f}s)"
+        )
     )
 
     # Retorna arquivo para download
-    return FileResponse(
-        caminho_destino,
-        filename=nome_arquivo,
-        media_type="application/octet-stream"
+    return responder_backup(backup)
+
+
+# ----------------------------
+# Reconstruir o banco em um momento
+# ----------------------------
+@roteador.get("/reconstruir", summary="Reconstruir banco em um momento", tags=["Backup e Restauração"])
+async def reconstruir_backup(
+        momento: Optional[datetime] = Query(None, description="Restaura o último backup feito até este momento"),
+        backup_id: Optional[int] = Query(None, description="Ou um backup específico do catálogo"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    🕒 **Reconstruir Banco em um Momento**
+
+    Monta o banco do último backup até `momento` (ou do `backup_id`):
+    o completo da cadeia mais os incrementais até ele, com checksum e
+    integridade verificados. Retorna o banco comprimido (`.db.gz`),
+    pronto para `/importar`.
+
+    **Somente usuários ADMIN podem executar esta ação.**
+    """
+    if usuario_atual["papel"] != "ADMIN":
+        raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+    if (momento is None) == (backup_id is None):
+        raise HTTPException(status_code=400, detail="Informe momento ou backup_id")
+
+    destino = DIRETORIO_BACKUPS / f".reconstrucao-{uuid.uuid4().hex}.db"
+    try:
+        if momento is not None:
+            backup_id = (await no_worker_backup(backup_no_momento, momento)).id
+        backup = await no_worker_backup(reconstruir, backup_id, destino)
+    except BackupNaoEncontrado as e:
+        destino.unlink(missing_ok=True)
+        raise HTTPException(status_code=404, detail=str(e))
+    except BackupInvalido as e:
+        destino.unlink(missing_ok=True)
+        raise HTTPException(status_code=409, detail=f"Cadeia de backup inválida: {e}")
+    except BaseException:
+        destino.unlink(missing_ok=True)
+        raise
+
+    registrar_log(
+        db,
+        usuario_atual["email"],
+        "Backup",
+        registro_id=backup.id,
+        acao="READ",
+        detalhes=f"Banco reconstruído a partir do backup {backup.id} ({backup.criado_em.isoformat()})"
+    )
+
+    # Comprime em fluxo e remove o arquivo reconstruído ao final
+    def blocos():
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: formato gzip
+        try:
+            with open(destino, "rb") as arquivo:
+                while bloco := arquivo.read(1024 * 1024):
+                    if saida := compressor.compress(bloco):
+                        yield saida
+            yield compressor.flush()
+        finally:
+            destino.unlink(missing_ok=True)
+
+    nome_arquivo = f"sghss_{backup.criado_em.strftime('%Y%m%d_%H%M%S')}.db.gz"
+    return StreamingResponse(
+        blocos(),
+        media_type="application/gzip",
+        headers={
+            "X-Backup-Id": str(backup.id),
+            "Content-Disposition": f'attachment; filename="{nome_arquivo}"'
+        }
+    )
+
+
+# ----------------------------
+# Baixar backup do catálogo
+# ----------------------------
+@roteador.get("/{backup_id}/download", summary="Baixar backup", tags=["Backup e Restauração"])
+def baixar_backup(
+        backup_id: int,
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    ⬇️ **Baixar Backup**
+
+    Baixa o arquivo de um backup do catálogo (completo ou incremental).
+
+    **Somente usuários ADMIN podem executar esta ação.**
+    """
+    if usuario_atual["papel"] != "ADMIN":
+        raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+
+    with SessaoCatalogo() as catalogo:
+        backup = catalogo.get(Backup, backup_id)
+        if not backup:
+            raise HTTPException(status_code=404, detail="Backup não encontrado")
+        catalogo.expunge(backup)
+
+    registrar_log(
+        db,
+        usuario_atual["email"],
+        "Backup",
+        registro_id=backup.id,
+        acao="READ",
+        detalhes=f"Backup baixado: {backup.arquivo}"
     )
+    return responder_backup(backup)
 
 
 # ----------------------------
 # Restaurar banco de dados a partir de um backup
 # ----------------------------
 @roteador.post("/importar", summary="Restaurar banco de dados", tags=["Backup e Restauração"])
-def restaurar_backup(
-        arquivo: UploadFile = File(..., description="Arquivo .db de backup para restaurar"),
+async def restaurar_backup(
+        arquivo: UploadFile = File(..., description="Backup para restaurar: .db, .db.gz ou .db.zst"),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
     🔄 **Restaurar Banco de Dados a partir de um Backup**
 
-    Permite restaurar o banco de dados do sistema a partir de um arquivo `.db` de backup.
+    Permite restaurar o banco de dados do sistema a partir de um backup
+    completo, comprimido ou não (o formato é detectado pelo conteúdo).
+
+    - O arquivo é descomprimido em blocos para um arquivo temporário
+    - Integridade e versão do schema são verificadas antes da troca
+    - As requisições aguardam enquanto o arquivo é trocado de forma atômica;
+      bancos de versões anteriores recebem as migrações atuais
+
+    **Somente usuários ADMIN podem executar esta ação.**
     """
     if usuario_atual["papel"] != "ADMIN":
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+    db.close()  # Devolve a conexão ao pool antes da troca
 
-    # Valida extensão do arquivo
-    if not arquivo.filename.endswith(".db"):
-        raise HTTPException(status_code=400, detail="Arquivo inválido. Envie um .db")
-
-    # Salva arquivo temporário na pasta de backup
-    caminho_temp = os.path.join(BACKUP_DIR, arquivo.filename)
-    with open(caminho_temp, "wb") as buffer:
-        buffer.write(arquivo.file.read())
-
-    # Substitui banco de dados atual pelo backup
-    shutil.copy(caminho_temp, "sghss.db")
+    # Descompressão, validação e troca no worker de backup (nunca junto com um backup)
+    try:
+        versao = await no_worker_backup(restaurar_arquivo, arquivo.file, DIRETORIO_BACKUPS)
+    except RestauracaoInvalida as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BancoEmUso as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
     # Registra log da restauração
     registrar_log(
@@ -123,7 +310,7 @@ def restaurar_backup(
         usuario_atual["email"],
         "Backup",
         acao="UPDATE",
-        detalhes=f"Banco restaurado a partir de {arquivo.filename}"
+        detalhes=f"Banco restaurado a partir de {arquivo.filename} (schema versão {versao})"
     )
 
     return {"detail": "Banco de dados restaurado com sucesso"}
@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status  # FastAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, status  # FastAPI
 from sqlalchemy.orm import Session  # Sessão ORM
-from sqlalchemy import and_, func  # Funções SQL para filtros avançados
+from sqlalchemy import and_, func, tuple_  # Funções SQL para filtros avançados e comparação de tuplas
 from typing import Optional
+import os  # Variáveis de ambiente
 from datetime import datetime, timedelta  # Datas e manipulação de tempo
 
 from app.db import get_db  # Sessão do banco
 from app.models.medical import Consulta, Paciente, Medico, StatusConsulta, PapelUsuario, Usuario  # Modelos
 from app.core import security  # Autenticação e segurança
 from app.utils.logs import registrar_log  # Logs de auditoria
+from app.utils.paginacao import codificar_cursor, decodificar_cursor  # Cursores opacos (keyset)
+from app.utils.cache import CacheTTL  # Totais de listagem em cache
+from app.core.escopo import aplicar_escopo, escopo_do_usuario, no_escopo  # Escopo por papel
+from app.utils.datas import data_br, hora_br  # Datas dd/mm/yyyy e HH:MM sem strftime
+from app.utils.respostas import RespostaJSON  # JSON com orjson
 
 # ----------------------------
 # Roteador FastAPI para consultas
 # ----------------------------
 roteador = APIRouter()
 
+# Totais de `listar_consultas` por conjunto de filtros (limpos a cada alteração de consulta)
+TOTAIS_CONSULTAS = CacheTTL(float(os.getenv("CACHE_TOTAL_CONSULTAS_SEGUNDOS", 30)))
+
 
 # ==========================
 # FUNÇÕES AUXILIARES
@@ -40,8 +49,8 @@ def formatar_data_hora(dt: datetime) -> dict:
     Formata um objeto datetime em dicionário legível para data e hora.
     """
     return {
-        "data_consulta": dt.strftime("%d/%m/%Y"),
-        "hora_consulta": dt.strftime("%H:%M")
+        "data_consulta": data_br(dt),
+        "hora_consulta": hora_br(dt)
     }
 
 
@@ -55,7 +64,7 @@ def obter_usuario_atual(
     """
     usuario_email = current_user.get("email")
     if not usuario_email:
-        usuario = db.query(Usuario).filter(Usuario.id == int(current_user.get("sub"))).first()
+        usuario = db.query(Usuario).filter(Usuario.id == int(current_user.get("id"))).first()
         if usuario:
             usuario_email = usuario.email
             current_user["email"] = usuario.email
@@ -121,6 +130,7 @@ def criar_consulta(
 
     db.add(nova_consulta)
     db.commit()
+    TOTAIS_CONSULTAS.limpar()  # Totais em cache deixam de valer
     db.refresh(nova_consulta)
 
     # Log da criação
@@ -149,30 +159,30 @@ def criar_consulta(
 # ==========================
 @roteador.get("/")
 def listar_consultas(
-        pagina: int = 1,
-        tamanho: int = 20,
+        cursor: Optional[str] = None,
+        tamanho: int = Query(20, ge=1, le=200),
         status_filtro: Optional[str] = None,
         medico_id: Optional[int] = None,
         paciente_id: Optional[int] = None,
+        incluir_total: bool = False,
         usuario_atual=Depends(obter_usuario_atual),
         db: Session = Depends(get_db)
 ):
     """
     Lista consultas com paginação e filtros opcionais.
-    - Paciente: só suas consultas
-    - Médico: só suas consultas
+    - Paciente: só suas consultas (paciente vinculado ao usuário)
+    - Médico: só suas consultas (médico vinculado ao usuário)
     - Admin: todas as consultas
-    """
-    papel = usuario_atual.get("papel")
-    user_id = int(usuario_atual.get("sub")) if usuario_atual.get("sub") else None
-
-    query = db.query(Consulta)
 
-    if papel == PapelUsuario.PACIENTE.value:
-        query = query.filter(Consulta.paciente_id == user_id)
-    elif papel == PapelUsuario.MEDICO.value:
-        query = query.filter(Consulta.medico_id == user_id)
+    Paginação por cursor sobre (data_hora, id), da mais recente para a mais antiga:
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    - **tamanho**: itens por página (1 a 200)
+    - **incluir_total**: inclui o total do filtro (mantido em cache por alguns segundos)
+    """
+    escopo = escopo_do_usuario(usuario_atual)
+    query = aplicar_escopo(db.query(Consulta), escopo, Consulta.paciente_id, Consulta.medico_id)
 
+    status_enum = None
     if status_filtro:
         try:
             status_enum = StatusConsulta(status_filtro.lower())
@@ -185,8 +195,22 @@ def listar_consultas(
     if paciente_id:
         query = query.filter(Consulta.paciente_id == paciente_id)
 
-    total = query.count()
-    itens = query.offset((pagina - 1) * tamanho).limit(tamanho).all()
+    # Total do filtro (sem o cursor), compartilhado entre as páginas
+    total = None
+    if incluir_total:
+        chave = (escopo.chave, status_enum, medico_id, paciente_id)
+        total = TOTAIS_CONSULTAS.obter(chave, lambda: query.order_by(None).count())
+
+    if cursor:
+        data_cursor, id_cursor = decodificar_cursor(cursor)
+        query = query.filter(tuple_(Consulta.data_hora, Consulta.id) < tuple_(data_cursor, id_cursor))
+
+    # Busca um item a mais para saber se existe próxima página
+    itens = query.order_by(Consulta.data_hora.desc(), Consulta.id.desc()).limit(tamanho + 1).all()
+    proximo_cursor = None
+    if len(itens) > tamanho:
+        itens = itens[:tamanho]
+        proximo_cursor = codificar_cursor(itens[-1].data_hora, itens[-1].id)
 
     # Log de leitura
     registrar_log(
@@ -194,7 +218,7 @@ def listar_consultas(
         usuario_email=usuario_atual.get("email"),
         tabela="consultas",
         acao="READ",
-        detalhes=f"{usuario_atual.get('email')} listou consultas (página {pagina})"
+        detalhes=f"{usuario_atual.get('email')} listou consultas ({'continuação' if cursor else 'primeira página'})"
     )
 
     resultado = []
@@ -209,7 +233,7 @@ def listar_consultas(
             "observacoes": c.observacoes
         })
 
-    return {"items": resultado, "total": total}
+    return RespostaJSON({"items": resultado, "proximo_cursor": proximo_cursor, "total": total})
 
 
 # ==========================
@@ -229,12 +253,7 @@ def obter_consulta(
     if not consulta:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
 
-    papel = usuario_atual.get("papel")
-    user_id = int(usuario_atual.get("sub")) if usuario_atual.get("sub") else None
-
-    if papel == PapelUsuario.PACIENTE.value and consulta.paciente_id != user_id:
-        raise HTTPException(status_code=403, detail="Sem permissão")
-    if papel == PapelUsuario.MEDICO.value and consulta.medico_id != user_id:
+    if not no_escopo(escopo_do_usuario(usuario_atual), consulta.paciente_id, consulta.medico_id):
         raise HTTPException(status_code=403, detail="Sem permissão")
 
     registrar_log(
@@ -279,12 +298,9 @@ def atualizar_consulta(
     if not consulta:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
 
-    papel = usuario_atual.get("papel")
-    user_id = int(usuario_atual.get("sub")) if usuario_atual.get("sub") else None
-
-    if papel == PapelUsuario.PACIENTE.value:
+    if usuario_atual.get("papel") == PapelUsuario.PACIENTE.value:
         raise HTTPException(status_code=403, detail="Pacientes não podem alterar consultas")
-    if papel == PapelUsuario.MEDICO.value and consulta.medico_id != user_id:
+    if not no_escopo(escopo_do_usuario(usuario_atual), consulta.paciente_id, consulta.medico_id):
         raise HTTPException(status_code=403, detail="Sem permissão")
 
     if status_update:
@@ -300,6 +316,7 @@ def atualizar_consulta(
         consulta.observacoes = observacoes
 
     db.commit()
+    TOTAIS_CONSULTAS.limpar()  # Totais em cache deixam de valer
     db.refresh(consulta)
 
     registrar_log(
@@ -339,16 +356,12 @@ def cancelar_consulta(
     if not consulta:
         raise HTTPException(status_code=404, detail="Consulta não encontrada")
 
-    papel = usuario_atual.get("papel")
-    user_id = int(usuario_atual.get("sub")) if usuario_atual.get("sub") else None
-
-    if papel == PapelUsuario.PACIENTE.value and consulta.paciente_id != user_id:
-        raise HTTPException(status_code=403, detail="Sem permissão")
-    if papel == PapelUsuario.MEDICO.value and consulta.medico_id != user_id:
+    if not no_escopo(escopo_do_usuario(usuario_atual), consulta.paciente_id, consulta.medico_id):
         raise HTTPException(status_code=403, detail="Sem permissão")
 
     consulta.status = StatusConsulta.CANCELADA
     db.commit()
+    TOTAIS_CONSULTAS.limpar()  # Totais em cache deixam de valer
     db.refresh(consulta)
 
     registrar_log(
@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Header, Query  # Importações FastAPI
+from fastapi.responses import StreamingResponse  # Resposta em fluxo contínuo
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+from typing import Optional  # Tipagens
+import asyncio  # Espera com timeout pelo próximo evento
+import json  # Serialização dos eventos
+from app.db import get_db  # Sessão do banco
+from app import models as m  # Models do projeto
+from app.core import security  # Autenticação e segurança
+from app.core.eventos import barramento_eventos, Evento  # Pub/sub em processo
+
+roteador = APIRouter()  # Inicializa o roteador de endpoints desta rota
+
+TOPICOS = {"leito", "suprimento"}  # Tópicos publicados pelos roteadores
+INTERVALO_HEARTBEAT = 15  # Segundos sem eventos até enviar um comentário de keep-alive
+RETRY_MS = 3000  # Intervalo de reconexão sugerido ao EventSource
+
+
+# ============================================================
+# Função auxiliar: obter usuário atual garantindo campo "email"
+# ============================================================
+def obter_usuario_atual(
+        current_user=Depends(security.get_current_user),
+        db: Session = Depends(get_db)
+):
+    """
+    Retorna o usuário autenticado garantindo que o campo 'email' esteja presente.
+    """
+    usuario_email = current_user.get("email")
+    if not usuario_email:  # Se o token não tiver email
+        usuario = db.query(m.Usuario).filter(m.Usuario.id == int(current_user.get("id"))).first()
+        if usuario:
+            usuario_email = usuario.email
+            current_user["email"] = usuario.email  # Atualiza dicionário
+    return current_user  # Retorna usuário com email garantido
+
+
+# ============================================================
+# Função auxiliar: formatar evento no protocolo SSE
+# ============================================================
+def formatar_sse(evento: Evento) -> str:
+    """
+    Converte o evento em uma mensagem Server-Sent Events.
+    O `id` é o número de sequência, reenviado pelo navegador em
+    `Last-Event-ID` ao reconectar.
+    """
+    dados = json.dumps({
+        "seq": evento.seq,
+        "topico": evento.topico,
+        "acao": evento.acao,
+        "dados": evento.dados,
+        "data_hora": evento.data_hora.isoformat()
+    }, default=str, ensure_ascii=False)
+    return f"id: {evento.seq}\nevent: {evento.topico}\ndata: {dados}\n\n"
+
+
+# ============================================================
+# STREAM DE EVENTOS (SSE)
+# ============================================================
+@roteador.get("/stream")
+async def stream_eventos(
+        request: Request,
+        topicos: Optional[str] = Query(None, description="Tópicos separados por vírgula (leito, suprimento)"),
+        ala: Optional[str] = Query(None, description="Recebe apenas eventos de leitos desta ala"),
+        desde: Optional[int] = Query(None, description="Último número de sequência recebido"),
+        last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Fluxo Server-Sent Events com as alterações de leitos e suprimentos.
+
+    - **Acesso:** ADMIN ou MEDICO
+    - Cada mensagem traz `id` (sequência), `event` (tópico) e `data` (JSON)
+    - Ao reconectar, o navegador envia `Last-Event-ID` e recebe os eventos
+      perdidos; se já não estiverem em memória, recebe um evento `reset`
+      e deve recarregar o estado pelas rotas de listagem
+    - Comentários de keep-alive a cada 15 s sem eventos
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    db.close()  # Conexão não é necessária durante o fluxo
+
+    filtro_topicos = None
+    if topicos:
+        filtro_topicos = {t.strip().lower() for t in topicos.split(",") if t.strip()}
+        desconhecidos = filtro_topicos - TOPICOS
+        if desconhecidos:
+            raise HTTPException(status_code=400, detail=f"Tópicos inválidos: {', '.join(sorted(desconhecidos))}")
+
+    if last_event_id and last_event_id.strip().isdigit():
+        desde = int(last_event_id)  # Reconexão automática do EventSource tem prioridade
+
+    assinatura, pendentes, lacuna = barramento_eventos.assinar(filtro_topicos, ala, desde)
+    seq_inscricao = barramento_eventos.sequencia_atual
+
+    async def gerar():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if lacuna:
+                yield f"id: {seq_inscricao}\nevent: reset\ndata: {{}}\n\n"
+            for evento in pendentes:
+                yield formatar_sse(evento)
+
+            while not (assinatura.atrasada and assinatura.fila.empty()):
+                try:
+                    evento = await asyncio.wait_for(assinatura.fila.get(), timeout=INTERVALO_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield formatar_sse(evento)
+            # Cliente lento (fila encheu): entrega o que já está na fila e encerra;
+            # o EventSource reconecta com Last-Event-ID e recupera o restante do histórico
+        finally:
+            barramento_eventos.cancelar(assinatura)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,12 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status  # FastAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form  # FastAPI
 from sqlalchemy.orm import Session  # Sessão ORM
+from sqlalchemy.exc import IntegrityError  # Conflito ao criar a linha de saldo
+from sqlalchemy import func, tuple_  # Agregação e comparação de tuplas
+from sqlalchemy.dialects import postgresql, sqlite  # INSERT ... ON CONFLICT DO NOTHING
 from typing import List, Optional
-from datetime import datetime, date  # Datas e manipulação
+from pathlib import Path  # Extensão do arquivo enviado
+import calendar  # Último dia do mês
+import codecs  # Validação da codificação informada
+import io  # Leitura do upload como texto em streaming
+from datetime import datetime, date, timedelta  # Datas e manipulação
+from decimal import Decimal  # Valores monetários exatos
 from app.db import get_db  # Sessão do banco
 from app import models as m  # Import de models (Financeiro, Usuario)
 from app.core import security  # Autenticação
-from app.schemas.financeiro import FinanceiroResponse, ResumoFinanceiroResponse  # Schemas de retorno
+from app.core.livro_caixa import LivroCaixa, para_centavos, de_centavos  # Motor do livro caixa
+from app.schemas.financeiro import (  # Schemas de retorno
+    FinanceiroResponse,
+    PaginaFinanceiroResponse,
+    ResumoFinanceiroResponse,
+    ItemResumoFinanceiro,
+    FechamentoFinanceiroResponse,
+    ItemFechamentoFinanceiro,
+    ImportacaoFinanceiraResponse,
+)
 from app.utils.logs import registrar_log  # Logs de auditoria
+from app.utils.paginacao import codificar_cursor, decodificar_cursor  # Cursores de paginação
+from app.utils.importacao import ler_csv, ler_ofx  # Leitores de extratos para importação
 
 # ----------------------------
 # Roteador FastAPI para financeiro
@@ -34,6 +53,96 @@ def obter_usuario_atual(
     return current_user
 
 
+# ----------------------------
+# Agregações do livro financeiro
+# ----------------------------
+# Expressões de agrupamento aceitas pelo resumo (SQLite strftime)
+AGRUPAMENTOS_RESUMO = {
+    "dia": lambda: func.strftime("%Y-%m-%d", m.Financeiro.data),
+    "semana": lambda: func.strftime("%Y-W%W", m.Financeiro.data),
+    "mes": lambda: func.strftime("%Y-%m", m.Financeiro.data),
+    "categoria": lambda: m.Financeiro.descricao,
+}
+
+
+def filtrar_periodo(query, data_inicial: Optional[date], data_final: Optional[date]):
+    """
+    Aplica limites de data independentes à consulta.
+    `data_final` é inclusiva (considera o dia inteiro).
+    """
+    if data_inicial:
+        query = query.filter(m.Financeiro.data >= data_inicial)
+    if data_final:
+        query = query.filter(m.Financeiro.data < data_final + timedelta(days=1))
+    return query
+
+
+def totais_por_tipo(
+        db: Session,
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        tipo: Optional[str] = None
+) -> dict:
+    """
+    Calcula entradas, saídas e quantidade com um único `GROUP BY tipo`.
+    Retorna {"ENTRADA": (centavos, qtd), "SAIDA": (centavos, qtd)}.
+    """
+    query = db.query(
+        m.Financeiro.tipo,
+        func.coalesce(func.sum(m.Financeiro.valor_centavos), 0),
+        func.count(m.Financeiro.id)
+    )
+    query = filtrar_periodo(query, data_inicial, data_final)
+    if tipo:
+        query = query.filter(m.Financeiro.tipo == tipo)
+
+    totais = {"ENTRADA": (0, 0), "SAIDA": (0, 0)}
+    for tipo, soma, quantidade in query.group_by(m.Financeiro.tipo).all():
+        totais[tipo] = (int(soma), quantidade)
+    return totais
+
+
+def obter_saldo(db: Session) -> m.SaldoFinanceiro:
+    """
+    Retorna a linha de saldo corrente, criando-a a partir do
+    agregado da tabela `financeiro` na primeira utilização.
+    """
+    saldo = db.get(m.SaldoFinanceiro, 1)
+    if saldo:
+        return saldo
+
+    totais = totais_por_tipo(db)
+    db.add(m.SaldoFinanceiro(
+        id=1,
+        entradas_centavos=totais["ENTRADA"][0],
+        saidas_centavos=totais["SAIDA"][0],
+        quantidade=totais["ENTRADA"][1] + totais["SAIDA"][1],
+        atualizado_em=datetime.now()
+    ))
+    try:
+        db.commit()
+    except IntegrityError:  # Outra requisição criou a linha primeiro
+        db.rollback()
+    return db.get(m.SaldoFinanceiro, 1)
+
+
+def acumular_saldo(db: Session, tipo: str, centavos: int, quantidade: int = 1):
+    """
+    Incrementa o saldo corrente com um UPDATE atômico no banco
+    (sem ler-modificar-gravar em Python). Deve ser chamado na mesma
+    transação que insere a movimentação.
+    """
+    coluna = m.SaldoFinanceiro.entradas_centavos if tipo == "ENTRADA" else m.SaldoFinanceiro.saidas_centavos
+    db.query(m.SaldoFinanceiro).filter(m.SaldoFinanceiro.id == 1).update(
+        {
+            coluna: coluna + centavos,
+            m.SaldoFinanceiro.quantidade: m.SaldoFinanceiro.quantidade + quantidade,
+            m.SaldoFinanceiro.atualizado_em: datetime.now(),
+        },
+        synchronize_session=False
+    )
+
+
 # ----------------------------
 # Registrar movimentação financeira
 # ----------------------------
@@ -41,7 +150,7 @@ def obter_usuario_atual(
 def registrar_movimento(
         tipo: str,
         descricao: str,
-        valor: float,
+        valor: Decimal,
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
@@ -50,7 +159,7 @@ def registrar_movimento(
 
     - **tipo**: ENTRADA ou SAIDA
     - **descricao**: texto descritivo da movimentação
-    - **valor**: valor numérico da operação
+    - **valor**: valor numérico da operação (armazenado em centavos)
     """
     if usuario_atual.get("papel") != "ADMIN":
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
@@ -59,15 +168,26 @@ def registrar_movimento(
     if tipo_upper not in ["ENTRADA", "SAIDA"]:
         raise HTTPException(status_code=400, detail="Tipo deve ser ENTRADA ou SAIDA")
 
+    try:
+        centavos = para_centavos(valor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if centavos <= 0:
+        raise HTTPException(status_code=400, detail="Valor deve ser maior que zero")
+
+    # Garante a linha de saldo antes de inserir (a inicialização não conta o novo registro)
+    obter_saldo(db)
+
     # Criação do registro financeiro
     novo = m.Financeiro(
         tipo=tipo_upper,
         descricao=descricao.strip(),
-        valor=float(valor),
+        valor_centavos=centavos,
         data=datetime.now()
     )
 
     db.add(novo)
+    acumular_saldo(db, tipo_upper, centavos)  # Mesmo commit da movimentação
     db.commit()
     db.refresh(novo)
 
@@ -78,39 +198,216 @@ def registrar_movimento(
         tabela="Financeiro",
         registro_id=novo.id,
         acao="CREATE",
-        detalhes=f"Movimentação '{tipo_upper}' registrada: {descricao} | Valor: {valor:.2f}"
+        detalhes=f"Movimentação '{tipo_upper}' registrada: {descricao} | Valor: {de_centavos(centavos)}"
     )
 
     return novo
 
 
+# ----------------------------
+# Importação em lote (CSV/OFX)
+# ----------------------------
+TAMANHO_LOTE_IMPORTACAO = 5000  # Linhas por transação
+MAX_ERROS_RELATADOS = 50  # Mensagens de erro devolvidas na resposta
+LEITORES_IMPORTACAO = {"csv": ler_csv, "ofx": ler_ofx}
+
+
+def gravar_lote_importacao(db: Session, lote: list) -> dict:
+    """
+    Insere um lote de movimentações importadas em uma única transação com
+    `INSERT ... ON CONFLICT (hash_importacao) DO NOTHING`: o índice único
+    descarta as linhas já importadas, inclusive por outra importação
+    simultânea, e o RETURNING traz só as linhas de fato inseridas, que
+    acumulam o saldo corrente uma vez por tipo.
+    Retorna {"ENTRADA": (centavos, qtd), "SAIDA": (centavos, qtd), "duplicados": n}.
+    """
+    F = m.Financeiro
+    inserir = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    comando = (
+        inserir(F)
+        .on_conflict_do_nothing(index_elements=[F.hash_importacao])
+        .returning(F.tipo, F.valor_centavos)
+    )
+    inseridos = db.execute(comando, [
+        {
+            "tipo": mov.tipo,
+            "descricao": mov.descricao,
+            "valor_centavos": mov.valor_centavos,
+            "data": mov.data,
+            "hash_importacao": mov.hash_importacao,
+        }
+        for mov in lote
+    ]).all()
+
+    resultado = {"ENTRADA": (0, 0), "SAIDA": (0, 0), "duplicados": len(lote) - len(inseridos)}
+    for tipo, valor_centavos in inseridos:
+        centavos, quantidade = resultado[tipo]
+        resultado[tipo] = (centavos + valor_centavos, quantidade + 1)
+    for tipo in ("ENTRADA", "SAIDA"):
+        if resultado[tipo][1]:
+            acumular_saldo(db, tipo, *resultado[tipo])
+    db.commit()
+    return resultado
+
+
+@roteador.post("/financeiro/importar", response_model=ImportacaoFinanceiraResponse)
+def importar_movimentos(
+        arquivo: UploadFile = File(..., description="Extrato bancário .csv ou .ofx"),
+        formato: Optional[str] = Form(None, description="csv ou ofx (padrão: extensão do arquivo)"),
+        codificacao: str = Form("utf-8", description="Codificação do arquivo (ex.: utf-8, cp1252)"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    📥 Importar movimentações em lote a partir de um extrato CSV ou OFX.
+
+    - **CSV**: cabeçalho com `data`, `descricao`, `valor` e opcionalmente `tipo`
+      (separador `;` ou `,`; sem `tipo`, valores negativos são SAIDA)
+    - **OFX**: transações `<STMTTRN>`, deduplicadas pelo FITID
+
+    O arquivo é lido em streaming, linhas já importadas são ignoradas pelo
+    hash e as inserções são feitas em lotes de 5.000 por transação, com um
+    único registro de auditoria ao final, gravado também quando a importação
+    é interrompida por erro (com os totais dos lotes já confirmados).
+    """
+    if usuario_atual.get("papel") != "ADMIN":
+        raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+
+    formato = (formato or Path(arquivo.filename or "").suffix.lstrip(".")).strip().lower()
+    if formato not in LEITORES_IMPORTACAO:
+        raise HTTPException(status_code=400, detail="Formato inválido. Envie um arquivo .csv ou .ofx")
+    try:
+        codecs.lookup(codificacao)
+    except LookupError:
+        raise HTTPException(status_code=400, detail=f"Codificação desconhecida: {codificacao}")
+
+    obter_saldo(db)  # Garante a linha de saldo antes das inserções
+
+    importados = duplicados = invalidos = 0
+    entradas = saidas = 0
+    erros = []
+    vistos = set()  # Hashes já lidos neste arquivo
+    lote = []
+    concluida = False  # Falso se a importação parar no meio (auditoria parcial)
+
+    def descarregar():
+        nonlocal importados, duplicados, entradas, saidas
+        resultado = gravar_lote_importacao(db, lote)
+        duplicados += resultado["duplicados"]
+        entradas += resultado["ENTRADA"][0]
+        saidas += resultado["SAIDA"][0]
+        importados += resultado["ENTRADA"][1] + resultado["SAIDA"][1]
+        lote.clear()
+
+    fluxo = io.TextIOWrapper(arquivo.file, encoding=codificacao, errors="replace", newline="")
+    try:
+        for numero, movimento, erro in LEITORES_IMPORTACAO[formato](fluxo):
+            if erro:
+                invalidos += 1
+                if len(erros) < MAX_ERROS_RELATADOS:
+                    erros.append(f"linha {numero}: {erro}")
+                continue
+            if movimento.hash_importacao in vistos:
+                duplicados += 1
+                continue
+            vistos.add(movimento.hash_importacao)
+            lote.append(movimento)
+            if len(lote) >= TAMANHO_LOTE_IMPORTACAO:
+                descarregar()
+        if lote:
+            descarregar()
+        concluida = True
+    finally:
+        fluxo.detach()  # Devolve o arquivo ao UploadFile sem fechá-lo
+        if not concluida:
+            db.rollback()  # Descarta o lote em andamento; os anteriores já foram confirmados
+
+        # Um único registro de auditoria para toda a importação, mesmo interrompida
+        registrar_log(
+            db=db,
+            usuario_email=usuario_atual["email"],
+            tabela="Financeiro",
+            acao="CREATE",
+            detalhes=(
+                f"Importação {formato.upper()} '{arquivo.filename}'"
+                f"{'' if concluida else ' INTERROMPIDA'} | Importados: {importados} | "
+                f"Duplicados: {duplicados} | Inválidos: {invalidos} | "
+                f"Entradas: {de_centavos(entradas)} | Saídas: {de_centavos(saidas)}"
+            )
+        )
+
+    return ImportacaoFinanceiraResponse(
+        formato=formato,
+        importados=importados,
+        duplicados=duplicados,
+        invalidos=invalidos,
+        total_entradas=de_centavos(entradas),
+        total_saidas=de_centavos(saidas),
+        erros=erros
+    )
+
+
 # ----------------------------
 # Listar movimentações financeiras
 # ----------------------------
-@roteador.get("/financeiro", response_model=List[FinanceiroResponse])
+@roteador.get("/financeiro", response_model=PaginaFinanceiroResponse)
 def listar_movimentos(
         tipo: Optional[str] = None,
         data_inicial: Optional[date] = None,
         data_final: Optional[date] = None,
+        cursor: Optional[str] = None,
+        tamanho: int = Query(50, ge=1, le=500),
+        incluir_total: bool = False,
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
     📋 Listar movimentações financeiras com filtros opcionais:
     - **tipo** (ENTRADA/SAIDA)
-    - **data_inicial** e **data_final**
+    - **data_inicial** e **data_final** (limites independentes, inclusivos)
+
+    Paginação por cursor sobre (data, id), da mais recente para a mais antiga
+    (movimentações sem data, de bancos antigos, vêm por último):
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    - **tamanho**: itens por página (1 a 500)
+    - **incluir_total**: inclui o total do filtro, obtido por agregado
     """
     if usuario_atual.get("papel") != "ADMIN":
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
 
+    tipo_upper = tipo.strip().upper() if tipo else None
+
     query = db.query(m.Financeiro)
+    if tipo_upper:
+        query = query.filter(m.Financeiro.tipo == tipo_upper)
+    query = filtrar_periodo(query, data_inicial, data_final)
 
-    if tipo:
-        query = query.filter(m.Financeiro.tipo == tipo.strip().upper())
-    if data_inicial and data_final:
-        query = query.filter(m.Financeiro.data.between(data_inicial, data_final))
+    data_cursor, id_cursor = decodificar_cursor(cursor, aceita_data_nula=True) if cursor else (None, None)
 
-    lista = query.order_by(m.Financeiro.data.desc()).all()
+    # Busca um item a mais para saber se existe próxima página.
+    # Datas preenchidas e nulas em consultas separadas: cada uma é um intervalo do índice (data, id)
+    lista = []
+    if id_cursor is None or data_cursor is not None:
+        com_data = query.filter(m.Financeiro.data.isnot(None))
+        if data_cursor is not None:
+            com_data = com_data.filter(tuple_(m.Financeiro.data, m.Financeiro.id) < tuple_(data_cursor, id_cursor))
+        lista = com_data.order_by(m.Financeiro.data.desc(), m.Financeiro.id.desc()).limit(tamanho + 1).all()
+    if len(lista) <= tamanho:  # Completa a página com as movimentações sem data
+        sem_data = query.filter(m.Financeiro.data.is_(None))
+        if data_cursor is None and id_cursor is not None:
+            sem_data = sem_data.filter(m.Financeiro.id < id_cursor)
+        lista += sem_data.order_by(m.Financeiro.id.desc()).limit(tamanho + 1 - len(lista)).all()
+    proximo_cursor = None
+    if len(lista) > tamanho:
+        lista = lista[:tamanho]
+        proximo_cursor = codificar_cursor(lista[-1].data, lista[-1].id)
+
+    total = None
+    if incluir_total:
+        if not (tipo_upper or data_inicial or data_final):
+            total = obter_saldo(db).quantidade  # Contador mantido a cada movimentação
+        else:
+            total = sum(qtd for _, qtd in totais_por_tipo(db, data_inicial, data_final, tipo_upper).values())
 
     # Log padronizado
     registrar_log(
@@ -122,7 +419,7 @@ def listar_movimentos(
                  f"Período: {data_inicial or '-'} até {data_final or '-'}"
     )
 
-    return lista
+    return PaginaFinanceiroResponse(items=lista, proximo_cursor=proximo_cursor, total=total)
 
 
 # ----------------------------
@@ -130,6 +427,9 @@ def listar_movimentos(
 # ----------------------------
 @roteador.get("/financeiro/resumo", response_model=ResumoFinanceiroResponse)
 def gerar_resumo(
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        agrupar_por: Optional[str] = None,
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
@@ -138,17 +438,64 @@ def gerar_resumo(
     - Total de entradas
     - Total de saídas
     - Saldo atual
+
+    Filtros e detalhamento opcionais:
+    - **data_inicial** / **data_final**: limites independentes do período
+    - **agrupar_por**: dia, semana, mes ou categoria (descrição)
+
+    Sem período informado, os totais vêm do saldo corrente mantido a cada
+    movimentação; com período, de um único agregado `GROUP BY tipo`.
     """
     if usuario_atual.get("papel") != "ADMIN":
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
 
-    entradas = db.query(m.Financeiro).filter(m.Financeiro.tipo == "ENTRADA").with_entities(m.Financeiro.valor).all()
-    saidas = db.query(m.Financeiro).filter(m.Financeiro.tipo == "SAIDA").with_entities(m.Financeiro.valor).all()
+    if agrupar_por is not None:
+        agrupar_por = agrupar_por.strip().lower()
+        if agrupar_por not in AGRUPAMENTOS_RESUMO:
+            raise HTTPException(
+                status_code=400,
+                detail=f"agrupar_por deve ser um de: {', '.join(AGRUPAMENTOS_RESUMO)}"
+            )
+
+    if data_inicial or data_final:
+        totais = totais_por_tipo(db, data_inicial, data_final)
+        total_entradas, qtd_entradas = totais["ENTRADA"]
+        total_saidas, qtd_saidas = totais["SAIDA"]
+        quantidade = qtd_entradas + qtd_saidas
+    else:
+        saldo_corrente = obter_saldo(db)
+        total_entradas = saldo_corrente.entradas_centavos
+        total_saidas = saldo_corrente.saidas_centavos
+        quantidade = saldo_corrente.quantidade
 
-    total_entradas = sum(v[0] for v in entradas)
-    total_saidas = sum(v[0] for v in saidas)
     saldo = total_entradas - total_saidas
 
+    # Detalhamento por período/categoria (um único GROUP BY chave, tipo)
+    detalhamento = None
+    if agrupar_por:
+        chave = AGRUPAMENTOS_RESUMO[agrupar_por]().label("chave")
+        query = db.query(chave, m.Financeiro.tipo, func.coalesce(func.sum(m.Financeiro.valor_centavos), 0))
+        query = filtrar_periodo(query, data_inicial, data_final)
+
+        grupos = {}
+        for valor_chave, tipo, soma in query.group_by(chave, m.Financeiro.tipo).order_by(chave).all():
+            entradas, saidas = grupos.get(valor_chave, (0, 0))
+            if tipo == "ENTRADA":
+                entradas += int(soma)
+            else:
+                saidas += int(soma)
+            grupos[valor_chave] = (entradas, saidas)
+
+        detalhamento = [
+            ItemResumoFinanceiro(
+                chave=str(valor_chave),
+                total_entradas=de_centavos(entradas),
+                total_saidas=de_centavos(saidas),
+                saldo=de_centavos(entradas - saidas)
+            )
+            for valor_chave, (entradas, saidas) in grupos.items()
+        ]
+
     # Log padronizado
     registrar_log(
         db=db,
@@ -156,13 +503,76 @@ def gerar_resumo(
         tabela="Financeiro",
         acao="READ",
         detalhes=(
-            f"Resumo financeiro gerado | Entradas: {total_entradas:.2f} | "
-            f"Saídas: {total_saidas:.2f} | Saldo: {saldo:.2f}"
+            f"Resumo financeiro gerado | Entradas: {de_centavos(total_entradas)} | "
+            f"Saídas: {de_centavos(total_saidas)} | Saldo: {de_centavos(saldo)} | "
+            f"Período: {data_inicial or '-'} até {data_final or '-'} | Agrupamento: {agrupar_por or '-'}"
         )
     )
 
     return ResumoFinanceiroResponse(
-        total_entradas=total_entradas,
-        total_saidas=total_saidas,
-        saldo=saldo
+        total_entradas=de_centavos(total_entradas),
+        total_saidas=de_centavos(total_saidas),
+        saldo=de_centavos(saldo),
+        quantidade_movimentos=quantidade,
+        agrupado_por=agrupar_por,
+        detalhamento=detalhamento
+    )
+
+
+# ----------------------------
+# Fechamento mensal
+# ----------------------------
+@roteador.get("/financeiro/fechamento", response_model=FechamentoFinanceiroResponse)
+def gerar_fechamento(
+        ano: int = Query(..., ge=1, le=9999, description="Ano do fechamento"),
+        mes: int = Query(..., description="Mês do fechamento (1 a 12)"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    📒 Fechamento mensal do livro caixa:
+    - Saldo inicial (acumulado antes do mês)
+    - Entradas, saídas e saldo final do mês
+    - Movimento diário com saldo corrente ao fim de cada dia
+
+    Os totais diários são somados no banco (GROUP BY dia) em centavos
+    inteiros, sem erro de arredondamento.
+    """
+    if usuario_atual.get("papel") != "ADMIN":
+        raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+
+    if not 1 <= mes <= 12:
+        raise HTTPException(status_code=400, detail="Mês deve estar entre 1 e 12")
+
+    inicio = date(ano, mes, 1)
+    fim = date(ano, mes, calendar.monthrange(ano, mes)[1])  # Último dia do mês (sem passar do ano 9999)
+
+    livro = LivroCaixa.carregar(db, inicio, fim)
+    entradas, saidas = livro.totais()
+    diario = livro.totais_por_periodo()
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual["email"],
+        tabela="Financeiro",
+        acao="READ",
+        detalhes=f"Fechamento financeiro de {mes:02d}/{ano} | Movimentações: {len(livro)}"
+    )
+
+    return FechamentoFinanceiroResponse(
+        periodo=f"{ano}-{mes:02d}",
+        saldo_inicial=de_centavos(livro.saldo_inicial),
+        total_entradas=de_centavos(entradas),
+        total_saidas=de_centavos(saidas),
+        saldo_final=de_centavos(livro.saldo_final()),
+        quantidade_movimentos=len(livro),
+        diario=[
+            ItemFechamentoFinanceiro(
+                dia=dia,
+                total_entradas=de_centavos(ent),
+                total_saidas=de_centavos(sai),
+                saldo=de_centavos(saldo)
+            )
+            for dia, (ent, sai, saldo) in diario.items()
+        ]
     )
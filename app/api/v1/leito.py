@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form  # Importações FastAPI
-from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query  # Importações FastAPI
+from sqlalchemy.orm import Session, aliased  # Sessão do SQLAlchemy e alias de tabela
+from sqlalchemy import update, exists  # UPDATE condicional e subconsulta EXISTS
+from sqlalchemy.exc import IntegrityError  # Violação do índice único de paciente
 from typing import List, Optional  # Tipagens
+from datetime import datetime, timezone  # Períodos do censo (UTC)
+import random  # Distribui tentativas concorrentes entre leitos livres
 from app.db import get_db  # Função para obter sessão do banco
 from app import models as m  # Import dos models
+from app.models import StatusLeito, TipoEventoLeito  # Enums de status e de evento do leito
 from app.core import security  # Autenticação e segurança
+from app.core.ocupacao import resumo_ocupacao  # Ocupação agregada no banco
+from app.core.censo import registrar_evento, calcular_censo, GRANULARIDADES  # Histórico e censo de leitos
+from app.core.eventos import barramento_eventos  # Notificações em tempo real
 from pydantic import BaseModel  # BaseModel Pydantic
 from app.utils.logs import registrar_log  # Função de log de auditoria
+from app.utils.respostas import ListaJSON  # Listas serializadas por TypeAdapter
 
 
 # ============================================================
@@ -16,7 +25,9 @@ class LeitoBase(BaseModel):
     Schema base para criação ou atualização de um leito.
     """
     numero: str  # Número do leito
-    status: str  # Status do leito (Livre, Ocupado, etc.)
+    status: StatusLeito  # Status do leito (LIVRE, OCUPADO, MANUTENCAO)
+    ala: Optional[str] = None  # Ala/setor do leito (opcional)
+    tipo: Optional[str] = None  # Tipo do leito (opcional)
     paciente_id: Optional[int] = None  # ID do paciente associado (opcional)
 
 
@@ -29,10 +40,56 @@ class LeitoResponse(LeitoBase):
     model_config = {"from_attributes": True}  # Pydantic v2, permite instanciar a partir de objetos SQLAlchemy
 
 
+class OcupacaoAla(BaseModel):
+    """
+    Ocupação de uma ala: contagens por status e IDs dos leitos livres.
+    """
+    ala: Optional[str] = None  # Nome da ala (None = leitos sem ala)
+    livres: int  # Leitos livres
+    ocupados: int  # Leitos ocupados
+    manutencao: int  # Leitos em manutenção
+    leitos_livres: List[int]  # IDs dos leitos livres
+
+
+class OcupacaoResponse(BaseModel):
+    """
+    Resumo de ocupação: totais gerais e detalhamento por ala.
+    """
+    livres: int  # Total de leitos livres
+    ocupados: int  # Total de leitos ocupados
+    manutencao: int  # Total de leitos em manutenção
+    alas: List[OcupacaoAla]  # Ocupação por ala
+
+
+class PontoCenso(BaseModel):
+    """
+    Ocupação em um intervalo do censo (hora ou dia).
+    """
+    inicio: datetime  # Início do intervalo
+    ocupados: int  # Leitos ocupados ao final do intervalo
+    livres: int  # Leitos livres ao final do intervalo
+    manutencao: int  # Leitos em manutenção ao final do intervalo
+    taxa_ocupacao: float  # ocupados / (ocupados + livres)
+    pico_ocupados: int  # Maior ocupação dentro do intervalo
+    admissoes: int  # Admissões no intervalo
+    altas: int  # Altas no intervalo
+    transferencias: int  # Transferências recebidas no intervalo
+
+
+class CensoResponse(BaseModel):
+    """
+    Série temporal de ocupação de leitos.
+    """
+    granularidade: str  # hora ou dia
+    ala: Optional[str] = None  # Ala filtrada (None = hospital inteiro)
+    pontos: List[PontoCenso]  # Intervalos em ordem cronológica
+
+
 # ============================================================
 # ROTEADOR
 # ============================================================
 roteador = APIRouter()  # Cria o roteador FastAPI
+LISTA_LEITOS = ListaJSON(LeitoResponse)  # Serializador de `listar_leitos`
 
 
 # ============================================================
@@ -55,6 +112,78 @@ def obter_usuario_atual(
     return current_user
 
 
+# ============================================================
+# FUNÇÃO AUXILIAR: Normalizar status informado
+# ============================================================
+def normalizar_status(status_leito: str) -> StatusLeito:
+    """
+    Converte o status recebido ("Livre", "ocupado", "Manutenção"...) no enum.
+    Lança HTTPException 400 para valores desconhecidos.
+    """
+    try:
+        return StatusLeito.normalizar(status_leito)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ============================================================
+# FUNÇÕES AUXILIARES: Alocação atômica
+# ============================================================
+TENTATIVAS_ALOCACAO = 3  # Rodadas de busca de candidatos
+CANDIDATOS_POR_RODADA = 20  # Leitos livres considerados por rodada
+
+
+def leito_atual_do_paciente(db: Session, paciente_id: int) -> Optional[m.Leito]:
+    """Retorna o leito ocupado pelo paciente, se houver."""
+    return db.query(m.Leito).filter(
+        m.Leito.paciente_id == paciente_id,
+        m.Leito.status == StatusLeito.OCUPADO
+    ).first()
+
+
+def ocupar_leito(db: Session, leito_id: int, paciente_id: int) -> bool:
+    """
+    Ocupa o leito com um único UPDATE condicional: só altera se o leito
+    ainda estiver LIVRE e o paciente não ocupar outro leito. Retorna True
+    se esta transação efetivou a ocupação; False também quando o índice
+    único `ux_leitos_paciente` recusa o paciente (o chamador faz rollback).
+    """
+    outro = aliased(m.Leito)
+    try:
+        resultado = db.execute(
+            update(m.Leito)
+            .where(
+                m.Leito.id == leito_id,
+                m.Leito.status == StatusLeito.LIVRE,
+                ~exists().where(outro.paciente_id == paciente_id, outro.status == StatusLeito.OCUPADO)
+            )
+            .values(status=StatusLeito.OCUPADO, paciente_id=paciente_id)
+            .execution_options(synchronize_session=False)
+        )
+    except IntegrityError:  # Paciente já está em outro leito
+        return False
+    return resultado.rowcount == 1
+
+
+def normalizar_texto_opcional(valor: Optional[str]) -> Optional[str]:
+    """Remove espaços e converte texto vazio em None."""
+    return valor.strip() if valor and valor.strip() else None
+
+
+def normalizar_tipo(valor: Optional[str]) -> Optional[str]:
+    """Normaliza o tipo do leito em maiúsculas (vazio vira None)."""
+    texto = normalizar_texto_opcional(valor)
+    return texto.upper() if texto else None
+
+
+# ============================================================
+# FUNÇÃO AUXILIAR: Publicar alteração em tempo real
+# ============================================================
+def publicar_leito(acao: str, leito: m.Leito):
+    """Publica o estado atual do leito no barramento de eventos (tópico `leito`)."""
+    barramento_eventos.publicar("leito", acao, LeitoResponse.model_validate(leito).model_dump(mode="json"))
+
+
 # ============================================================
 # ENDPOINT: CRIAR LEITO
 # ============================================================
@@ -64,10 +193,12 @@ def obter_usuario_atual(
     status_code=status.HTTP_201_CREATED
 )
 def criar_leito(
-        numero: str = Form(..., description="Número identificador do leito", example="101"),
-        status_leito: str = Form(..., description="Status atual do leito (Livre, Ocupado, Manutenção)",
-                                 example="Livre"),
-        paciente_id: Optional[int] = Form(None, description="ID do paciente associado (opcional)"),
+        numero: str = Form(..., description="Número identificador do leito", examples=["101"]),
+        status_leito: str = Form(..., description="Status inicial do leito (Livre ou Manutenção)",
+                                 examples=["Livre"]),
+        paciente_id: Optional[int] = Form(None, description="Não aceito: a ocupação é feita por /alocar"),
+        ala: Optional[str] = Form(None, description="Ala/setor do leito (opcional)", examples=["UTI"]),
+        tipo: Optional[str] = Form(None, description="Tipo do leito (opcional)", examples=["ENFERMARIA"]),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
@@ -75,21 +206,38 @@ def criar_leito(
     Cria um novo leito hospitalar.
 
     - **Acesso:** apenas ADMIN
-    - **Campos obrigatórios:** numero, status
-    - **Campos opcionais:** paciente_id
+    - **Campos obrigatórios:** numero, status (LIVRE ou MANUTENCAO)
+    - **Campos opcionais:** ala, tipo
+    - O leito nasce sem paciente: a ocupação só acontece por `/alocar` e
+      `/transferir`, que garantem um leito por paciente; responde 400 para
+      `paciente_id` ou status OCUPADO
     """
     if usuario_atual.get("papel") != "ADMIN":  # Verifica permissão
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN pode criar leitos")
 
+    status_inicial = normalizar_status(status_leito)
+    if paciente_id is not None or status_inicial == StatusLeito.OCUPADO:  # Ocupação só pelos fluxos atômicos
+        raise HTTPException(
+            status_code=400,
+            detail="O leito é criado LIVRE ou em MANUTENCAO, sem paciente; use /alocar para internar"
+        )
+
     novo_leito = m.Leito(  # Cria objeto Leito
         numero=numero,
-        status=status_leito,
-        paciente_id=paciente_id
+        status=status_inicial,
+        ala=normalizar_texto_opcional(ala),
+        tipo=normalizar_tipo(tipo)
     )
 
     db.add(novo_leito)  # Adiciona à sessão
+    db.flush()  # Gera o ID para o evento
+    registrar_evento(  # Histórico: leito passa a existir
+        db, novo_leito.id, None, novo_leito.status,
+        ala=novo_leito.ala, usuario_email=usuario_atual.get("email")
+    )
     db.commit()  # Salva alterações
     db.refresh(novo_leito)  # Atualiza objeto com ID
+    publicar_leito("criado", novo_leito)
 
     registrar_log(  # Log de auditoria
         db,
@@ -97,7 +245,7 @@ def criar_leito(
         "Leito",
         registro_id=novo_leito.id,
         acao="CREATE",
-        detalhes=f"Leito {numero} criado com status {status_leito}"
+        detalhes=f"Leito {numero} criado com status {novo_leito.status.value}"
     )
 
     return novo_leito  # Retorna objeto criado
@@ -111,18 +259,26 @@ def criar_leito(
     response_model=List[LeitoResponse]  # Lista de leitos
 )
 def listar_leitos(
+        status_leito: Optional[str] = None,
+        ala: Optional[str] = None,
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
-    Lista todos os leitos cadastrados.
+    Lista os leitos cadastrados.
 
     - **Acesso:** ADMIN ou MEDICO
+    - **Filtros opcionais:** status_leito, ala (colunas indexadas)
     """
     if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    leitos = db.query(m.Leito).all()  # Consulta todos os leitos
+    query = db.query(m.Leito)
+    if status_leito:
+        query = query.filter(m.Leito.status == normalizar_status(status_leito))
+    if ala:
+        query = query.filter(m.Leito.ala == ala)
+    leitos = query.all()  # Consulta leitos filtrados
 
     registrar_log(  # Log de listagem
         db,
@@ -132,7 +288,40 @@ def listar_leitos(
         detalhes="Listagem de leitos"
     )
 
-    return leitos  # Retorna lista
+    return LISTA_LEITOS.responder(leitos)  # Retorna lista
+
+
+# ============================================================
+# ENDPOINT: OCUPAÇÃO DE LEITOS
+# ============================================================
+@roteador.get(
+    "/ocupacao",
+    response_model=OcupacaoResponse
+)
+def obter_ocupacao(
+        ala: Optional[str] = None,
+        usuario_atual=Depends(obter_usuario_atual),
+        db: Session = Depends(get_db)
+):
+    """
+    Retorna a ocupação atual dos leitos (livres, ocupados, em manutenção)
+    por ala, com os IDs dos leitos livres.
+
+    - **Acesso:** ADMIN ou MEDICO
+    - Agregado no banco pelo índice (ala, status), igual em todos os workers
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    por_ala = resumo_ocupacao(db, ala)
+    alas = [OcupacaoAla(ala=nome, **dados) for nome, dados in por_ala.items()]
+
+    return OcupacaoResponse(
+        livres=sum(a.livres for a in alas),
+        ocupados=sum(a.ocupados for a in alas),
+        manutencao=sum(a.manutencao for a in alas),
+        alas=alas
+    )
 
 
 # ============================================================
@@ -144,9 +333,11 @@ def listar_leitos(
 )
 def atualizar_leito(
         leito_id: int,
-        numero: Optional[str] = Form(None, description="Número identificador do leito", example="101"),
-        status_leito: Optional[str] = Form(None, description="Status atual do leito", example="Livre"),
-        paciente_id: Optional[int] = Form(None, description="ID do paciente associado", example=None),
+        numero: Optional[str] = Form(None, description="Número identificador do leito", examples=["101"]),
+        status_leito: Optional[str] = Form(None, description="Status atual do leito", examples=["Livre"]),
+        paciente_id: Optional[int] = Form(None, description="Não aceito: use /alocar, /liberar ou /transferir"),
+        ala: Optional[str] = Form(None, description="Ala/setor do leito", examples=["UTI"]),
+        tipo: Optional[str] = Form(None, description="Tipo do leito", examples=["ENFERMARIA"]),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
@@ -154,24 +345,70 @@ def atualizar_leito(
     Atualiza os campos de um leito existente.
 
     - **Acesso:** apenas ADMIN
-    - **Campos opcionais:** numero, status, paciente_id
+    - **Campos opcionais:** numero, status (LIVRE ↔ MANUTENCAO), ala, tipo
+    - A ocupação (paciente e status OCUPADO) só muda por `/alocar`, `/liberar`
+      e `/transferir`; aqui responde 400/409
+    - UPDATE condicional ao estado lido: 409 se outra operação alterou o leito
     """
     if usuario_atual.get("papel") != "ADMIN":  # Verifica permissão
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    leito = db.query(m.Leito).filter(m.Leito.id == leito_id).first()  # Busca leito
-    if not leito:
+    if paciente_id is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="Paciente do leito é alterado por /alocar, /liberar e /transferir"
+        )
+
+    atual = db.query(m.Leito.status, m.Leito.ala, m.Leito.paciente_id).filter(m.Leito.id == leito_id).first()
+    if not atual:
         raise HTTPException(status_code=404, detail="Leito não encontrado")
 
+    valores = {}
     if numero is not None:
-        leito.numero = numero  # Atualiza número
+        valores["numero"] = numero  # Atualiza número
     if status_leito is not None:
-        leito.status = status_leito  # Atualiza status
-    if paciente_id is not None:
-        leito.paciente_id = paciente_id  # Atualiza paciente
-
-    db.commit()  # Salva alterações
-    db.refresh(leito)  # Atualiza objeto
+        novo_status = normalizar_status(status_leito)
+        if novo_status != atual.status:
+            if StatusLeito.OCUPADO in (novo_status, atual.status):  # Ocupação só pelos fluxos atômicos
+                raise HTTPException(
+                    status_code=409,
+                    detail="Ocupação do leito é alterada por /alocar, /liberar e /transferir"
+                )
+            valores["status"] = novo_status  # LIVRE ↔ MANUTENCAO
+    if ala is not None:
+        valores["ala"] = normalizar_texto_opcional(ala)  # Atualiza ala (vazio remove)
+    if tipo is not None:
+        valores["tipo"] = normalizar_tipo(tipo)  # Atualiza tipo (vazio remove)
+
+    if valores:
+        # Só altera se o leito continua como lido (status, paciente e ala), mantendo o evento fiel
+        resultado = db.execute(
+            update(m.Leito)
+            .where(
+                m.Leito.id == leito_id,
+                m.Leito.status == atual.status,
+                m.Leito.paciente_id.is_(None) if atual.paciente_id is None else m.Leito.paciente_id == atual.paciente_id,
+                m.Leito.ala.is_(None) if atual.ala is None else m.Leito.ala == atual.ala
+            )
+            .values(**valores)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount != 1:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Leito alterado por outra operação; tente novamente")
+
+        status_final, ala_final = valores.get("status", atual.status), valores.get("ala", atual.ala)
+        if (status_final, ala_final) != (atual.status, atual.ala):
+            registrar_evento(  # Histórico: transição de status ou ala
+                db, leito_id, atual.status, status_final,
+                ala_anterior=atual.ala, ala=ala_final,
+                paciente_id=atual.paciente_id, usuario_email=usuario_atual.get("email")
+            )
+
+        db.commit()  # Salva alterações
+
+    leito = db.get(m.Leito, leito_id)
+    publicar_leito("atualizado", leito)
 
     registrar_log(  # Log de auditoria
         db,
@@ -185,6 +422,261 @@ def atualizar_leito(
     return leito  # Retorna objeto atualizado
 
 
+# ============================================================
+# ENDPOINT: ALOCAR LEITO
+# ============================================================
+@roteador.post(
+    "/alocar",
+    response_model=LeitoResponse
+)
+def alocar_leito(
+        paciente_id: int = Form(..., description="ID do paciente a internar"),
+        ala: Optional[str] = Form(None, description="Ala preferida (opcional)", examples=["UTI"]),
+        tipo: Optional[str] = Form(None, description="Tipo de leito preferido (opcional)", examples=["ENFERMARIA"]),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Escolhe um leito livre (respeitando ala/tipo, se informados) e o ocupa
+    para o paciente.
+
+    - **Acesso:** ADMIN ou MEDICO
+    - A ocupação é feita por UPDATE condicional (status ainda LIVRE e
+      paciente sem outro leito); em caso de disputa, tenta outro leito
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    if not db.query(m.Paciente.id).filter(m.Paciente.id == paciente_id).first():
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+
+    atual = leito_atual_do_paciente(db, paciente_id)
+    if atual:
+        raise HTTPException(status_code=409, detail=f"Paciente já ocupa o leito {atual.numero}")
+
+    ala = normalizar_texto_opcional(ala)
+    tipo = normalizar_tipo(tipo)
+
+    leito_alocado = None
+    for _ in range(TENTATIVAS_ALOCACAO):
+        query = db.query(m.Leito.id).filter(m.Leito.status == StatusLeito.LIVRE)
+        if ala:
+            query = query.filter(m.Leito.ala == ala)
+        if tipo:
+            query = query.filter(m.Leito.tipo == tipo)
+        candidatos = [leito_id for (leito_id,) in query.limit(CANDIDATOS_POR_RODADA)]
+        if not candidatos:
+            break
+        random.shuffle(candidatos)  # Requisições simultâneas tendem a disputar leitos diferentes
+
+        for leito_id in candidatos:
+            if ocupar_leito(db, leito_id, paciente_id):
+                ala_leito = db.query(m.Leito.ala).filter(m.Leito.id == leito_id).scalar()
+                registrar_evento(  # Histórico: admissão, na mesma transação da ocupação
+                    db, leito_id, StatusLeito.LIVRE, StatusLeito.OCUPADO,
+                    ala_anterior=ala_leito, ala=ala_leito,
+                    paciente_id=paciente_id, usuario_email=usuario_atual.get("email")
+                )
+                db.commit()
+                leito_alocado = db.get(m.Leito, leito_id)
+                break
+            db.rollback()
+            if leito_atual_do_paciente(db, paciente_id):  # Outra requisição internou o paciente
+                raise HTTPException(status_code=409, detail="Paciente já foi alocado em outro leito")
+        if leito_alocado:
+            break
+
+    if not leito_alocado:
+        raise HTTPException(status_code=409, detail="Nenhum leito livre disponível para os critérios informados")
+
+    publicar_leito("alocado", leito_alocado)
+
+    registrar_log(  # Log de auditoria
+        db,
+        usuario_atual["email"],
+        "Leito",
+        registro_id=leito_alocado.id,
+        acao="UPDATE",
+        detalhes=f"Leito {leito_alocado.numero} alocado ao paciente {paciente_id}"
+    )
+
+    return leito_alocado
+
+
+# ============================================================
+# ENDPOINT: LIBERAR LEITO
+# ============================================================
+@roteador.post(
+    "/leitos/{leito_id}/liberar",
+    response_model=LeitoResponse
+)
+def liberar_leito(
+        leito_id: int,
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Libera um leito ocupado (alta do paciente), com UPDATE condicional.
+
+    - **Acesso:** ADMIN ou MEDICO
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    atual = db.query(m.Leito.status, m.Leito.ala, m.Leito.paciente_id).filter(m.Leito.id == leito_id).first()
+    if not atual:
+        raise HTTPException(status_code=404, detail="Leito não encontrado")
+    if atual.status != StatusLeito.OCUPADO:
+        raise HTTPException(status_code=409, detail="Leito não está ocupado")
+    paciente_anterior = atual.paciente_id
+
+    # Só libera se o leito continua como lido (mesmo paciente e ala), mantendo o evento fiel
+    resultado = db.execute(
+        update(m.Leito)
+        .where(
+            m.Leito.id == leito_id,
+            m.Leito.status == StatusLeito.OCUPADO,
+            m.Leito.paciente_id.is_(None) if paciente_anterior is None else m.Leito.paciente_id == paciente_anterior,
+            m.Leito.ala.is_(None) if atual.ala is None else m.Leito.ala == atual.ala
+        )
+        .values(status=StatusLeito.LIVRE, paciente_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    if resultado.rowcount != 1:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Leito alterado por outra operação; tente novamente")
+    registrar_evento(  # Histórico: alta
+        db, leito_id, StatusLeito.OCUPADO, StatusLeito.LIVRE,
+        ala_anterior=atual.ala, ala=atual.ala,
+        paciente_id=paciente_anterior, usuario_email=usuario_atual.get("email")
+    )
+    db.commit()
+
+    leito = db.get(m.Leito, leito_id)
+    publicar_leito("liberado", leito)
+
+    registrar_log(  # Log de auditoria
+        db,
+        usuario_atual["email"],
+        "Leito",
+        registro_id=leito.id,
+        acao="UPDATE",
+        detalhes=f"Leito {leito.numero} liberado (paciente {paciente_anterior})"
+    )
+
+    return leito
+
+
+# ============================================================
+# ENDPOINT: TRANSFERIR PACIENTE
+# ============================================================
+@roteador.post(
+    "/transferir",
+    response_model=LeitoResponse
+)
+def transferir_paciente(
+        paciente_id: int = Form(..., description="ID do paciente internado"),
+        leito_destino_id: int = Form(..., description="ID do leito de destino (deve estar livre)"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Transfere o paciente do leito atual para um leito livre, em uma única
+    transação: libera a origem e ocupa o destino com UPDATEs condicionais.
+
+    - **Acesso:** ADMIN ou MEDICO
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    origem = leito_atual_do_paciente(db, paciente_id)
+    if not origem:
+        raise HTTPException(status_code=404, detail="Paciente não ocupa nenhum leito")
+    destino = db.query(m.Leito).filter(m.Leito.id == leito_destino_id).first()
+    if not destino:
+        raise HTTPException(status_code=404, detail="Leito de destino não encontrado")
+    if destino.id == origem.id:
+        raise HTTPException(status_code=400, detail="Leito de destino é o leito atual do paciente")
+    origem_id, ala_origem = origem.id, origem.ala
+    destino_id, ala_destino = destino.id, destino.ala
+
+    liberado = db.execute(
+        update(m.Leito)
+        .where(m.Leito.id == origem_id, m.Leito.status == StatusLeito.OCUPADO, m.Leito.paciente_id == paciente_id)
+        .values(status=StatusLeito.LIVRE, paciente_id=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    if not liberado or not ocupar_leito(db, destino_id, paciente_id):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Leito de destino não está livre ou o paciente já foi movido")
+
+    registrar_evento(  # Histórico: saída do leito de origem
+        db, origem_id, StatusLeito.OCUPADO, StatusLeito.LIVRE,
+        ala_anterior=ala_origem, ala=ala_origem, paciente_id=paciente_id,
+        usuario_email=usuario_atual.get("email"),
+        tipo=TipoEventoLeito.TRANSFERENCIA, leito_relacionado_id=destino_id
+    )
+    registrar_evento(  # Histórico: chegada ao leito de destino
+        db, destino_id, StatusLeito.LIVRE, StatusLeito.OCUPADO,
+        ala_anterior=ala_destino, ala=ala_destino, paciente_id=paciente_id,
+        usuario_email=usuario_atual.get("email"),
+        tipo=TipoEventoLeito.TRANSFERENCIA, leito_relacionado_id=origem_id
+    )
+    db.commit()
+
+    db.expire_all()  # Os UPDATEs não sincronizam os objetos carregados
+    destino = db.get(m.Leito, destino_id)
+    publicar_leito("transferido", db.get(m.Leito, origem_id))
+    publicar_leito("transferido", destino)
+
+    registrar_log(  # Log de auditoria
+        db,
+        usuario_atual["email"],
+        "Leito",
+        registro_id=destino_id,
+        acao="UPDATE",
+        detalhes=f"Paciente {paciente_id} transferido do leito {origem_id} para o leito {destino_id}"
+    )
+
+    return destino
+
+
+# ============================================================
+# ENDPOINT: CENSO DE OCUPAÇÃO
+# ============================================================
+@roteador.get(
+    "/censo",
+    response_model=CensoResponse
+)
+def obter_censo(
+        inicio: datetime = Query(..., description="Início do período (UTC se sem fuso)"),
+        fim: Optional[datetime] = Query(None, description="Fim do período (padrão: agora)"),
+        granularidade: str = Query("hora", description=f"Intervalo da série: {', '.join(GRANULARIDADES)}"),
+        ala: Optional[str] = Query(None, description="Filtra uma ala (padrão: hospital inteiro)"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Série temporal de ocupação (por hora ou dia) calculada a partir do
+    histórico de eventos de leitos.
+
+    - **Acesso:** ADMIN ou MEDICO
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Permissões
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    # Eventos são gravados em UTC sem fuso; datas com fuso são convertidas
+    inicio = inicio.astimezone(timezone.utc).replace(tzinfo=None) if inicio.tzinfo else inicio
+    fim = fim.astimezone(timezone.utc).replace(tzinfo=None) if fim and fim.tzinfo else fim
+
+    try:
+        pontos = calcular_censo(db, inicio, fim or datetime.utcnow(), granularidade, ala)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return CensoResponse(granularidade=granularidade, ala=ala, pontos=pontos)
+
+
 # ============================================================
 # ENDPOINT: EXCLUIR LEITO
 # ============================================================
@@ -209,8 +701,14 @@ def excluir_leito(
     if not leito:
         raise HTTPException(status_code=404, detail="Leito não encontrado")
 
+    dados_excluido = LeitoResponse.model_validate(leito).model_dump(mode="json")  # Último estado, para o evento
+    registrar_evento(  # Histórico: leito deixa de existir
+        db, leito.id, leito.status, None,
+        ala_anterior=leito.ala, paciente_id=leito.paciente_id, usuario_email=usuario_atual.get("email")
+    )
     db.delete(leito)  # Remove da sessão
     db.commit()  # Salva alterações
+    barramento_eventos.publicar("leito", "excluido", dados_excluido)
 
     registrar_log(  # Log de auditoria
         db,
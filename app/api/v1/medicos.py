@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form  # Importações FastAPI
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query  # Importações FastAPI
 from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
 from typing import List, Optional  # Tipagens
 from app.db import get_db  # Função para obter sessão do banco
@@ -6,9 +6,15 @@ from app import models as m  # Import dos models
 from app.core import security  # Autenticação e segurança
 from app.schemas.medico import MedicoResponse  # Schema de resposta para médico
 from app.utils.logs import registrar_log  # Função de log de auditoria
+from app.utils.projecao import Projecao  # Listagens com campos selecionados
+from app.utils.respostas import ListaJSON, RespostaJSON  # Serialização das listagens
 
 roteador = APIRouter()  # Cria o roteador FastAPI
 
+# Campos de `listar_medicos?fields=` (resumo: autocompletar)
+PROJECAO_MEDICOS = Projecao(m.Medico, MedicoResponse.model_fields, resumo=("id", "nome", "especialidade"))
+LISTA_MEDICOS = ListaJSON(MedicoResponse)  # Resposta completa de `listar_medicos`
+
 
 # ----------------------------
 # Obter usuário atual com email garantido
@@ -86,17 +92,21 @@ def criar_medico(
 def listar_medicos(
         pagina: int = 1,  # Página inicial
         tamanho: int = 20,  # Tamanho da página
+        campos: Optional[str] = Query(None, alias="fields", description="Campos separados por vírgula (ex.: id,nome) ou 'resumo'; padrão: todos"),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
     Lista médicos com paginação.
     Apenas usuários ADMIN ou MEDICO podem acessar.
+    Com `fields`, retorna apenas os campos pedidos (`fields=resumo`: id, nome e especialidade).
     """
     if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
         raise HTTPException(status_code=403, detail="Sem permissão")
 
-    medicos = db.query(m.Medico).offset((pagina - 1) * tamanho).limit(tamanho).all()  # Consulta paginada
+    nomes = PROJECAO_MEDICOS.resolver(campos)
+    query = db.query(m.Medico) if nomes is None else PROJECAO_MEDICOS.consultar(db, nomes)
+    medicos = query.order_by(m.Medico.id).offset((pagina - 1) * tamanho).limit(tamanho).all()  # Consulta paginada
 
     registrar_log(  # Log de auditoria
         db=db,
@@ -106,7 +116,9 @@ def listar_medicos(
         detalhes=f"{usuario_atual.get('email')} listou médicos (página {pagina})"
     )
 
-    return medicos  # Retorna lista de médicos
+    if nomes is not None:  # Tuplas das colunas pedidas, sem validação do schema completo
+        return RespostaJSON(PROJECAO_MEDICOS.serializar(medicos, nomes))
+    return LISTA_MEDICOS.responder(medicos)  # Retorna lista de médicos
 
 
 # ----------------------------
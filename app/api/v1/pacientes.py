@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form  # Importações FastAPI
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query  # Importações FastAPI
 from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
 from typing import List, Optional  # Tipagens
 from datetime import datetime  # Para manipulação de datas
 from app.db import get_db  # Função para obter sessão do banco
 from app import models as m  # Import dos models
 from app.core import security  # Autenticação e segurança
-from app.schemas.paciente import PacienteResponse  # Schema de resposta para paciente
+from app.schemas.paciente import (  # Schemas de resposta para paciente
+    PacienteResponse,
+    ResultadoBuscaPacientes,
+    LinhaDoTempoResponse,
+)
+from app.core.busca import buscar_ids, carregar_em_ordem  # Busca textual indexada
+from app.core.linha_do_tempo import FONTES, chave_item, montar_linha_do_tempo  # Histórico unificado
+from app.utils.paginacao import codificar_cursor, decodificar_cursor  # Cursores de paginação
 from app.utils.logs import registrar_log  # Função utilitária para registrar logs
+from app.core.escopo import escopo_do_usuario, escopo_pacientes, ids_pacientes, paciente_no_escopo  # Escopo por papel
+from app.utils.projecao import Projecao  # Listagens com campos selecionados
+from app.utils.respostas import ListaJSON, RespostaJSON  # Serialização das listagens
 
 roteador = APIRouter()  # Cria roteador FastAPI
 
+# Campos de `listar_pacientes?fields=` (resumo: autocompletar)
+PROJECAO_PACIENTES = Projecao(m.Paciente, PacienteResponse.model_fields, resumo=("id", "nome"))
+LISTA_PACIENTES = ListaJSON(PacienteResponse)  # Resposta completa de `listar_pacientes`
+
 
 # ----------------------------
 # Obter usuário atual com email garantido
@@ -115,17 +129,23 @@ def criar_paciente(
 def listar_pacientes(
         pagina: int = 1,  # Página inicial
         tamanho: int = 20,  # Tamanho da página
+        campos: Optional[str] = Query(None, alias="fields", description="Campos separados por vírgula (ex.: id,nome) ou 'resumo'; padrão: todos"),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
     Lista pacientes com paginação.
-    Apenas usuários ADMIN ou MEDICO podem acessar.
+    Apenas usuários ADMIN ou MEDICO podem acessar; o médico vê
+    somente os pacientes com quem tem consultas.
+    Com `fields`, retorna apenas os campos pedidos (`fields=resumo`: id e nome).
     """
     if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
         raise HTTPException(status_code=403, detail="Sem permissão")
 
-    pacientes = db.query(m.Paciente).offset((pagina - 1) * tamanho).limit(tamanho).all()  # Consulta paginada
+    nomes = PROJECAO_PACIENTES.resolver(campos)
+    query = db.query(m.Paciente) if nomes is None else PROJECAO_PACIENTES.consultar(db, nomes)
+    query = escopo_pacientes(query, escopo_do_usuario(usuario_atual))
+    pacientes = query.order_by(m.Paciente.id).offset((pagina - 1) * tamanho).limit(tamanho).all()  # Consulta paginada
 
     registrar_log(
         db=db,
@@ -135,7 +155,51 @@ def listar_pacientes(
         detalhes=f"{usuario_atual.get('email')} listou pacientes (página {pagina})"
     )
 
-    return pacientes  # Retorna lista de pacientes
+    if nomes is not None:  # Tuplas das colunas pedidas, sem validação do schema completo
+        return RespostaJSON(PROJECAO_PACIENTES.serializar(pacientes, nomes))
+    return LISTA_PACIENTES.responder(pacientes)  # Retorna lista de pacientes
+
+
+# ----------------------------
+# Buscar pacientes
+# ----------------------------
+@roteador.get("/busca", response_model=ResultadoBuscaPacientes)
+def buscar_pacientes(
+        q: str = Query(..., min_length=1, description="Nome, email ou CPF (prefixos, sem distinção de acentos)"),
+        pagina: int = Query(1, ge=1),  # Página de resultados
+        tamanho: int = Query(20, ge=1, le=100),  # Resultados por página
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Busca pacientes por nome, email ou CPF no índice textual, em ordem de relevância.
+    Apenas usuários ADMIN ou MEDICO podem acessar; o médico, só entre os pacientes
+    com quem tem consultas (filtro aplicado na própria busca).
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    visiveis = ids_pacientes(escopo_do_usuario(usuario_atual))
+    try:
+        ids = buscar_ids(db, "pacientes", q, tamanho + 1, (pagina - 1) * tamanho, dentre=visiveis)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    pacientes = carregar_em_ordem(db, m.Paciente, ids[:tamanho])
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual.get("email"),
+        tabela="pacientes",
+        acao="READ",
+        detalhes=f"{usuario_atual.get('email')} buscou pacientes por '{q}' (página {pagina})"
+    )
+
+    return ResultadoBuscaPacientes(
+        items=pacientes,
+        pagina=pagina,
+        proxima_pagina=pagina + 1 if len(ids) > tamanho else None
+    )
 
 
 # ----------------------------
@@ -149,7 +213,7 @@ def obter_paciente(
 ):
     """
     Retorna os dados de um paciente específico pelo ID.
-    Apenas ADMIN ou MEDICO podem acessar.
+    Apenas ADMIN ou MEDICO podem acessar; o médico, só pacientes com quem tem consultas.
     """
     if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
         raise HTTPException(status_code=403, detail="Sem permissão")
@@ -157,6 +221,8 @@ def obter_paciente(
     paciente = db.query(m.Paciente).filter(m.Paciente.id == paciente_id).first()  # Consulta paciente
     if not paciente:
         raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    if not paciente_no_escopo(db, escopo_do_usuario(usuario_atual), paciente_id):  # Fora do escopo do médico
+        raise HTTPException(status_code=403, detail="Sem permissão")
 
     registrar_log(  # Log detalhado
         db=db,
@@ -170,6 +236,60 @@ def obter_paciente(
     return paciente  # Retorna paciente
 
 
+# ----------------------------
+# Linha do tempo do paciente
+# ----------------------------
+@roteador.get("/{paciente_id}/linha-do-tempo", response_model=LinhaDoTempoResponse)
+def linha_do_tempo_paciente(
+        paciente_id: int,
+        tipos: Optional[str] = Query(
+            None, description="Fontes separadas por vírgula (consulta, teleconsulta, prontuario, prescricao, leito)"
+        ),
+        cursor: Optional[str] = Query(None, description="Cursor retornado pela página anterior"),
+        tamanho: int = Query(50, ge=1, le=200),  # Itens por página
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Histórico do paciente em uma única lista, do mais recente para o mais antigo:
+    consultas, teleconsultas, prontuários, prescrições e eventos de leito.
+    Apenas ADMIN ou MEDICO podem acessar; o médico, só pacientes com quem tem consultas.
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    fontes = None
+    if tipos:
+        fontes = [t.strip().lower() for t in tipos.split(",") if t.strip()]
+        desconhecidas = sorted(set(fontes) - set(FONTES))
+        if desconhecidas:
+            raise HTTPException(status_code=400, detail=f"Tipos inválidos: {', '.join(desconhecidas)}")
+
+    if not db.query(m.Paciente.id).filter(m.Paciente.id == paciente_id).first():
+        raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    if not paciente_no_escopo(db, escopo_do_usuario(usuario_atual), paciente_id):  # Fora do escopo do médico
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    apos = decodificar_cursor(cursor, 2) if cursor else None
+    itens = montar_linha_do_tempo(db, paciente_id, tamanho + 1, apos, fontes)
+
+    proximo_cursor = None
+    if len(itens) > tamanho:  # Há mais itens além desta página
+        itens = itens[:tamanho]
+        proximo_cursor = codificar_cursor(*chave_item(itens[-1]))
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual.get("email"),
+        tabela="pacientes",
+        registro_id=paciente_id,
+        acao="READ",
+        detalhes=f"{usuario_atual.get('email')} consultou a linha do tempo do paciente ID {paciente_id}"
+    )
+
+    return LinhaDoTempoResponse(items=itens, proximo_cursor=proximo_cursor)
+
+
 # ----------------------------
 # Atualizar paciente
 # ----------------------------
@@ -185,7 +305,7 @@ def atualizar_paciente(
 ):
     """
     Atualiza dados de um paciente existente.
-    Apenas ADMIN ou MEDICO podem atualizar pacientes.
+    Apenas ADMIN ou MEDICO podem atualizar pacientes; o médico, só pacientes com quem tem consultas.
     Campos não fornecidos permanecem inalterados.
     """
     if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:  # Verifica permissão
@@ -194,6 +314,8 @@ def atualizar_paciente(
     db_paciente = db.query(m.Paciente).filter(m.Paciente.id == paciente_id).first()  # Consulta paciente
     if not db_paciente:
         raise HTTPException(status_code=404, detail="Paciente não encontrado")
+    if not paciente_no_escopo(db, escopo_do_usuario(usuario_atual), paciente_id):  # Fora do escopo do médico
+        raise HTTPException(status_code=403, detail="Sem permissão")
 
     # Atualiza campos fornecidos
     if nome is not None:
@@ -7,8 +7,11 @@ from app import models as m  # Import dos models
 from app.core import security  # Autenticação e segurança
 from app.schemas import PrescricaoResponse  # Schema de resposta para prescrição
 from app.utils.logs import registrar_log  # Função utilitária para registrar logs
+from app.core.escopo import aplicar_escopo, escopo_do_usuario  # Escopo por papel
+from app.utils.respostas import ListaJSON  # Listas serializadas por TypeAdapter
 
 roteador = APIRouter()  # Cria roteador FastAPI
+LISTA_PRESCRICOES = ListaJSON(PrescricaoResponse)  # Serializador de `listar_prescricoes`
 
 
 # ============================================================
@@ -86,24 +89,28 @@ def listar_prescricoes(
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
-    Lista todas as prescrições médicas cadastradas.
-    - **Acesso:** apenas MEDICO ou ADMIN
+    Lista as prescrições médicas, da mais recente para a mais antiga.
+    - **ADMIN:** todas
+    - **MEDICO:** as que emitiu
+    - **PACIENTE:** as suas
     - **Registra log** da operação
     """
-    if usuario_atual.get("papel") not in ["MEDICO", "ADMIN"]:  # Valida permissão
-        raise HTTPException(status_code=403, detail="Sem permissão")
-
-    prescricoes = db.query(m.Receita).all()  # Consulta todas prescrições
+    escopo = escopo_do_usuario(usuario_atual)
+    prescricoes = (
+        aplicar_escopo(db.query(m.Receita), escopo, m.Receita.paciente_id, m.Receita.medico_id)
+        .order_by(m.Receita.data_hora.desc(), m.Receita.id.desc())
+        .all()
+    )
 
     registrar_log(
         db=db,
         usuario_email=usuario_atual.get("email"),
         tabela="Receita",
         acao="READ",
-        detalhes=f"{usuario_atual.get('email')} listou todas as prescrições"
+        detalhes=f"{usuario_atual.get('email')} listou prescrições ({len(prescricoes)})"
     )
 
-    return prescricoes  # Retorna lista de prescrições
+    return LISTA_PRESCRICOES.responder(prescricoes)  # Retorna lista de prescrições
 
 
 # ============================================================
@@ -1,18 +1,47 @@
 # D:\ProjectSGHSS\app\api\v1\prontuario.py
-from fastapi import APIRouter, Depends, HTTPException, status, Form, UploadFile, File  # FastAPI imports
+from fastapi import APIRouter, Depends, HTTPException, status, Form, UploadFile, File, Query, Request, Header  # FastAPI imports
+from fastapi.responses import Response, StreamingResponse  # Respostas de download
+from sqlalchemy import func  # Funções SQL (trecho da descrição)
 from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+from starlette.concurrency import run_in_threadpool  # Gravação no armazenamento fora do loop
 from typing import List, Optional  # Tipagem
-from pathlib import Path  # Manipulação de diretórios/arquivos
 from datetime import datetime  # Para timestamp
+from pathlib import Path  # Nome da prévia a partir do nome original
+import asyncio  # Espera pela geração da prévia
+from urllib.parse import quote  # Nome do arquivo no Content-Disposition
 
 from app.db import get_db  # Função para obter sessão do banco
 from app import models as m  # Import dos models
 from app.core import security  # Autenticação e segurança
 from app.schemas import ProntuarioResponse  # Schema de resposta de prontuário
+from app.schemas.prontuario import ResultadoBuscaProntuarios  # Schema de resultado da busca
 from app.utils.logs import registrar_log  # Função utilitária para logs
+from app.core.busca import buscar_trechos  # Busca textual indexada
+from app.core.anexos import (  # Recebimento de anexos em fluxo
+    AnexoMuitoGrande,
+    TAMANHO_MAXIMO_ANEXO,
+    nome_arquivo_seguro,
+    gravar_fluxo,
+    receber_upload,
+)
+from app.core.armazenamento import armazenar, liberar, obter_backend, chave_derivado  # Armazenamento por conteúdo
+from app.core.miniaturas import gerador_derivados  # Miniaturas e prévias dos anexos
+from app.core.escopo import Escopo, aplicar_escopo, escopo_do_usuario, no_escopo  # Escopo por papel
+from app.utils.projecao import Projecao  # Listagens com campos selecionados
+from app.utils.respostas import ListaJSON, RespostaJSON  # Serialização das listagens
+from app.utils.download import RespostaArquivo, etag_corresponde, etag_forte  # Envio de arquivos
 
 roteador = APIRouter()  # Criação do roteador FastAPI
 
+TAMANHO_TRECHO = 200  # Caracteres da descrição exibidos quando não há termos de busca
+CACHE_ANEXO = "private, no-cache"  # Cliente guarda o anexo, mas revalida pela ETag a cada abertura
+
+# Campos de `listar_prontuarios?fields=` (resumo: listas sem descrição nem anexo)
+PROJECAO_PRONTUARIOS = Projecao(
+    m.Prontuario, ProntuarioResponse.model_fields, resumo=("id", "paciente_id", "medico_id", "data_hora")
+)
+LISTA_PRONTUARIOS = ListaJSON(ProntuarioResponse)  # Resposta completa de `listar_prontuarios`
+
 
 # ============================================================
 # FUNÇÃO AUXILIAR: Obter usuário atual
@@ -34,6 +63,71 @@ def obter_usuario_atual(
     return current_user  # Retorna usuário com email garantido
 
 
+# ============================================================
+# FUNÇÕES AUXILIARES: Anexos
+# ============================================================
+def carregar_prontuario(db: Session, prontuario_id: int, escopo: Escopo):
+    """Retorna o prontuário ou lança 404 (inexistente) / 403 (fora do escopo do usuário)."""
+    prontuario = db.query(m.Prontuario).filter(m.Prontuario.id == prontuario_id).first()
+    if not prontuario:
+        raise HTTPException(status_code=404, detail="Prontuário não encontrado")
+    if not no_escopo(escopo, prontuario.paciente_id, prontuario.medico_id):
+        raise HTTPException(status_code=403, detail="Sem permissão")
+    return prontuario
+
+
+def carregar_anexo(db: Session, prontuario_id: int, escopo: Escopo):
+    """Retorna (prontuário, blob do anexo) ou lança 404/403."""
+    prontuario = carregar_prontuario(db, prontuario_id, escopo)
+    blob = db.get(m.Blob, prontuario.anexo_sha256) if prontuario.anexo_sha256 else None
+    if not blob:
+        raise HTTPException(status_code=404, detail="Prontuário sem anexo")
+    return prontuario, blob
+
+
+def responder_conteudo(
+        chave: str,
+        tipo_conteudo: str,
+        nome_arquivo: str,
+        etag: str,
+        download: bool = False,
+        tamanho: Optional[int] = None
+):
+    """
+    Resposta com o conteúdo armazenado sob `chave`: arquivo local com
+    suporte a Range e envio sem cópia, ou fluxo em blocos de backend remoto
+    (com `Content-Length` quando o `tamanho` é conhecido).
+    """
+    cabecalhos = {"ETag": etag, "Cache-Control": CACHE_ANEXO}
+    disposicao = "attachment" if download else "inline"
+    backend = obter_backend()
+    caminho = backend.caminho_local(chave)
+    if caminho is not None:
+        if not caminho.is_file():
+            raise HTTPException(status_code=404, detail="Conteúdo do anexo não encontrado")
+        return RespostaArquivo(
+            caminho,
+            headers=cabecalhos,
+            media_type=tipo_conteudo,
+            filename=nome_arquivo,
+            content_disposition_type=disposicao
+        )
+
+    # Backend remoto: conteúdo repassado em blocos, sem intervalos
+    def blocos():
+        with backend.abrir(chave) as arquivo:
+            while bloco := arquivo.read(RespostaArquivo.chunk_size):
+                yield bloco
+
+    cabecalhos.update({
+        "Accept-Ranges": "none",
+        "Content-Disposition": f"{disposicao}; filename*=utf-8''{quote(nome_arquivo)}"
+    })
+    if tamanho is not None:
+        cabecalhos["Content-Length"] = str(tamanho)  # Barra de progresso no cliente, sem chunked
+    return StreamingResponse(blocos(), media_type=tipo_conteudo, headers=cabecalhos)
+
+
 # ============================================================
 # ENDPOINT: Criar Prontuário
 # ============================================================
@@ -66,15 +160,14 @@ async def criar_prontuario(
         raise HTTPException(status_code=404, detail="Paciente ou médico não encontrado")
 
     # ----------------------------
-    # Se houver arquivo, salva em diretório local
+    # Se houver arquivo, recebe em blocos calculando o SHA-256 do conteúdo
     # ----------------------------
-    caminho_arquivo = None
+    anexo = None
     if arquivo:
-        diretorio_upload = Path("uploads/prontuarios")  # Define pasta de uploads
-        diretorio_upload.mkdir(parents=True, exist_ok=True)  # Cria se não existir
-        caminho_arquivo = diretorio_upload / arquivo.filename
-        with open(caminho_arquivo, "wb") as f:
-            f.write(await arquivo.read())  # Grava o arquivo
+        try:
+            anexo = await receber_upload(arquivo)
+        except AnexoMuitoGrande as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
     # ----------------------------
     # Criação do prontuário
@@ -84,12 +177,16 @@ async def criar_prontuario(
         medico_id=medico_id,
         descricao=descricao,
         data_hora=datetime.now(),  # Timestamp atual
-        anexo=str(caminho_arquivo) if caminho_arquivo else None  # Salva caminho do arquivo se existir
+        anexo=nome_arquivo_seguro(arquivo.filename) if anexo else None  # Nome original do arquivo
     )
+    if anexo:  # Conteúdo guardado pelo hash (reaproveitado se já existir)
+        novo.anexo_sha256 = await run_in_threadpool(armazenar, db, anexo, arquivo.content_type)
 
     db.add(novo)  # Adiciona à sessão
     db.commit()  # Salva no banco
     db.refresh(novo)  # Atualiza objeto com ID gerado
+    if anexo:
+        gerador_derivados.solicitar(novo.anexo_sha256, arquivo.content_type)  # Miniatura/prévia em segundo plano
 
     # ----------------------------
     # Registro de auditoria
@@ -106,24 +203,176 @@ async def criar_prontuario(
     return novo  # Retorna prontuário criado
 
 
+# ============================================================
+# ENDPOINT: Enviar anexo em fluxo
+# ============================================================
+@roteador.put("/{prontuario_id}/anexo", response_model=ProntuarioResponse)
+async def enviar_anexo(
+        prontuario_id: int,
+        request: Request,
+        nome_arquivo: Optional[str] = Query(None, description="Nome original do arquivo"),
+        content_type: Optional[str] = Header(None),
+        content_length: Optional[int] = Header(None),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Substitui o anexo do prontuário pelo corpo da requisição (bytes do arquivo).
+
+    - **Acesso:** ADMIN ou MEDICO responsável pelo prontuário
+    - O corpo é gravado em blocos à medida que chega, sem passar por
+      multipart nem ficar em memória; indicado para arquivos grandes
+      (DICOM, PDF)
+    - 413 se `Content-Length` ou o volume recebido exceder o limite
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    prontuario = carregar_prontuario(db, prontuario_id, escopo_do_usuario(usuario_atual))
+
+    if content_length == 0:
+        raise HTTPException(status_code=400, detail="Arquivo vazio")
+    if content_length is not None and content_length > TAMANHO_MAXIMO_ANEXO:  # Recusa antes de receber
+        raise HTTPException(status_code=413, detail=f"Arquivo excede o limite de {TAMANHO_MAXIMO_ANEXO // (1024 * 1024)} MB")
+
+    try:
+        anexo = await gravar_fluxo(request.stream())
+    except AnexoMuitoGrande as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    anterior = prontuario.anexo_sha256
+    prontuario.anexo_sha256 = await run_in_threadpool(armazenar, db, anexo, content_type)
+    liberar(db, anterior)  # Conteúdo anterior perde esta referência (depois do upload)
+    prontuario.anexo = nome_arquivo_seguro(nome_arquivo)
+    db.commit()
+    db.refresh(prontuario)
+    gerador_derivados.solicitar(prontuario.anexo_sha256, content_type)  # Miniatura/prévia em segundo plano
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual.get("email"),
+        tabela="Prontuario",
+        registro_id=prontuario_id,
+        acao="UPDATE",
+        detalhes=f"Anexo de {anexo.tamanho} bytes (sha256 {anexo.sha256[:12]}) enviado por {usuario_atual.get('email')}"
+    )
+
+    return prontuario
+
+
+# ============================================================
+# ENDPOINT: Baixar anexo
+# ============================================================
+@roteador.api_route("/{prontuario_id}/anexo", methods=["GET", "HEAD"])
+def baixar_anexo(
+        prontuario_id: int,
+        download: bool = Query(False, description="Força o download em vez da exibição no navegador"),
+        if_none_match: Optional[str] = Header(None),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Retorna o arquivo anexo do prontuário.
+
+    - **Acesso:** ADMIN ou MEDICO responsável pelo prontuário
+    - ETag forte (SHA-256 do conteúdo): com `If-None-Match` igual, responde 304 sem corpo
+    - Suporta `Range` (206) e `If-Range`, para retomar downloads e navegar em arquivos grandes
+    - **Registra log** dos downloads (exceto 304)
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    prontuario, blob = carregar_anexo(db, prontuario_id, escopo_do_usuario(usuario_atual))
+
+    etag = etag_forte(blob.sha256)
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_ANEXO})
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual.get("email"),
+        tabela="Prontuario",
+        registro_id=prontuario_id,
+        acao="READ",
+        detalhes=f"{usuario_atual.get('email')} baixou o anexo do prontuário {prontuario_id}"
+    )
+
+    return responder_conteudo(
+        blob.sha256,
+        blob.tipo_conteudo or "application/octet-stream",
+        prontuario.anexo or blob.sha256,
+        etag,
+        download,
+        blob.tamanho
+    )
+
+
+# ============================================================
+# ENDPOINT: Prévia do anexo
+# ============================================================
+@roteador.api_route("/{prontuario_id}/anexo/previa", methods=["GET", "HEAD"])
+async def previa_anexo(
+        prontuario_id: int,
+        variante: str = Query("miniatura", pattern="^(miniatura|previa)$", description="miniatura (256 px) ou previa (1024 px)"),
+        if_none_match: Optional[str] = Header(None),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Retorna uma imagem JPEG reduzida do anexo (imagem ou primeira página do PDF),
+    para listagens sem baixar o arquivo original.
+
+    - **Acesso:** ADMIN ou MEDICO responsável pelo prontuário
+    - Gerada em segundo plano no envio; se ainda não existir, é gerada na hora
+    - 404 se o tipo do anexo não tem prévia
+    """
+    if usuario_atual.get("papel") not in ["ADMIN", "MEDICO"]:
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    prontuario, blob = carregar_anexo(db, prontuario_id, escopo_do_usuario(usuario_atual))
+    db.close()  # Conexão não é necessária durante a geração/envio
+
+    etag = etag_forte(f"{blob.sha256}-{variante}")
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_ANEXO})
+
+    chave = chave_derivado(blob.sha256, variante)
+    if not await run_in_threadpool(obter_backend().existe, chave):
+        tarefa = gerador_derivados.solicitar(blob.sha256, blob.tipo_conteudo)
+        if tarefa is None or not await asyncio.shield(tarefa):
+            raise HTTPException(status_code=404, detail="Prévia indisponível para este anexo")
+
+    nome = f"{Path(prontuario.anexo or blob.sha256).stem}-{variante}.jpg"
+    return responder_conteudo(chave, "image/jpeg", nome, etag)
+
+
 # ============================================================
 # ENDPOINT: Listar prontuários
 # ============================================================
 @roteador.get("/", response_model=List[ProntuarioResponse])
 def listar_prontuarios(
+        campos: Optional[str] = Query(None, alias="fields", description="Campos separados por vírgula (ex.: id,paciente_id,data_hora) ou 'resumo'; padrão: todos"),
         db: Session = Depends(get_db),
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
-    Lista todos os prontuários cadastrados.
+    Lista os prontuários, do mais recente para o mais antigo.
 
-    - **Acesso:** apenas MÉDICO ou ADMIN
+    - **Acesso:** apenas MÉDICO ou ADMIN; o médico vê os registros em que é o responsável
+    - `fields`: apenas os campos pedidos (`fields=resumo`: sem descrição nem anexo)
     - **Registra log** da operação
     """
     if usuario_atual.get("papel") not in ["MEDICO", "ADMIN"]:
         raise HTTPException(status_code=403, detail="Sem permissão")
 
-    prontuarios = db.query(m.Prontuario).all()  # Consulta todos os prontuários
+    nomes = PROJECAO_PRONTUARIOS.resolver(campos)
+    query = db.query(m.Prontuario) if nomes is None else PROJECAO_PRONTUARIOS.consultar(db, nomes)
+    escopo = escopo_do_usuario(usuario_atual)
+    prontuarios = (
+        aplicar_escopo(query, escopo, m.Prontuario.paciente_id, m.Prontuario.medico_id)
+        .order_by(m.Prontuario.data_hora.desc(), m.Prontuario.id.desc())
+        .all()
+    )
 
     registrar_log(
         db=db,
@@ -131,10 +380,103 @@ def listar_prontuarios(
         tabela="Prontuario",
         registro_id=None,
         acao="READ",
-        detalhes=f"{usuario_atual.get('email')} listou todos os prontuários"
+        detalhes=f"{usuario_atual.get('email')} listou prontuários ({len(prontuarios)})"
     )
 
-    return prontuarios  # Retorna lista de prontuários
+    if nomes is not None:  # Tuplas das colunas pedidas, sem validação do schema completo
+        return RespostaJSON(PROJECAO_PRONTUARIOS.serializar(prontuarios, nomes))
+    return LISTA_PRONTUARIOS.responder(prontuarios)  # Retorna lista de prontuários
+
+
+# ============================================================
+# ENDPOINT: Buscar prontuários
+# ============================================================
+@roteador.get("/busca", response_model=ResultadoBuscaProntuarios)
+def buscar_prontuarios(
+        q: Optional[str] = Query(None, description="Termos na descrição (prefixos, sem distinção de acentos)"),
+        paciente_id: Optional[int] = Query(None),
+        medico_id: Optional[int] = Query(None),
+        status_prontuario: Optional[str] = Query(None, alias="status"),
+        inicio: Optional[datetime] = Query(None, description="Registros a partir desta data/hora"),
+        fim: Optional[datetime] = Query(None, description="Registros até esta data/hora"),
+        pagina: int = Query(1, ge=1),
+        tamanho: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Busca prontuários pela descrição e/ou por paciente, médico, status e período.
+
+    - **Acesso:** apenas MÉDICO ou ADMIN; o médico busca nos registros em que é o responsável
+    - Retorna trechos da descrição (termos destacados entre « »), não o registro completo
+    - Com `q`: todos os termos devem aparecer, em ordem de relevância
+    - Sem `q`: exige ao menos um filtro; ordem do mais recente para o mais antigo
+    - **Registra log** da operação
+    """
+    if usuario_atual.get("papel") not in ["MEDICO", "ADMIN"]:
+        raise HTTPException(status_code=403, detail="Sem permissão")
+
+    if inicio and fim and inicio > fim:
+        raise HTTPException(status_code=400, detail="Data inicial posterior à data final")
+
+    status_normalizado = status_prontuario.strip().upper() if status_prontuario and status_prontuario.strip() else None
+    escopo = escopo_do_usuario(usuario_atual)
+    if not escopo.irrestrito:  # Médico: filtro pelo próprio cadastro (sem vínculo ou outro médico: nada)
+        if escopo.medico_id is None or medico_id not in (None, escopo.medico_id):
+            return ResultadoBuscaProntuarios(items=[], pagina=pagina, proxima_pagina=None)
+        medico_id = escopo.medico_id
+    filtros = {"paciente_id": paciente_id, "medico_id": medico_id, "status": status_normalizado}
+    deslocamento = (pagina - 1) * tamanho
+
+    if q and q.strip():
+        try:
+            linhas = buscar_trechos(
+                db, "prontuarios", q, tamanho + 1, deslocamento,
+                filtros=filtros, inicio=inicio, fim=fim,
+                colunas=("paciente_id", "medico_id", "data_hora", "status", "anexo")
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        if all(v is None for v in filtros.values()) and inicio is None and fim is None:
+            raise HTTPException(status_code=400, detail="Informe termos de busca ou ao menos um filtro")
+
+        P = m.Prontuario
+        consulta = db.query(
+            P.id, P.paciente_id, P.medico_id, P.data_hora, P.status, P.anexo,
+            func.substr(P.descricao, 1, TAMANHO_TRECHO + 1).label("trecho")
+        )
+        for coluna, valor in filtros.items():
+            if valor is not None:
+                consulta = consulta.filter(getattr(P, coluna) == valor)
+        if inicio:
+            consulta = consulta.filter(P.data_hora >= inicio)
+        if fim:
+            consulta = consulta.filter(P.data_hora <= fim)
+        linhas = []
+        for linha in consulta.order_by(P.data_hora.desc(), P.id.desc()).offset(deslocamento).limit(tamanho + 1):
+            linha = dict(linha._mapping)
+            trecho = linha["trecho"] or ""
+            linha["trecho"] = trecho[:TAMANHO_TRECHO] + "…" if len(trecho) > TAMANHO_TRECHO else trecho
+            linhas.append(linha)
+
+    registrar_log(
+        db=db,
+        usuario_email=usuario_atual.get("email"),
+        tabela="Prontuario",
+        registro_id=None,
+        acao="READ",
+        detalhes=(
+            f"{usuario_atual.get('email')} buscou prontuários: q='{q or ''}', paciente={paciente_id}, "
+            f"medico={medico_id}, status={status_normalizado}, periodo={inicio}..{fim} (página {pagina})"
+        )
+    )
+
+    return ResultadoBuscaProntuarios(
+        items=[{**linha, "tem_anexo": bool(linha["anexo"])} for linha in linhas[:tamanho]],
+        pagina=pagina,
+        proxima_pagina=pagina + 1 if len(linhas) > tamanho else None
+    )
 
 
 # ============================================================
@@ -159,6 +501,7 @@ def excluir_prontuario(
     if not prontuario:
         raise HTTPException(status_code=404, detail="Prontuário não encontrado")
 
+    liberar(db, prontuario.anexo_sha256)  # Anexo sem referências é removido pela coleta de lixo
     db.delete(prontuario)  # Remove do banco
     db.commit()  # Salva alterações
 
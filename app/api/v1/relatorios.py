@@ -4,7 +4,9 @@ from datetime import datetime, date  # Para manipulação de datas
 from app.db import get_db  # Sessão do banco
 from app import models as m  # Models do projeto
 from app.core import security  # Segurança e autenticação
+from app.core.escopo import aplicar_escopo, escopo_do_usuario  # Escopo por papel
 from app.utils.logs import registrar_log  # Função utilitária para logs
+from app.utils.datas import data_br, hora_br  # Datas dd/mm/yyyy e HH:MM sem strftime
 
 roteador = APIRouter()  # Cria o roteador FastAPI
 
@@ -67,8 +69,8 @@ def relatorio_consultas(
 
     retorno = []
     for c in consultas:
-        data_consulta = c.data_hora.strftime("%d/%m/%Y") if c.data_hora else None
-        hora_consulta = c.data_hora.strftime("%H:%M") if c.data_hora else None
+        data_consulta = data_br(c.data_hora)
+        hora_consulta = hora_br(c.data_hora)
         retorno.append({
             "medico_id": c.medico.id,
             "medico_nome": c.medico.nome,
@@ -112,7 +114,7 @@ def relatorio_prontuarios(
 
     retorno = []
     for p in prontuarios:
-        data_hora = p.data_hora.strftime("%d/%m/%Y %H:%M") if p.data_hora else None
+        data_hora = f"{data_br(p.data_hora)} {hora_br(p.data_hora)}" if p.data_hora else None
         retorno.append({
             "prontuario_id": p.id,
             "paciente_nome": p.paciente.nome,
@@ -141,7 +143,7 @@ def relatorio_teleconsultas(
 ):
     """
     Gera relatório de teleconsultas entre duas datas.
-    Permissão restrita a usuários ADMIN ou MEDICO.
+    Permissão restrita a usuários ADMIN ou MEDICO; o médico vê apenas as próprias teleconsultas.
     Retorna informações do paciente, médico, data/hora, duração, status e link de vídeo.
     """
     if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:
@@ -150,14 +152,16 @@ def relatorio_teleconsultas(
     data_ini = parse_data_br(data_inicial)
     data_fim = parse_data_br(data_final)
 
-    registros = db.query(m.Teleconsulta).join(m.Consulta).join(m.Paciente).join(m.Medico).filter(
+    query = db.query(m.Teleconsulta).join(m.Consulta).join(m.Paciente).join(m.Medico).filter(
         m.Teleconsulta.data_hora.between(data_ini, data_fim)
-    ).all()  # Busca teleconsultas
+    )
+    query = aplicar_escopo(query, escopo_do_usuario(usuario_atual), m.Consulta.paciente_id, m.Consulta.medico_id)
+    registros = query.all()  # Busca teleconsultas do escopo
 
     retorno = []
     for t in registros:
-        data_consulta = t.data_hora.strftime("%d/%m/%Y") if t.data_hora else None
-        hora_consulta = t.data_hora.strftime("%H:%M") if t.data_hora else None
+        data_consulta = data_br(t.data_hora)
+        hora_consulta = hora_br(t.data_hora)
         retorno.append({
             "teleconsulta_id": t.id,
             "paciente_nome": t.consulta.paciente.nome,
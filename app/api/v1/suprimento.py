@@ -1,15 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status  # FastAPI imports
+from fastapi import APIRouter, Depends, HTTPException, status, Query  # FastAPI imports
 from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+from sqlalchemy import tuple_  # Comparação de (data_hora, id) na paginação
 from typing import List, Optional  # Tipagens opcionais
-from datetime import datetime  # Manipulação de datas
+from datetime import datetime, date, time  # Manipulação de datas
+import uuid  # Identificador de lote das dispensações
 from app.db import get_db  # Sessão do banco
 from app import models as m  # Models do projeto
 from app.core import security  # Autenticação e segurança
-from app.schemas.suprimento import SuprimentoResponse  # Schema de resposta
+from app.schemas.suprimento import (
+    SuprimentoResponse,  # Schema de resposta
+    MovimentoSuprimentoResponse,  # Linha do livro de estoque
+    PaginaMovimentosResponse,  # Extrato paginado
+    DispensacaoRequest,  # Dispensação em lote (entrada)
+    DispensacaoResponse,  # Dispensação em lote (resultado)
+    PaginaSuprimentosResponse,  # Página de suprimentos filtrados
+    AlertasSuprimentoResponse,  # Alertas materializados
+    ResultadoBuscaSuprimentos,  # Resultado da busca textual
+)
+from app.models import TipoMovimentoSuprimento, TipoAlertaSuprimento  # Enums de movimento e de alerta
+from app.utils.datas import data_br  # Datas dd/mm/yyyy sem strftime
+from app.utils.respostas import ListaJSON  # Listas serializadas por TypeAdapter
+from app.core.alertas import condicoes_alerta, materializar_alertas, DIAS_AVISO_VALIDADE  # Alertas de suprimentos
+from app.core.estoque import movimentar, definir_quantidade  # Movimentações atômicas de estoque
+from app.utils.paginacao import (  # Cursores de paginação
+    codificar_cursor,
+    decodificar_cursor,
+    codificar_cursor_inteiros,
+    decodificar_cursor_inteiros,
+)
 from app.utils.logs import registrar_log  # Função utilitária para logs
+from app.core.busca import buscar_ids, carregar_em_ordem  # Busca textual indexada
+from app.core.eventos import barramento_eventos  # Notificações em tempo real
 
 roteador = APIRouter()  # Inicializa o roteador de endpoints desta rota
 
+LISTA_SUPRIMENTOS = ListaJSON(SuprimentoResponse)  # Serializador de `listar_suprimentos`
+
 
 # ============================================================
 # Função auxiliar: obter usuário atual garantindo campo "email"
@@ -42,7 +68,8 @@ def formatar_data_retorno(suprimento: m.Suprimento) -> dict:
         "id": suprimento.id,
         "nome": suprimento.nome,
         "quantidade": suprimento.quantidade,
-        "data_validade": suprimento.data_validade.strftime("%d/%m/%Y") if suprimento.data_validade else None,
+        "nivel_reposicao": suprimento.nivel_reposicao,
+        "data_validade": data_br(suprimento.data_validade),
         "descricao": suprimento.descricao
     }
 
@@ -54,6 +81,7 @@ def formatar_data_retorno(suprimento: m.Suprimento) -> dict:
 def criar_suprimento(
         nome: str,
         quantidade: int,
+        nivel_reposicao: int = 0,
         data_validade: Optional[str] = None,
         descricao: Optional[str] = None,
         db: Session = Depends(get_db),
@@ -64,10 +92,12 @@ def criar_suprimento(
 
     - **Acesso restrito:** Apenas ADMIN
     - **Campos obrigatórios:** nome, quantidade
-    - **Campos opcionais:** data_validade (dd/mm/yyyy), descricao
+    - **Campos opcionais:** nivel_reposicao, data_validade (dd/mm/yyyy), descricao
     """
     if usuario_atual["papel"] != "ADMIN":  # Valida permissão
         raise HTTPException(status_code=403, detail="Acesso negado: apenas ADMIN")
+    if quantidade < 0 or nivel_reposicao < 0:
+        raise HTTPException(status_code=400, detail="Quantidade e nível de reposição não podem ser negativos")
 
     # Converte data_validade de string para date
     validade = None
@@ -81,12 +111,24 @@ def criar_suprimento(
     novo_suprimento = m.Suprimento(
         nome=nome,
         quantidade=quantidade,
+        nivel_reposicao=nivel_reposicao,
         data_validade=validade,
         descricao=descricao
     )
     db.add(novo_suprimento)
+    db.flush()  # Gera o ID para o livro de estoque
+    if quantidade:
+        db.add(m.MovimentoSuprimento(  # Estoque inicial entra no livro
+            suprimento_id=novo_suprimento.id,
+            tipo=TipoMovimentoSuprimento.ENTRADA,
+            quantidade=quantidade,
+            saldo_resultante=quantidade,
+            motivo="Estoque inicial",
+            usuario_email=usuario_atual.get("email")
+        ))
     db.commit()
     db.refresh(novo_suprimento)  # Atualiza objeto com ID gerado
+    barramento_eventos.publicar("suprimento", "criado", formatar_data_retorno(novo_suprimento))
 
     # Log de auditoria
     registrar_log(
@@ -128,7 +170,213 @@ def listar_suprimentos(
         detalhes="Listagem de suprimentos"
     )
 
-    return [formatar_data_retorno(s) for s in suprimentos]  # Retorna lista formatada
+    return LISTA_SUPRIMENTOS.responder([formatar_data_retorno(s) for s in suprimentos])  # Retorna lista formatada
+
+
+# ============================================================
+# BUSCAR SUPRIMENTOS
+# ============================================================
+@roteador.get("/suprimentos/busca", response_model=ResultadoBuscaSuprimentos)
+def buscar_suprimentos(
+        q: str = Query(..., min_length=1, description="Termos de busca (prefixos, sem distinção de acentos)"),
+        pagina: int = Query(1, ge=1),
+        tamanho: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Busca suprimentos por nome e descrição no índice textual, em ordem de relevância.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - Todos os termos devem aparecer (como início de palavra): "dipi 500" encontra "Dipirona 500mg"
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    try:
+        ids = buscar_ids(db, "suprimentos", q, tamanho + 1, (pagina - 1) * tamanho)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    suprimentos = carregar_em_ordem(db, m.Suprimento, ids[:tamanho])
+
+    registrar_log(
+        db,
+        usuario_atual["email"],
+        "Suprimento",
+        acao="READ",
+        detalhes=f"Busca de suprimentos: '{q}' (página {pagina})"
+    )
+
+    return ResultadoBuscaSuprimentos(
+        items=[formatar_data_retorno(s) for s in suprimentos],
+        pagina=pagina,
+        proxima_pagina=pagina + 1 if len(ids) > tamanho else None
+    )
+
+
+# ============================================================
+# Função auxiliar: página ordenada por (data_validade, id)
+# ============================================================
+def paginar_por_validade(query, cursor: Optional[str], tamanho: int) -> PaginaSuprimentosResponse:
+    """
+    Pagina por cursor sobre (data_validade, id), da validade mais próxima
+    para a mais distante, usando o índice `ix_suprimentos_validade_id`.
+    """
+    S = m.Suprimento
+    if cursor:
+        data_cursor, id_cursor = decodificar_cursor(cursor)
+        query = query.filter(tuple_(S.data_validade, S.id) > tuple_(data_cursor.date(), id_cursor))
+    suprimentos = query.order_by(S.data_validade, S.id).limit(tamanho + 1).all()
+
+    proximo_cursor = None
+    if len(suprimentos) > tamanho:
+        suprimentos = suprimentos[:tamanho]
+        ultimo = suprimentos[-1]
+        proximo_cursor = codificar_cursor(datetime.combine(ultimo.data_validade, time.min), ultimo.id)
+
+    return PaginaSuprimentosResponse(
+        items=[formatar_data_retorno(s) for s in suprimentos],
+        proximo_cursor=proximo_cursor
+    )
+
+
+# ============================================================
+# SUPRIMENTOS A VENCER
+# ============================================================
+@roteador.get("/suprimentos/vencendo", response_model=PaginaSuprimentosResponse)
+def listar_vencendo(
+        dias: int = Query(DIAS_AVISO_VALIDADE, ge=0, le=3650, description="Janela em dias a partir de hoje"),
+        cursor: Optional[str] = None,
+        tamanho: int = Query(50, ge=1, le=500),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Suprimentos que vencem entre hoje e `dias` à frente, pela validade mais próxima.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    condicao = condicoes_alerta(date.today(), dias)[TipoAlertaSuprimento.VENCENDO]
+    return paginar_por_validade(db.query(m.Suprimento).filter(condicao), cursor, tamanho)
+
+
+# ============================================================
+# SUPRIMENTOS VENCIDOS
+# ============================================================
+@roteador.get("/suprimentos/vencidos", response_model=PaginaSuprimentosResponse)
+def listar_vencidos(
+        cursor: Optional[str] = None,
+        tamanho: int = Query(50, ge=1, le=500),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Suprimentos com validade anterior a hoje, do vencimento mais antigo ao mais recente.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    condicao = condicoes_alerta(date.today(), 0)[TipoAlertaSuprimento.VENCIDO]
+    return paginar_por_validade(db.query(m.Suprimento).filter(condicao), cursor, tamanho)
+
+
+# ============================================================
+# SUPRIMENTOS COM ESTOQUE BAIXO
+# ============================================================
+@roteador.get("/suprimentos/estoque-baixo", response_model=PaginaSuprimentosResponse)
+def listar_estoque_baixo(
+        cursor: Optional[str] = None,
+        tamanho: int = Query(50, ge=1, le=500),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Suprimentos com quantidade igual ou abaixo do nível de reposição,
+    dos mais críticos (maior déficit) para os menos críticos.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    S = m.Suprimento
+    folga = S.quantidade - S.nivel_reposicao  # Mesma expressão do índice ix_suprimentos_folga_reposicao
+    query = db.query(S).filter(condicoes_alerta(date.today(), 0)[TipoAlertaSuprimento.ESTOQUE_BAIXO])
+    if cursor:
+        folga_cursor, id_cursor = decodificar_cursor_inteiros(cursor, 2)
+        query = query.filter(tuple_(folga, S.id) > tuple_(folga_cursor, id_cursor))
+    suprimentos = query.order_by(folga, S.id).limit(tamanho + 1).all()
+
+    proximo_cursor = None
+    if len(suprimentos) > tamanho:
+        suprimentos = suprimentos[:tamanho]
+        ultimo = suprimentos[-1]
+        proximo_cursor = codificar_cursor_inteiros(ultimo.quantidade - ultimo.nivel_reposicao, ultimo.id)
+
+    return PaginaSuprimentosResponse(
+        items=[formatar_data_retorno(s) for s in suprimentos],
+        proximo_cursor=proximo_cursor
+    )
+
+
+# ============================================================
+# ALERTAS DE SUPRIMENTOS
+# ============================================================
+@roteador.get("/alertas", response_model=AlertasSuprimentoResponse)
+def listar_alertas(
+        tipo: Optional[str] = Query(None, description="VENCIDO, VENCENDO ou ESTOQUE_BAIXO"),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Lista materializada de alertas (vencidos, a vencer e estoque baixo),
+    recalculada periodicamente em segundo plano; a leitura percorre apenas
+    os itens em alerta.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    A = m.AlertaSuprimento
+    query = db.query(A)
+    if tipo:
+        try:
+            query = query.filter(A.tipo == TipoAlertaSuprimento(tipo.strip().upper()))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Tipo inválido: use VENCIDO, VENCENDO ou ESTOQUE_BAIXO")
+    alertas = query.order_by(A.tipo, A.data_validade, A.suprimento_id).all()
+
+    return AlertasSuprimentoResponse(
+        gerado_em=alertas[0].gerado_em if alertas else None,
+        items=alertas
+    )
+
+
+@roteador.post("/alertas/atualizar", response_model=AlertasSuprimentoResponse)
+def atualizar_alertas(
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Recalcula os alertas imediatamente, sem esperar a próxima execução agendada.
+
+    - **Acesso restrito:** Apenas ADMIN
+    """
+    if usuario_atual["papel"] != "ADMIN":  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    materializar_alertas(db)
+    return listar_alertas(None, db, usuario_atual)
 
 
 # ============================================================
@@ -139,6 +387,8 @@ def atualizar_suprimento(
         id: int,
         nome: Optional[str] = None,
         quantidade: Optional[int] = None,
+        quantidade_esperada: Optional[int] = None,
+        nivel_reposicao: Optional[int] = None,
         data_validade: Optional[str] = None,
         descricao: Optional[str] = None,
         db: Session = Depends(get_db),
@@ -148,8 +398,12 @@ def atualizar_suprimento(
     Atualiza os campos de um suprimento existente pelo ID.
 
     - **Acesso restrito:** Apenas ADMIN
-    - **Campos opcionais:** nome, quantidade, data_validade, descricao
+    - **Campos opcionais:** nome, quantidade, nivel_reposicao, data_validade, descricao
     - **Formatação de data:** dd/mm/yyyy
+    - **quantidade** é gravada por compare-and-set: só se o estoque ainda for
+      `quantidade_esperada` (ou, se omitida, o valor lido nesta requisição);
+      caso contrário retorna 409. A diferença entra no livro como AJUSTE.
+      Para entradas e saídas use `/suprimentos/{id}/movimentos`.
     """
     if usuario_atual["papel"] != "ADMIN":  # Valida permissão
         raise HTTPException(status_code=403, detail="Acesso negado")
@@ -162,7 +416,17 @@ def atualizar_suprimento(
         suprimento.nome = nome
 
     if quantidade is not None:
-        suprimento.quantidade = quantidade
+        if quantidade < 0:
+            raise HTTPException(status_code=400, detail="Quantidade não pode ser negativa")
+        esperada = quantidade_esperada if quantidade_esperada is not None else suprimento.quantidade
+        if not definir_quantidade(db, id, quantidade, esperada, "Ajuste manual", usuario_atual.get("email")):
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Estoque alterado por outra operação; releia e tente novamente")
+
+    if nivel_reposicao is not None:
+        if nivel_reposicao < 0:
+            raise HTTPException(status_code=400, detail="Nível de reposição não pode ser negativo")
+        suprimento.nivel_reposicao = nivel_reposicao
 
     if data_validade is not None and data_validade.strip():
         try:
@@ -175,6 +439,7 @@ def atualizar_suprimento(
 
     db.commit()
     db.refresh(suprimento)
+    barramento_eventos.publicar("suprimento", "atualizado", formatar_data_retorno(suprimento))
 
     registrar_log(
         db,
@@ -210,8 +475,10 @@ def excluir_suprimento(
     if not suprimento:
         raise HTTPException(status_code=404, detail="Suprimento não encontrado")
 
+    dados_excluido = formatar_data_retorno(suprimento)  # Último estado, para o evento
     db.delete(suprimento)
     db.commit()
+    barramento_eventos.publicar("suprimento", "excluido", dados_excluido)
 
     registrar_log(
         db,
@@ -223,3 +490,175 @@ def excluir_suprimento(
     )
 
     return {"detail": "Suprimento excluído com sucesso"}  # Retorna mensagem de sucesso
+
+
+# ============================================================
+# Função utilitária: publicar movimentação
+# ============================================================
+def publicar_movimento(movimento: m.MovimentoSuprimento):
+    """Publica no barramento de eventos o novo saldo de um suprimento movimentado."""
+    barramento_eventos.publicar("suprimento", "movimentado", {
+        "id": movimento.suprimento_id,
+        "quantidade": movimento.saldo_resultante,
+        "delta": movimento.quantidade,
+        "tipo": movimento.tipo.value,
+        "lote": movimento.lote,
+    })
+
+
+# ============================================================
+# REGISTRAR MOVIMENTO DE ESTOQUE
+# ============================================================
+@roteador.post(
+    "/suprimentos/{id}/movimentos",
+    response_model=MovimentoSuprimentoResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def registrar_movimento(
+        id: int,
+        tipo: str = Query(..., description="entrada, saida ou ajuste"),
+        quantidade: int = Query(..., description="Quantidade (entrada/saida: positiva; ajuste: com sinal)"),
+        motivo: Optional[str] = None,
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Registra uma movimentação de estoque aplicando o delta no banco,
+    sem sobrescrever a quantidade (sem perda de atualizações concorrentes).
+
+    - **Acesso:** saída por ADMIN ou MEDICO; entrada e ajuste apenas ADMIN
+    - Saídas (e ajustes negativos) maiores que o saldo retornam 409
+    """
+    try:
+        tipo_movimento = TipoMovimentoSuprimento(tipo.strip().upper())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Tipo inválido: use entrada, saida ou ajuste")
+
+    papeis = ["ADMIN", "MEDICO"] if tipo_movimento == TipoMovimentoSuprimento.SAIDA else ["ADMIN"]
+    if usuario_atual["papel"] not in papeis:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    if tipo_movimento == TipoMovimentoSuprimento.AJUSTE:
+        if quantidade == 0:
+            raise HTTPException(status_code=400, detail="Ajuste deve ter quantidade diferente de zero")
+        delta = quantidade
+    else:
+        if quantidade <= 0:
+            raise HTTPException(status_code=400, detail="Quantidade deve ser positiva")
+        delta = quantidade if tipo_movimento == TipoMovimentoSuprimento.ENTRADA else -quantidade
+
+    movimento = movimentar(db, id, delta, tipo_movimento, motivo, usuario_atual.get("email"))
+    if movimento is None:
+        db.rollback()
+        disponivel = db.query(m.Suprimento.quantidade).filter(m.Suprimento.id == id).scalar()
+        if disponivel is None:
+            raise HTTPException(status_code=404, detail="Suprimento não encontrado")
+        raise HTTPException(status_code=409, detail=f"Estoque insuficiente: disponível {disponivel}")
+    db.commit()
+    publicar_movimento(movimento)
+
+    registrar_log(
+        db,
+        usuario_atual["email"],
+        "Suprimento",
+        registro_id=id,
+        acao="UPDATE",
+        detalhes=f"{tipo_movimento.value} de {abs(delta)} no suprimento {id} (saldo {movimento.saldo_resultante})"
+    )
+
+    return movimento
+
+
+# ============================================================
+# EXTRATO DE MOVIMENTOS
+# ============================================================
+@roteador.get("/suprimentos/{id}/movimentos", response_model=PaginaMovimentosResponse)
+def listar_movimentos(
+        id: int,
+        cursor: Optional[str] = None,
+        tamanho: int = Query(50, ge=1, le=500),
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Extrato de movimentações de um suprimento, da mais recente para a mais antiga.
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - **cursor**: valor de `proximo_cursor` da página anterior
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    M = m.MovimentoSuprimento
+    query = db.query(M).filter(M.suprimento_id == id)
+    if cursor:
+        data_cursor, id_cursor = decodificar_cursor(cursor)
+        query = query.filter(tuple_(M.data_hora, M.id) < tuple_(data_cursor, id_cursor))
+    movimentos = query.order_by(M.data_hora.desc(), M.id.desc()).limit(tamanho + 1).all()
+
+    proximo_cursor = None
+    if len(movimentos) > tamanho:
+        movimentos = movimentos[:tamanho]
+        proximo_cursor = codificar_cursor(movimentos[-1].data_hora, movimentos[-1].id)
+
+    return PaginaMovimentosResponse(items=movimentos, proximo_cursor=proximo_cursor)
+
+
+# ============================================================
+# DISPENSAÇÃO EM LOTE
+# ============================================================
+@roteador.post("/dispensacoes", response_model=DispensacaoResponse, status_code=status.HTTP_201_CREATED)
+def dispensar_lote(
+        dados: DispensacaoRequest,
+        db: Session = Depends(get_db),
+        usuario_atual=Depends(obter_usuario_atual)
+):
+    """
+    Dispensa vários itens em uma única transação (tudo ou nada).
+
+    - **Acesso restrito:** ADMIN ou MEDICO
+    - Itens repetidos são somados; as baixas são aplicadas em ordem de ID
+    - Se algum item não existir ou não tiver saldo, nada é baixado e a
+      resposta 409 lista os itens com problema
+    """
+    if usuario_atual["papel"] not in ["ADMIN", "MEDICO"]:  # Valida permissão
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    solicitado = {}
+    for item in dados.itens:
+        solicitado[item.suprimento_id] = solicitado.get(item.suprimento_id, 0) + item.quantidade
+
+    lote = uuid.uuid4().hex
+    movimentos, falhas = [], []
+    for suprimento_id in sorted(solicitado):  # Ordem fixa evita deadlock entre lotes concorrentes
+        movimento = movimentar(db, suprimento_id, -solicitado[suprimento_id], TipoMovimentoSuprimento.SAIDA,
+                               dados.motivo, usuario_atual.get("email"), lote)
+        if movimento is None:
+            falhas.append(suprimento_id)
+        else:
+            movimentos.append(movimento)
+
+    if falhas:
+        db.rollback()
+        disponiveis = dict(db.query(m.Suprimento.id, m.Suprimento.quantidade).filter(m.Suprimento.id.in_(falhas)))
+        raise HTTPException(status_code=409, detail={
+            "mensagem": "Dispensação não realizada: estoque insuficiente ou item inexistente",
+            "itens": [
+                {"suprimento_id": i, "solicitado": solicitado[i], "disponivel": disponiveis.get(i)}
+                for i in falhas
+            ]
+        })
+    db.commit()
+
+    for movimento in movimentos:
+        publicar_movimento(movimento)
+
+    registrar_log(
+        db,
+        usuario_atual["email"],
+        "Suprimento",
+        acao="UPDATE",
+        detalhes=f"Dispensação {lote}: {len(movimentos)} item(ns)"
+    )
+
+    return DispensacaoResponse(lote=lote, movimentos=movimentos)
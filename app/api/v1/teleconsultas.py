@@ -8,8 +8,11 @@ from app import models as m  # Models do projeto
 from app.core import security  # Segurança e autenticação
 from app.schemas import TeleconsultaResponse  # Schema de resposta
 from app.utils.logs import registrar_log  # Função utilitária de logs
+from app.core.escopo import escopo_do_usuario, escopo_teleconsultas  # Escopo por papel
+from app.utils.respostas import ListaJSON  # Listas serializadas por TypeAdapter
 
 roteador = APIRouter()  # Inicializa roteador de endpoints
+LISTA_TELECONSULTAS = ListaJSON(TeleconsultaResponse)  # Serializador de `listar_teleconsultas`
 
 
 # ============================================================
@@ -93,15 +96,18 @@ def listar_teleconsultas(
         usuario_atual=Depends(obter_usuario_atual)
 ):
     """
-    Lista todas as teleconsultas cadastradas.
+    Lista as teleconsultas, da mais recente para a mais antiga.
 
-    - **Acesso:** apenas MEDICO ou ADMIN
+    - **ADMIN:** todas
+    - **MEDICO / PACIENTE:** as das suas consultas
     - **Registra log** da operação
     """
-    if usuario_atual.get("papel") not in ["MEDICO", "ADMIN"]:  # Valida permissão
-        raise HTTPException(status_code=403, detail="Sem permissão")
-
-    teleconsultas = db.query(m.Teleconsulta).all()  # Busca todas teleconsultas
+    escopo = escopo_do_usuario(usuario_atual)
+    teleconsultas = (
+        escopo_teleconsultas(db.query(m.Teleconsulta), escopo)
+        .order_by(m.Teleconsulta.data_hora.desc(), m.Teleconsulta.id.desc())
+        .all()
+    )
 
     # Log de auditoria
     registrar_log(
@@ -110,10 +116,10 @@ def listar_teleconsultas(
         tabela="Teleconsulta",
         registro_id=None,
         acao="READ",
-        detalhes=f"{usuario_atual.get('email')} listou todas as teleconsultas"
+        detalhes=f"{usuario_atual.get('email')} listou teleconsultas ({len(teleconsultas)})"
     )
 
-    return teleconsultas  # Retorna lista completa
+    return LISTA_TELECONSULTAS.responder(teleconsultas)  # Retorna lista do escopo
 
 
 # ============================================================
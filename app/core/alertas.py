@@ -0,0 +1,89 @@
+# D:\ProjectSGHSS\app\core\alertas.py
+# Alertas de suprimentos (validade e estoque) materializados por tarefa agendada
+
+import asyncio  # Tarefa periódica no loop da aplicação
+import os  # Variáveis de ambiente
+from datetime import date, datetime, timedelta  # Datas de referência
+from typing import Dict, Optional  # Tipagens
+
+from sqlalchemy import DateTime, String, delete, insert, literal, select  # SQL em lote
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+from app.db import SessionLocal  # Sessão própria para a tarefa agendada
+from app.models import TipoAlertaSuprimento  # Enum de tipo de alerta
+
+# -------------------------------
+# Configurações
+# -------------------------------
+DIAS_AVISO_VALIDADE = int(os.getenv("DIAS_AVISO_VALIDADE", 30))  # Janela de "a vencer"
+INTERVALO_ALERTAS_MINUTOS = int(os.getenv("INTERVALO_ALERTAS_MINUTOS", 15))  # Periodicidade do recálculo
+
+
+def condicoes_alerta(hoje: date, dias_aviso: int) -> Dict[TipoAlertaSuprimento, object]:
+    """Filtros SQL de cada tipo de alerta (os mesmos usados pelas consultas diretas)."""
+    S = m.Suprimento
+    return {
+        TipoAlertaSuprimento.VENCIDO: S.data_validade < hoje,
+        TipoAlertaSuprimento.VENCENDO: S.data_validade.between(hoje, hoje + timedelta(days=dias_aviso)),
+        TipoAlertaSuprimento.ESTOQUE_BAIXO: (S.quantidade - S.nivel_reposicao) <= 0,
+    }
+
+
+def materializar_alertas(
+        db: Session,
+        hoje: Optional[date] = None,
+        dias_aviso: int = DIAS_AVISO_VALIDADE
+) -> Dict[TipoAlertaSuprimento, int]:
+    """
+    Recalcula a tabela `alertas_suprimento` inteiramente no banco
+    (DELETE + INSERT ... SELECT por tipo) em uma única transação, de modo
+    que leitores veem sempre a lista anterior ou a nova, nunca parcial.
+
+    Retorna a quantidade de alertas por tipo.
+    """
+    hoje = hoje or date.today()
+    agora = datetime.now()
+    S, A = m.Suprimento, m.AlertaSuprimento
+    quantidades = {}
+
+    db.execute(delete(A))
+    for tipo, condicao in condicoes_alerta(hoje, dias_aviso).items():
+        origem = select(
+            S.id,
+            literal(tipo.value, String),
+            S.nome,
+            S.quantidade,
+            S.nivel_reposicao,
+            S.data_validade,
+            literal(agora, DateTime)
+        ).where(condicao)
+        quantidades[tipo] = db.execute(
+            insert(A).from_select(
+                [A.suprimento_id, A.tipo, A.nome, A.quantidade, A.nivel_reposicao, A.data_validade, A.gerado_em],
+                origem
+            )
+        ).rowcount
+    db.commit()
+    return quantidades
+
+
+def _materializar_em_nova_sessao():
+    with SessionLocal() as db:
+        return materializar_alertas(db)
+
+
+async def agendar_alertas(intervalo_minutos: int = INTERVALO_ALERTAS_MINUTOS):
+    """
+    Laço executado durante a vida da aplicação: recalcula os alertas na
+    inicialização e depois a cada `intervalo_minutos`, em uma thread para
+    não bloquear o loop. Com vários workers, cada um executa o recálculo,
+    que é idempotente.
+    """
+    while True:
+        try:
+            quantidades = await asyncio.to_thread(_materializar_em_nova_sessao)
+            print(f"🔔 Alertas de suprimentos atualizados: {sum(quantidades.values())}")
+        except Exception as e:  # Falha pontual não interrompe o agendamento
+            print(f"❌ Erro ao atualizar alertas de suprimentos: {e}")
+        await asyncio.sleep(intervalo_minutos * 60)
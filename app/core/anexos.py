@@ -0,0 +1,118 @@
+# D:\ProjectSGHSS\app\core\anexos.py
+# Recebimento de anexos em fluxo: cópia em blocos, limite de tamanho e SHA-256 calculado no caminho
+
+import hashlib  # Hash do conteúdo calculado durante a cópia
+import os  # Variáveis de ambiente e operações de arquivo
+import re  # Limpeza do nome original
+import tempfile  # Arquivo parcial durante o recebimento
+from dataclasses import dataclass  # Resultado da gravação
+from pathlib import Path  # Manipulação de caminhos
+from typing import AsyncIterator  # Fluxo de blocos
+
+from fastapi import UploadFile  # Arquivo recebido via multipart
+from starlette.concurrency import run_in_threadpool  # E/S de disco fora do loop
+
+# -------------------------------
+# Configurações
+# -------------------------------
+DIRETORIO_ENVIOS = Path(os.getenv("DIRETORIO_ENVIOS", "uploads/.envios"))  # Arquivos em recebimento
+TAMANHO_BLOCO = 1024 * 1024  # Bytes por escrita (1 MiB)
+TAMANHO_MAXIMO_ANEXO = int(os.getenv("TAMANHO_MAXIMO_ANEXO_MB", 256)) * 1024 * 1024  # Limite por arquivo
+
+
+class AnexoMuitoGrande(Exception):
+    """O conteúdo recebido ultrapassou o limite de tamanho."""
+
+
+@dataclass(frozen=True)
+class AnexoSalvo:
+    """Arquivo recebido: caminho temporário, SHA-256 (hex) e tamanho em bytes."""
+    caminho: Path
+    sha256: str
+    tamanho: int
+
+
+def nome_arquivo_seguro(nome_arquivo: str) -> str:
+    """Nome original sem diretórios nem caracteres de controle, para exibição e download."""
+    nome = re.sub(r"[\x00-\x1f\x7f\\/]", "_", Path((nome_arquivo or "").replace("\\", "/")).name).strip()
+    return nome[-255:] or "anexo"
+
+
+class GravadorAnexo:
+    """
+    Grava o conteúdo bloco a bloco em um arquivo temporário, calculando
+    SHA-256 e tamanho no caminho. O arquivo concluído é entregue ao
+    armazenamento (`app.core.armazenamento`), que o guarda pelo hash.
+
+    Os métodos fazem E/S bloqueante e devem ser chamados fora do loop.
+    """
+
+    def __init__(self, diretorio: Path = DIRETORIO_ENVIOS, limite: int = TAMANHO_MAXIMO_ANEXO):
+        diretorio.mkdir(parents=True, exist_ok=True)
+        descritor, nome = tempfile.mkstemp(dir=diretorio, prefix=".envio-", suffix=".parcial")
+        self._arquivo = os.fdopen(descritor, "wb")
+        self._temporario = Path(nome)
+        self._hash = hashlib.sha256()
+        self.diretorio = diretorio
+        self.limite = limite
+        self.tamanho = 0
+
+    def escrever(self, bloco: bytes):
+        self.tamanho += len(bloco)
+        if self.tamanho > self.limite:  # Interrompe assim que o limite é ultrapassado
+            raise AnexoMuitoGrande(f"Arquivo excede o limite de {self.limite // (1024 * 1024)} MB")
+        self._hash.update(bloco)
+        self._arquivo.write(bloco)
+
+    def concluir(self) -> AnexoSalvo:
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())  # Conteúdo em disco antes de ser armazenado
+        self._arquivo.close()
+        return AnexoSalvo(self._temporario, self._hash.hexdigest(), self.tamanho)
+
+    def descartar(self):
+        self._arquivo.close()
+        self._temporario.unlink(missing_ok=True)
+
+
+# ============================================================
+# Recebimento assíncrono
+# ============================================================
+async def gravar_fluxo(
+        blocos: AsyncIterator[bytes],
+        diretorio: Path = DIRETORIO_ENVIOS,
+        limite: int = TAMANHO_MAXIMO_ANEXO
+) -> AnexoSalvo:
+    """
+    Consome um fluxo assíncrono de bytes (ex.: `request.stream()`),
+    agrupando-o em blocos de TAMANHO_BLOCO gravados em uma thread, sem
+    manter o arquivo em memória nem bloquear o loop.
+    Lança AnexoMuitoGrande assim que o limite é ultrapassado.
+    """
+    gravador = await run_in_threadpool(GravadorAnexo, diretorio, limite)
+    try:
+        pendente = bytearray()
+        async for parte in blocos:
+            pendente += parte
+            if len(pendente) >= TAMANHO_BLOCO:
+                await run_in_threadpool(gravador.escrever, bytes(pendente))
+                pendente.clear()
+        if pendente:
+            await run_in_threadpool(gravador.escrever, bytes(pendente))
+        return await run_in_threadpool(gravador.concluir)
+    except BaseException:  # Erro, limite excedido ou cliente desconectado: remove o parcial
+        gravador.descartar()
+        raise
+
+
+async def receber_upload(
+        arquivo: UploadFile,
+        diretorio: Path = DIRETORIO_ENVIOS,
+        limite: int = TAMANHO_MAXIMO_ANEXO
+) -> AnexoSalvo:
+    """Grava um arquivo multipart em blocos em um arquivo temporário."""
+    async def blocos():
+        while bloco := await arquivo.read(TAMANHO_BLOCO):
+            yield bloco
+
+    return await gravar_fluxo(blocos(), diretorio, limite)
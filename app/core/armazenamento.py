@@ -0,0 +1,349 @@
+# D:\ProjectSGHSS\app\core\armazenamento.py
+# Armazenamento de anexos endereçado por conteúdo (SHA-256), com deduplicação e coleta de lixo
+
+import asyncio  # Tarefa periódica no loop da aplicação
+import mimetypes  # Tipo de conteúdo de anexos antigos
+import os  # Variáveis de ambiente e operações de arquivo
+import re  # Validação das chaves
+import shutil  # Movimentação entre sistemas de arquivos
+from abc import ABC, abstractmethod  # Interface dos backends
+from datetime import datetime, timedelta  # Carência da coleta
+from functools import lru_cache  # Backend único por processo
+from pathlib import Path  # Manipulação de caminhos
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple  # Tipagens
+
+from sqlalchemy import case, delete, update  # Contagem de referências em SQL
+from sqlalchemy.dialects import postgresql, sqlite  # INSERT ... ON CONFLICT
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+from app.core.anexos import DIRETORIO_ENVIOS, TAMANHO_BLOCO, AnexoSalvo, GravadorAnexo, nome_arquivo_seguro  # Recebimento em blocos
+from app.db import SessionLocal  # Sessão própria para a tarefa agendada
+
+# -------------------------------
+# Configurações
+# -------------------------------
+ARMAZENAMENTO_ANEXOS = os.getenv("ARMAZENAMENTO_ANEXOS", "local")  # "local" ou "s3"
+DIRETORIO_BLOBS = Path(os.getenv("DIRETORIO_BLOBS", "uploads/blobs"))  # Raiz do backend local
+CARENCIA_COLETA_HORAS = int(os.getenv("CARENCIA_COLETA_HORAS", 24))  # Tempo sem referências antes da remoção
+INTERVALO_COLETA_MINUTOS = int(os.getenv("INTERVALO_COLETA_MINUTOS", 60))  # Periodicidade da coleta
+LOTE_COLETA = 500  # Blobs removidos por execução
+
+PADRAO_CHAVE = re.compile(r"[0-9a-f]{64}")  # SHA-256 em hexadecimal
+
+
+# ============================================================
+# Backends
+# ============================================================
+class BackendArmazenamento(ABC):
+    """
+    Onde os conteúdos ficam guardados, cada um sob a chave = SHA-256.
+    Como a chave é derivada do conteúdo, gravar a mesma chave de novo é
+    inofensivo; o controle de referências fica no banco (tabela `blobs`).
+    """
+
+    @abstractmethod
+    def existe(self, chave: str) -> bool:
+        """Indica se o conteúdo está armazenado."""
+
+    @abstractmethod
+    def gravar(self, chave: str, origem: Path):
+        """Guarda o arquivo local `origem` sob `chave`, consumindo-o."""
+
+    @abstractmethod
+    def abrir(self, chave: str) -> BinaryIO:
+        """Abre o conteúdo para leitura."""
+
+    @abstractmethod
+    def remover(self, chave: str):
+        """Remove o conteúdo e seus derivados (sem erro se já não existirem)."""
+
+    @abstractmethod
+    def listar(self) -> Iterator[Tuple[str, int, datetime]]:
+        """Percorre (chave, tamanho, modificado_em) de todos os conteúdos armazenados."""
+
+    def caminho_local(self, chave: str) -> Optional[Path]:
+        """Caminho no disco local, se o backend o tiver (permite envio sem cópia)."""
+        return None
+
+
+class BackendLocal(BackendArmazenamento):
+    """
+    Sistema de arquivos local, com diretórios fragmentados pelo prefixo do
+    hash (`ab/cd/abcd...`) para não acumular milhares de arquivos em um só.
+    """
+
+    def __init__(self, raiz: Path = DIRETORIO_BLOBS):
+        self.raiz = raiz
+
+    def _caminho(self, chave: str) -> Path:
+        return self.raiz / chave[:2] / chave[2:4] / chave
+
+    def existe(self, chave: str) -> bool:
+        return self._caminho(chave).is_file()
+
+    def gravar(self, chave: str, origem: Path):
+        destino = self._caminho(chave)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(origem), str(destino))  # Renomeação atômica no mesmo sistema de arquivos
+
+    def abrir(self, chave: str) -> BinaryIO:
+        return open(self._caminho(chave), "rb")
+
+    def remover(self, chave: str):
+        caminho = self._caminho(chave)
+        for derivado in caminho.parent.glob(f"{chave}.*"):
+            derivado.unlink(missing_ok=True)
+        caminho.unlink(missing_ok=True)
+
+    def listar(self) -> Iterator[Tuple[str, int, datetime]]:
+        for caminho in self.raiz.glob("*/*/*"):
+            if PADRAO_CHAVE.fullmatch(caminho.name):
+                info = caminho.stat()
+                yield caminho.name, info.st_size, datetime.fromtimestamp(info.st_mtime)
+
+    def caminho_local(self, chave: str) -> Optional[Path]:
+        return self._caminho(chave)
+
+
+class BackendS3(BackendArmazenamento):
+    """
+    Bucket compatível com S3 (AWS, MinIO...), via `boto3` (dependência
+    opcional, importada apenas quando este backend é escolhido).
+    """
+
+    def __init__(self, bucket: str, prefixo: str = "", endpoint_url: Optional[str] = None):
+        try:
+            import boto3  # Dependência opcional
+        except ImportError:
+            raise RuntimeError("ARMAZENAMENTO_ANEXOS=s3 requer o pacote boto3")
+        self.cliente = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefixo = prefixo
+
+    def _objeto(self, chave: str) -> str:
+        return f"{self.prefixo}{chave[:2]}/{chave}"
+
+    def existe(self, chave: str) -> bool:
+        try:
+            self.cliente.head_object(Bucket=self.bucket, Key=self._objeto(chave))
+            return True
+        except self.cliente.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def gravar(self, chave: str, origem: Path):
+        self.cliente.upload_file(str(origem), self.bucket, self._objeto(chave))
+        origem.unlink(missing_ok=True)
+
+    def abrir(self, chave: str) -> BinaryIO:
+        return self.cliente.get_object(Bucket=self.bucket, Key=self._objeto(chave))["Body"]
+
+    def remover(self, chave: str):
+        paginador = self.cliente.get_paginator("list_objects_v2")
+        for pagina in paginador.paginate(Bucket=self.bucket, Prefix=self._objeto(chave)):  # Conteúdo e derivados
+            for objeto in pagina.get("Contents", []):
+                self.cliente.delete_object(Bucket=self.bucket, Key=objeto["Key"])
+
+    def listar(self) -> Iterator[Tuple[str, int, datetime]]:
+        paginador = self.cliente.get_paginator("list_objects_v2")
+        for pagina in paginador.paginate(Bucket=self.bucket, Prefix=self.prefixo):
+            for objeto in pagina.get("Contents", []):
+                chave = objeto["Key"].rsplit("/", 1)[-1]
+                if PADRAO_CHAVE.fullmatch(chave):
+                    modificado_em = objeto["LastModified"].astimezone().replace(tzinfo=None)  # Horário local
+                    yield chave, objeto["Size"], modificado_em
+
+
+def chave_derivado(chave: str, variante: str) -> str:
+    """Chave de um arquivo derivado do conteúdo (miniatura, prévia), guardado ao lado dele."""
+    return f"{chave}.{variante}.jpg"
+
+
+@lru_cache(maxsize=None)
+def obter_backend() -> BackendArmazenamento:
+    """Backend configurado em ARMAZENAMENTO_ANEXOS (instância única do processo)."""
+    if ARMAZENAMENTO_ANEXOS == "s3":
+        return BackendS3(
+            bucket=os.environ["S3_BUCKET"],
+            prefixo=os.getenv("S3_PREFIXO", "anexos/"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL")
+        )
+    if ARMAZENAMENTO_ANEXOS != "local":
+        raise RuntimeError(f"Backend de armazenamento desconhecido: {ARMAZENAMENTO_ANEXOS}")
+    return BackendLocal()
+
+
+# ============================================================
+# Referências
+# ============================================================
+def _inserir(db: Session):
+    """INSERT com suporte a ON CONFLICT no dialeto do banco."""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+def armazenar(db: Session, anexo: AnexoSalvo, tipo_conteudo: Optional[str] = None) -> str:
+    """
+    Guarda o conteúdo recebido no backend, se ainda não estiver lá (conteúdo
+    repetido não é gravado de novo), e só então registra a nova referência.
+    Consome o arquivo temporário. Não faz commit. Retorna o SHA-256.
+
+    A gravação (ou o upload) acontece fora de transação; o incremento vem
+    depois e mantém a linha do blob bloqueada só até o commit do chamador.
+    Se a coleta de lixo removeu o conteúdo entre a verificação e o
+    incremento, o temporário ainda guardado é gravado de novo.
+    """
+    B = m.Blob
+    backend = obter_backend()
+    try:
+        if not backend.existe(anexo.sha256):
+            backend.gravar(anexo.sha256, anexo.caminho)  # Consome o temporário
+
+        comando = _inserir(db)(B).values(
+            sha256=anexo.sha256,
+            tamanho=anexo.tamanho,
+            tipo_conteudo=tipo_conteudo,
+            referencias=1,
+            criado_em=datetime.now()
+        )
+        db.execute(comando.on_conflict_do_update(
+            index_elements=[B.sha256],
+            set_={"referencias": B.referencias + 1, "sem_referencia_desde": None}
+        ))
+
+        if anexo.caminho.exists():  # Deduplicado: confirma que a coleta não levou o conteúdo
+            if backend.existe(anexo.sha256):
+                anexo.caminho.unlink(missing_ok=True)
+            else:
+                backend.gravar(anexo.sha256, anexo.caminho)
+    except BaseException:
+        anexo.caminho.unlink(missing_ok=True)
+        raise
+    return anexo.sha256
+
+
+def liberar(db: Session, sha256: Optional[str]):
+    """Remove uma referência ao conteúdo (o arquivo fica até a coleta de lixo). Não faz commit."""
+    if not sha256:
+        return
+    B = m.Blob
+    db.execute(
+        update(B)
+        .where(B.sha256 == sha256, B.referencias > 0)
+        .values(
+            referencias=B.referencias - 1,
+            sem_referencia_desde=case((B.referencias == 1, datetime.now()), else_=None)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ============================================================
+# Coleta de lixo
+# ============================================================
+def coletar_lixo(
+        db: Session,
+        carencia: timedelta = timedelta(hours=CARENCIA_COLETA_HORAS),
+        lote: int = LOTE_COLETA
+) -> Dict[str, int]:
+    """
+    - Arquivos no backend sem linha em `blobs` (envio interrompido antes do
+      commit) e mais antigos que a carência são registrados com zero
+      referências, entrando no ciclo normal de remoção
+    - Blobs sem referências há mais que a carência são removidos: a linha é
+      apagada condicionalmente (`referencias = 0`) e o arquivo removido
+      antes do commit, com a linha ainda bloqueada
+
+    - Arquivos `.envio-*.parcial` em DIRETORIO_ENVIOS mais antigos que a
+      carência (recebimentos interrompidos sem limpeza) são apagados
+
+    Retorna as quantidades de arquivos registrados, de blobs removidos e de
+    envios parciais apagados.
+    """
+    B = m.Blob
+    backend = obter_backend()
+    limite = datetime.now() - carencia
+
+    parciais = 0
+    for caminho in DIRETORIO_ENVIOS.glob(".envio-*.parcial"):
+        try:
+            if datetime.fromtimestamp(caminho.stat().st_mtime) < limite:
+                caminho.unlink()
+                parciais += 1
+        except FileNotFoundError:  # Concluído ou descartado durante a varredura
+            continue
+
+    registrados = 0
+    for chave, tamanho, modificado_em in backend.listar():
+        if modificado_em < limite and db.get(B, chave) is None:
+            db.execute(_inserir(db)(B).values(
+                sha256=chave, tamanho=tamanho, referencias=0,
+                criado_em=modificado_em, sem_referencia_desde=datetime.now()
+            ).on_conflict_do_nothing(index_elements=[B.sha256]))
+            db.commit()
+            registrados += 1
+
+    removidos = 0
+    candidatos = db.query(B.sha256).filter(B.referencias == 0, B.sem_referencia_desde < limite).limit(lote).all()
+    for (sha256,) in candidatos:
+        apagado = db.execute(
+            delete(B).where(B.sha256 == sha256, B.referencias == 0).execution_options(synchronize_session=False)
+        ).rowcount
+        if apagado:
+            backend.remover(sha256)
+            removidos += 1
+        db.commit()
+
+    return {"registrados": registrados, "removidos": removidos, "parciais": parciais}
+
+
+def _coletar_em_nova_sessao():
+    with SessionLocal() as db:
+        return coletar_lixo(db)
+
+
+async def agendar_coleta(intervalo_minutos: int = INTERVALO_COLETA_MINUTOS):
+    """Executa a coleta de lixo periodicamente durante a vida da aplicação, em uma thread."""
+    while True:
+        await asyncio.sleep(intervalo_minutos * 60)
+        try:
+            resultado = await asyncio.to_thread(_coletar_em_nova_sessao)
+            if resultado["removidos"]:
+                print(f"🧹 Anexos sem referência removidos: {resultado['removidos']}")
+            if resultado["parciais"]:
+                print(f"🧹 Envios interrompidos removidos: {resultado['parciais']}")
+        except Exception as e:  # Falha pontual não interrompe o agendamento
+            print(f"❌ Erro na coleta de anexos: {e}")
+
+
+# ============================================================
+# Anexos anteriores ao armazenamento por conteúdo
+# ============================================================
+def importar_anexos_legados(db: Session) -> int:
+    """
+    Copia para o armazenamento os anexos gravados por caminho em
+    `prontuarios.anexo` (versões anteriores) e passa a referenciá-los pelo
+    hash. Os arquivos originais são mantidos. Retorna a quantidade importada.
+    """
+    P = m.Prontuario
+    importados = 0
+    pendentes = db.query(P).filter(P.anexo.isnot(None), P.anexo_sha256.is_(None)).all()
+    for prontuario in pendentes:
+        origem = Path(prontuario.anexo.replace("\\", "/"))  # Caminhos gravados no Windows
+        if not origem.is_file():
+            continue  # Arquivo já não existe: mantém o registro como está
+        gravador = GravadorAnexo(limite=float("inf"))
+        try:
+            with open(origem, "rb") as arquivo:
+                while bloco := arquivo.read(TAMANHO_BLOCO):
+                    gravador.escrever(bloco)
+            anexo = gravador.concluir()
+        except BaseException:
+            gravador.descartar()
+            raise
+        prontuario.anexo_sha256 = armazenar(db, anexo, mimetypes.guess_type(origem.name)[0])
+        prontuario.anexo = nome_arquivo_seguro(origem.name)
+        db.commit()
+        importados += 1
+    return importados
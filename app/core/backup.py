@@ -0,0 +1,500 @@
+# D:\ProjectSGHSS\app\core\backup.py
+# Backup online do SQLite: cópia consistente em passos, backups incrementais por página e cadeia de restauração
+
+import asyncio  # Execução do backup fora do loop
+import contextlib  # Saída sem compressão
+import gzip  # Compressão dos arquivos de backup
+import io  # Leitura bufferizada do zstd
+import hashlib  # Hash das páginas e checksum dos arquivos
+import os  # Variáveis de ambiente e operações de arquivo
+import shutil  # Cópia em blocos
+import sqlite3  # API de backup do SQLite
+import struct  # Formato binário dos incrementais
+import time  # Pausa entre os passos da cópia
+from concurrent.futures import ThreadPoolExecutor  # Worker único de backup
+from datetime import datetime  # Momento do instantâneo
+from pathlib import Path  # Manipulação de caminhos
+from typing import Iterator, List, Optional, Tuple  # Tipagens
+
+from sqlalchemy import func  # Agregações no catálogo
+
+from app.db import engine  # Engine principal (caminho do banco)
+from app.db.catalogo import DIRETORIO_BACKUPS, SessaoCatalogo  # Catálogo de backups
+from app.models import Backup, TipoBackup  # Modelo do catálogo
+
+# -------------------------------
+# Configurações
+# -------------------------------
+CAMINHO_BANCO = Path(engine.url.database)  # Arquivo do banco em uso
+PAGINAS_POR_PASSO = int(os.getenv("BACKUP_PAGINAS_POR_PASSO", 1024))  # Páginas copiadas por passo (4 MiB)
+PAUSA_ENTRE_PASSOS = float(os.getenv("BACKUP_PAUSA_MS", 10)) / 1000  # Folga de E/S para as requisições
+CODEC_BACKUP = os.getenv("BACKUP_CODEC", "gzip")  # gzip, zstd (requer zstandard) ou nenhum
+NIVEL_COMPRESSAO = int(os.getenv("BACKUP_NIVEL_COMPRESSAO", 6))  # Nível do codec (gzip 1-9, zstd 1-22)
+INTERVALO_BACKUP_HORAS = float(os.getenv("BACKUP_INTERVALO_HORAS", 24))  # Backups agendados (0 desativa)
+COMPLETO_A_CADA = int(os.getenv("BACKUP_COMPLETO_A_CADA", 7))  # Agendados: um completo a cada N (demais incrementais)
+RETER_DIARIOS = int(os.getenv("BACKUP_RETER_DIARIOS", 7))  # Retenção GFS: dias com backup mantidos
+RETER_SEMANAIS = int(os.getenv("BACKUP_RETER_SEMANAIS", 4))  # Semanas
+RETER_MENSAIS = int(os.getenv("BACKUP_RETER_MENSAIS", 12))  # Meses
+TAMANHO_BLOCO = 1024 * 1024  # Bytes por leitura na compressão
+
+# Extensão do arquivo por codec
+EXTENSOES_CODEC = {"gzip": ".gz", "zstd": ".zst", "nenhum": ""}
+
+# Formato do incremental (antes da compressão): cabeçalho + (número da página, conteúdo) por página alterada
+MAGICA_INCREMENTAL = b"SGHSSINC"
+CABECALHO_INCREMENTAL = struct.Struct(">8sHII")  # Mágica, versão, tamanho da página, total de páginas
+NUMERO_PAGINA = struct.Struct(">I")  # Página (base 1)
+VERSAO_INCREMENTAL = 1
+TAMANHO_DIGESTO = 16  # Bytes do hash de cada página (BLAKE2b)
+SUFIXO_PAGINAS = ".paginas"  # Hashes das páginas do banco no instantâneo, ao lado de cada backup
+
+# Um backup por vez: pedidos simultâneos aguardam na fila do worker
+executor_backup = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+
+
+class BackupInvalido(Exception):
+    """A cópia gerada ou reconstruída não passou na verificação de integridade."""
+
+
+class BackupNaoEncontrado(Exception):
+    """Backup inexistente no catálogo, ou com arquivos ausentes."""
+
+
+class OrigemForaDaRetencao(Exception):
+    """A cadeia do backup de origem não recebe incrementais (completo retido só como semanal/mensal)."""
+
+
+# ============================================================
+# Cópia online e verificação
+# ============================================================
+def copiar_banco(destino: Path, paginas: int = PAGINAS_POR_PASSO, pausa: float = PAUSA_ENTRE_PASSOS):
+    """
+    Copia o banco com `sqlite3.Connection.backup`, `paginas` por passo.
+
+    A origem mantém uma transação de leitura aberta durante a cópia: no
+    modo WAL ela fixa um instantâneo (incluindo o que ainda está no
+    `-wal`), então a cópia é consistente e não reinicia quando há escritas,
+    que seguem normalmente enquanto o backup avança.
+    """
+    origem = sqlite3.connect(CAMINHO_BANCO, timeout=30, isolation_level=None)
+    copia = sqlite3.connect(destino)
+    try:
+        origem.execute("BEGIN")
+        origem.execute("SELECT count(*) FROM sqlite_master").fetchone()  # Inicia o instantâneo de leitura
+        origem.backup(copia, pages=paginas, progress=lambda *_: time.sleep(pausa))
+        origem.execute("COMMIT")
+        copia.execute("PRAGMA journal_mode=DELETE")  # Arquivo único, sem -wal ao lado
+    finally:
+        copia.close()
+        origem.close()
+
+
+def verificar_integridade(caminho: Path):
+    """Executa `PRAGMA integrity_check`; lança BackupInvalido se houver problemas."""
+    conexao = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+    try:
+        problemas = [linha[0] for linha in conexao.execute("PRAGMA integrity_check")]
+    finally:
+        conexao.close()
+    if problemas != ["ok"]:
+        raise BackupInvalido("; ".join(problemas[:5]))
+
+
+# ============================================================
+# Páginas do banco
+# ============================================================
+def ler_paginas(caminho: Path) -> Tuple[int, Iterator[bytes]]:
+    """Retorna o tamanho de página (do cabeçalho do arquivo) e um iterador sobre as páginas."""
+    with open(caminho, "rb") as arquivo:
+        cabecalho = arquivo.read(100)
+    tamanho = int.from_bytes(cabecalho[16:18], "big")
+    tamanho = 65536 if tamanho == 1 else tamanho  # 1 representa 64 KiB no formato do SQLite
+
+    def paginas():
+        with open(caminho, "rb") as arquivo:
+            while pagina := arquivo.read(tamanho):
+                yield pagina
+
+    return tamanho, paginas()
+
+
+def digesto(pagina: bytes) -> bytes:
+    return hashlib.blake2b(pagina, digest_size=TAMANHO_DIGESTO).digest()
+
+
+class _ArquivoComHash:
+    """Arquivo de saída que calcula o SHA-256 do que é gravado (checksum do backup)."""
+
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+        self.hash = hashlib.sha256()
+
+    def write(self, dados) -> int:
+        self.hash.update(dados)
+        return self._arquivo.write(dados)
+
+    def flush(self):
+        self._arquivo.flush()
+
+
+def _compressor(saida, codec: str):
+    """Arquivo de escrita que comprime com `codec` sobre `saida` (que continua aberta ao fechar)."""
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=saida, mode="wb", compresslevel=NIVEL_COMPRESSAO)
+    if codec == "zstd":
+        try:
+            import zstandard  # Dependência opcional, exigida apenas com BACKUP_CODEC=zstd
+        except ImportError:
+            raise RuntimeError("BACKUP_CODEC=zstd requer o pacote zstandard")
+        return zstandard.ZstdCompressor(level=NIVEL_COMPRESSAO).stream_writer(saida, closefd=False)
+    return contextlib.nullcontext(saida)
+
+
+def abrir_backup(backup: Backup):
+    """Abre o arquivo do backup para leitura já descomprimida, conforme o codec registrado."""
+    caminho = caminho_backup(backup)
+    if backup.codec == "gzip":
+        return gzip.open(caminho, "rb")
+    if backup.codec == "zstd":
+        import zstandard  # Dependência opcional
+        leitor = zstandard.ZstdDecompressor().stream_reader(open(caminho, "rb"), closefd=True)
+        return io.BufferedReader(leitor, TAMANHO_BLOCO)  # read(n) completo, como nos demais codecs
+    return open(caminho, "rb")
+
+
+def _gravar_completo(copia: Path, destino: Path, codec: str) -> Tuple[int, int, bytearray, str]:
+    """Comprime o banco inteiro; retorna (tamanho da página, páginas, hashes, sha256 do arquivo)."""
+    tamanho, paginas = ler_paginas(copia)
+    hashes = bytearray()
+    with open(destino, "wb") as bruto:
+        saida = _ArquivoComHash(bruto)
+        with _compressor(saida, codec) as compactado:
+            for pagina in paginas:
+                hashes += digesto(pagina)
+                compactado.write(pagina)
+    return tamanho, len(hashes) // TAMANHO_DIGESTO, hashes, saida.hash.hexdigest()
+
+
+def _gravar_incremental(
+        copia: Path, destino: Path, anteriores: bytes, tamanho_anterior: int, codec: str
+) -> Tuple[int, int, int, bytearray, str]:
+    """
+    Grava só as páginas cujo hash difere do backup de origem; retorna
+    (tamanho da página, páginas, páginas gravadas, hashes, sha256 do arquivo).
+    Se o tamanho de página mudou (VACUUM), todas as páginas são gravadas.
+    """
+    tamanho, paginas = ler_paginas(copia)
+    total = os.path.getsize(copia) // tamanho
+    comparar = tamanho == tamanho_anterior
+    hashes = bytearray()
+    gravadas = 0
+    with open(destino, "wb") as bruto:
+        saida = _ArquivoComHash(bruto)
+        with _compressor(saida, codec) as compactado:
+            compactado.write(CABECALHO_INCREMENTAL.pack(MAGICA_INCREMENTAL, VERSAO_INCREMENTAL, tamanho, total))
+            for numero, pagina in enumerate(paginas, start=1):
+                atual = digesto(pagina)
+                hashes += atual
+                inicio = (numero - 1) * TAMANHO_DIGESTO
+                if comparar and anteriores[inicio:inicio + TAMANHO_DIGESTO] == atual:
+                    continue
+                compactado.write(NUMERO_PAGINA.pack(numero))
+                compactado.write(pagina)
+                gravadas += 1
+    return tamanho, total, gravadas, hashes, saida.hash.hexdigest()
+
+
+# ============================================================
+# Geração
+# ============================================================
+def caminho_backup(backup: Backup) -> Path:
+    return DIRETORIO_BACKUPS / backup.arquivo
+
+
+def criar_backup(desde: Optional[int] = None, codec: str = CODEC_BACKUP) -> Backup:
+    """
+    Gera um backup completo (`.db.gz`, o banco comprimido) ou, com
+    `desde`, um incremental (`.inc.gz`) com as páginas alteradas desde
+    aquele backup, e o registra no catálogo com tamanho, duração e
+    checksum. A extensão segue o codec (`.gz`, `.zst` ou nenhuma).
+
+    O instantâneo é sempre uma cópia online verificada; no incremental,
+    o hash de cada página é comparado ao do backup de origem, de modo que
+    o arquivo gravado (e transferido) contém apenas o que mudou. A origem
+    precisa estar numa cadeia cujo completo é retido como diário: nas
+    demais, a retenção apagaria o incremental logo após criá-lo.
+    E/S bloqueante: use `gerar_backup_async` nas rotas.
+    """
+    if codec not in EXTENSOES_CODEC:
+        raise ValueError(f"Codec de backup inválido: {codec}")
+    inicio = time.monotonic()
+    with SessaoCatalogo() as catalogo:
+        origem = None
+        if desde is not None:
+            origem = catalogo.get(Backup, desde)
+            if not origem or not _paginas_do_backup(origem).is_file():
+                raise BackupNaoEncontrado(f"Backup {desde} não encontrado")
+            if (origem.base_id or origem.id) not in _retidos(catalogo)[1]:
+                raise OrigemForaDaRetencao(
+                    f"Backup {desde} pertence a uma cadeia retida só como semanal/mensal; "
+                    "gere um incremental a partir de um backup recente"
+                )
+
+        momento = datetime.now()
+        nome = f"sghss_backup_{momento.strftime('%Y%m%d_%H%M%S_%f')}"
+        copia = DIRETORIO_BACKUPS / f".{nome}.db.parcial"
+        destino = DIRETORIO_BACKUPS / f"{nome}{'.inc' if origem else '.db'}{EXTENSOES_CODEC[codec]}"
+        paginas = DIRETORIO_BACKUPS / f"{destino.name}{SUFIXO_PAGINAS}"
+        try:
+            copiar_banco(copia)
+            verificar_integridade(copia)
+            if origem:
+                tamanho, total, gravadas, hashes, sha256 = _gravar_incremental(
+                    copia, destino, _paginas_do_backup(origem).read_bytes(), origem.tamanho_pagina, codec
+                )
+            else:
+                tamanho, total, hashes, sha256 = _gravar_completo(copia, destino, codec)
+                gravadas = total
+            paginas.write_bytes(hashes)
+
+            backup = Backup(
+                tipo=TipoBackup.INCREMENTAL if origem else TipoBackup.COMPLETO,
+                origem_id=origem.id if origem else None,
+                base_id=(origem.base_id or origem.id) if origem else None,
+                arquivo=destino.name,
+                codec=codec,
+                criado_em=momento,
+                tamanho_pagina=tamanho,
+                total_paginas=total,
+                paginas_gravadas=gravadas,
+                tamanho=destino.stat().st_size,
+                sha256=sha256,
+                duracao=round(time.monotonic() - inicio, 3)
+            )
+            catalogo.add(backup)
+            catalogo.commit()
+            catalogo.refresh(backup)
+            catalogo.expunge(backup)
+        except BaseException:
+            destino.unlink(missing_ok=True)
+            paginas.unlink(missing_ok=True)
+            raise
+        finally:
+            copia.unlink(missing_ok=True)
+
+    aplicar_retencao()
+    return backup
+
+
+def _paginas_do_backup(backup: Backup) -> Path:
+    return DIRETORIO_BACKUPS / f"{backup.arquivo}{SUFIXO_PAGINAS}"
+
+
+# ============================================================
+# Restauração para um momento
+# ============================================================
+def backup_no_momento(momento: datetime) -> Backup:
+    """Backup mais recente com instantâneo até `momento`."""
+    with SessaoCatalogo() as catalogo:
+        backup = (
+            catalogo.query(Backup)
+            .filter(Backup.criado_em <= momento)
+            .order_by(Backup.criado_em.desc(), Backup.id.desc())
+            .first()
+        )
+        if not backup:
+            raise BackupNaoEncontrado(f"Nenhum backup até {momento.isoformat()}")
+        catalogo.expunge(backup)
+        return backup
+
+
+def cadeia(backup_id: int) -> List[Backup]:
+    """Backups a aplicar para restaurar `backup_id`: o completo e os incrementais até ele, em ordem."""
+    with SessaoCatalogo() as catalogo:
+        itens = []
+        atual = catalogo.get(Backup, backup_id)
+        if not atual:
+            raise BackupNaoEncontrado(f"Backup {backup_id} não encontrado")
+        while atual:
+            itens.append(atual)
+            atual = catalogo.get(Backup, atual.origem_id) if atual.origem_id else None
+        catalogo.expunge_all()
+    return itens[::-1]
+
+
+def _sha256_arquivo(caminho: Path) -> str:
+    hash_arquivo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO):
+            hash_arquivo.update(bloco)
+    return hash_arquivo.hexdigest()
+
+
+def _aplicar_incremental(backup: Backup, banco):
+    caminho = caminho_backup(backup)
+    with abrir_backup(backup) as entrada:
+        magica, versao, tamanho, total = CABECALHO_INCREMENTAL.unpack(entrada.read(CABECALHO_INCREMENTAL.size))
+        if magica != MAGICA_INCREMENTAL or versao != VERSAO_INCREMENTAL:
+            raise BackupInvalido(f"{caminho.name} não é um backup incremental válido")
+        while numero := entrada.read(NUMERO_PAGINA.size):
+            pagina = entrada.read(tamanho)
+            if len(numero) != NUMERO_PAGINA.size or len(pagina) != tamanho:
+                raise BackupInvalido(f"{caminho.name} está truncado")
+            banco.seek((NUMERO_PAGINA.unpack(numero)[0] - 1) * tamanho)
+            banco.write(pagina)
+    banco.truncate(total * tamanho)  # Páginas liberadas no fim do arquivo
+
+
+def reconstruir(backup_id: int, destino: Path) -> Backup:
+    """
+    Reconstrói em `destino` o banco do backup `backup_id`: descomprime o
+    completo da cadeia e aplica os incrementais em ordem, conferindo o
+    checksum de cada arquivo e a integridade do resultado.
+    """
+    itens = cadeia(backup_id)
+    for item in itens:
+        caminho = caminho_backup(item)
+        if not caminho.is_file():
+            raise BackupNaoEncontrado(f"Arquivo do backup {item.id} ausente: {item.arquivo}")
+        if _sha256_arquivo(caminho) != item.sha256:
+            raise BackupInvalido(f"Checksum divergente no backup {item.id}: {item.arquivo}")
+
+    with abrir_backup(itens[0]) as entrada, open(destino, "wb") as banco:
+        shutil.copyfileobj(entrada, banco, TAMANHO_BLOCO)
+    with open(destino, "r+b") as banco:
+        for item in itens[1:]:
+            _aplicar_incremental(item, banco)
+    verificar_integridade(destino)
+    return itens[-1]
+
+
+# ============================================================
+# Retenção
+# ============================================================
+def completos_retidos(
+        datas: List[Tuple[int, datetime]],
+        diarios: int = RETER_DIARIOS,
+        semanais: int = RETER_SEMANAIS,
+        mensais: int = RETER_MENSAIS
+) -> Tuple[set, set]:
+    """
+    Retenção GFS (avô-pai-filho) sobre os backups completos `(id, criado_em)`:
+    o mais recente de cada um dos últimos `diarios` dias, `semanais` semanas
+    ISO e `mensais` meses que têm backup. Retorna (todos os retidos, retidos
+    como diários); só os diários mantêm os incrementais da cadeia.
+    """
+    periodos = (
+        (diarios, lambda d: d.date()),
+        (semanais, lambda d: d.isocalendar()[:2]),
+        (mensais, lambda d: (d.year, d.month)),
+    )
+    retidos, diarios_retidos = set(), set()
+    for indice, (limite, periodo) in enumerate(periodos):
+        vistos = set()
+        for backup_id, criado_em in sorted(datas, key=lambda item: item[1], reverse=True):
+            chave = periodo(criado_em)
+            if chave in vistos:
+                continue
+            if len(vistos) >= limite:
+                break
+            vistos.add(chave)
+            retidos.add(backup_id)
+            if indice == 0:
+                diarios_retidos.add(backup_id)
+    return retidos, diarios_retidos
+
+
+def _retidos(catalogo) -> Tuple[set, set]:
+    """`completos_retidos` sobre os backups completos do catálogo."""
+    completos = catalogo.query(Backup.id, Backup.criado_em).filter(Backup.tipo == TipoBackup.COMPLETO).all()
+    return completos_retidos([(b.id, b.criado_em) for b in completos])
+
+
+def aplicar_retencao() -> int:
+    """
+    Aplica a retenção GFS: completos fora de todos os períodos são
+    removidos com seus incrementais; completos retidos apenas como
+    semanal/mensal perdem os incrementais (ficam como ponto de restauração
+    daquele período). Um incremental nunca fica sem o completo da cadeia.
+    Retorna a quantidade de backups removidos.
+    """
+    with SessaoCatalogo() as catalogo:
+        retidos, diarios = _retidos(catalogo)
+        removidos = (
+            catalogo.query(Backup)
+            .filter(
+                ((Backup.tipo == TipoBackup.COMPLETO) & Backup.id.notin_(retidos))
+                | ((Backup.tipo == TipoBackup.INCREMENTAL) & Backup.base_id.notin_(diarios))
+            )
+            .order_by(func.coalesce(Backup.base_id, Backup.id), Backup.id.desc())  # Incrementais antes da base
+            .all()
+        )
+        for backup in removidos:
+            caminho_backup(backup).unlink(missing_ok=True)
+            _paginas_do_backup(backup).unlink(missing_ok=True)
+            catalogo.delete(backup)
+            catalogo.flush()
+        catalogo.commit()
+        return len(removidos)
+
+
+# ============================================================
+# Execução assíncrona
+# ============================================================
+async def no_worker_backup(funcao, *args):
+    """Executa `funcao` no worker de backup, sem ocupar o loop nem o threadpool das rotas."""
+    return await asyncio.get_running_loop().run_in_executor(executor_backup, funcao, *args)
+
+
+async def gerar_backup_async(desde: Optional[int] = None) -> Backup:
+    """`criar_backup` no worker de backup."""
+    return await no_worker_backup(criar_backup, desde)
+
+
+# ============================================================
+# Agendamento
+# ============================================================
+def criar_backup_agendado() -> Backup:
+    """
+    Backup do agendamento: incremental sobre o último backup da cadeia
+    atual, ou completo quando não há cadeia ou ela já tem
+    `COMPLETO_A_CADA` backups.
+    """
+    with SessaoCatalogo() as catalogo:
+        ultimo = catalogo.query(Backup).order_by(Backup.criado_em.desc(), Backup.id.desc()).first()
+        desde = None
+        if ultimo and _paginas_do_backup(ultimo).is_file():
+            base_id = ultimo.base_id or ultimo.id
+            tamanho_cadeia = catalogo.query(func.count(Backup.id)).filter(
+                (Backup.id == base_id) | (Backup.base_id == base_id)
+            ).scalar()
+            if tamanho_cadeia < COMPLETO_A_CADA:
+                desde = ultimo.id
+    return criar_backup(desde)
+
+
+def _segundos_ate_proximo(intervalo: float) -> float:
+    with SessaoCatalogo() as catalogo:
+        ultimo = catalogo.query(func.max(Backup.criado_em)).scalar()
+    if ultimo is None:
+        return 60.0  # Sem backups: o primeiro logo após a inicialização
+    return max(0.0, (ultimo - datetime.now()).total_seconds() + intervalo)
+
+
+async def agendar_backups(intervalo_horas: float = INTERVALO_BACKUP_HORAS):
+    """
+    Gera backups periodicamente durante a vida da aplicação, no worker de
+    backup. O intervalo conta a partir do último backup do catálogo, então
+    reinícios não antecipam nem repetem backups.
+    """
+    if intervalo_horas <= 0:
+        return
+    intervalo = intervalo_horas * 3600
+    while True:
+        await asyncio.sleep(await asyncio.to_thread(_segundos_ate_proximo, intervalo))
+        try:
+            backup = await no_worker_backup(criar_backup_agendado)
+            print(f"💾 Backup {backup.tipo.value.lower()} agendado: {backup.arquivo} ({backup.tamanho} bytes)")
+        except Exception as e:  # Falha pontual não interrompe o agendamento
+            print(f"❌ Erro no backup agendado: {e}")
+            await asyncio.sleep(intervalo)  # Próxima tentativa no intervalo seguinte
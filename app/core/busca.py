@@ -0,0 +1,246 @@
+# D:\ProjectSGHSS\app\core\busca.py
+# Busca textual indexada (SQLite FTS5 / PostgreSQL tsvector)
+
+import re  # Extração de termos da consulta
+from dataclasses import dataclass  # Especificação dos índices
+from datetime import datetime  # Período dos filtros
+from typing import Dict, List, Optional, Sequence, Tuple  # Tipagens
+
+from sqlalchemy import DateTime, Select, bindparam, text  # SQL bruto (DDL e consultas de busca)
+from sqlalchemy.engine import Engine  # Engine para criação dos índices
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+MAX_TERMOS_BUSCA = 10  # Termos considerados por consulta
+MARCA_INICIO, MARCA_FIM = "«", "»"  # Destaque dos termos nos trechos (texto puro, sem HTML)
+PALAVRAS_TRECHO = 16  # Tamanho aproximado de cada trecho, em palavras
+
+
+@dataclass(frozen=True)
+class IndiceBusca:
+    """
+    Índice textual sobre colunas de uma tabela.
+
+    - SQLite: tabela virtual FTS5 `nome` com conteúdo externo (`tabela`),
+      mantida por triggers
+    - PostgreSQL: coluna gerada `busca` (tsvector) com índice GIN
+    `pesos` ponderam as colunas no ranking (bm25 / setweight).
+    """
+    nome: str
+    tabela: str
+    colunas: Tuple[str, ...]
+    pesos: Tuple[float, ...]
+
+
+INDICES_BUSCA: Dict[str, IndiceBusca] = {
+    "suprimentos": IndiceBusca("suprimentos_busca", "suprimentos", ("nome", "descricao"), (10.0, 1.0)),
+    "pacientes": IndiceBusca("pacientes_busca", "pacientes", ("nome", "email", "cpf"), (10.0, 2.0, 2.0)),
+    "prontuarios": IndiceBusca("prontuarios_busca", "prontuarios", ("descricao",), (1.0,)),
+}
+
+
+# ============================================================
+# Criação dos índices
+# ============================================================
+def criar_indices_busca(engine: Engine):
+    """Cria (se ausentes) os índices textuais de todas as tabelas pesquisáveis."""
+    with engine.begin() as conn:
+        for indice in INDICES_BUSCA.values():
+            if conn.dialect.name == "postgresql":
+                _criar_indice_postgres(conn, indice)
+            else:
+                _criar_indice_sqlite(conn, indice)
+
+
+def _criar_indice_sqlite(conn, indice: IndiceBusca):
+    """
+    FTS5 com tokenizador unicode61 sem acentos ("João" casa com "joao") e
+    índices de prefixo para buscas enquanto o usuário digita.
+    """
+    existe = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"), {"nome": indice.nome}
+    ).first()
+    colunas = ", ".join(indice.colunas)
+    novos = ", ".join(f"new.{c}" for c in indice.colunas)
+    antigos = ", ".join(f"old.{c}" for c in indice.colunas)
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {indice.nome} USING fts5("
+        f"{colunas}, content='{indice.tabela}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {indice.nome}_ai AFTER INSERT ON {indice.tabela} BEGIN "
+        f"INSERT INTO {indice.nome}(rowid, {colunas}) VALUES (new.id, {novos}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {indice.nome}_ad AFTER DELETE ON {indice.tabela} BEGIN "
+        f"INSERT INTO {indice.nome}({indice.nome}, rowid, {colunas}) VALUES ('delete', old.id, {antigos}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {indice.nome}_au AFTER UPDATE OF {colunas} ON {indice.tabela} BEGIN "
+        f"INSERT INTO {indice.nome}({indice.nome}, rowid, {colunas}) VALUES ('delete', old.id, {antigos}); "
+        f"INSERT INTO {indice.nome}(rowid, {colunas}) VALUES (new.id, {novos}); END"
+    ))
+
+    if not existe:  # Índice novo: ranking padrão e carga das linhas já existentes
+        pesos = ", ".join(str(p) for p in indice.pesos)
+        conn.execute(text(f"INSERT INTO {indice.nome}({indice.nome}, rank) VALUES ('rank', 'bm25({pesos})')"))
+        conn.execute(text(f"INSERT INTO {indice.nome}({indice.nome}) VALUES ('rebuild')"))
+        print(f"🔎 Índice de busca {indice.nome} criado")
+
+
+def _criar_indice_postgres(conn, indice: IndiceBusca):
+    """
+    Coluna tsvector gerada (mantida pelo próprio banco a cada INSERT/UPDATE)
+    com dicionário português e remoção de acentos via `unaccent`.
+    """
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    conn.execute(text(
+        "CREATE OR REPLACE FUNCTION sghss_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    ))
+    maior_peso = max(indice.pesos)
+    vetores = " || ".join(
+        f"setweight(to_tsvector('portuguese', sghss_unaccent(coalesce({coluna}, ''))), "
+        f"'{'A' if peso == maior_peso else 'B'}')"
+        for coluna, peso in zip(indice.colunas, indice.pesos)
+    )
+    conn.execute(text(
+        f"ALTER TABLE {indice.tabela} ADD COLUMN IF NOT EXISTS busca tsvector "
+        f"GENERATED ALWAYS AS ({vetores}) STORED"
+    ))
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{indice.tabela}_busca ON {indice.tabela} USING GIN (busca)"))
+
+
+# ============================================================
+# Consulta
+# ============================================================
+def termos_busca(texto: str) -> List[str]:
+    """
+    Extrai os termos (letras/dígitos) do texto digitado. Pontuação e
+    operadores são descartados, então a entrada nunca quebra a sintaxe
+    de MATCH/to_tsquery. Lança ValueError se não houver termos.
+    """
+    termos = re.findall(r"\w+", (texto or "").lower())[:MAX_TERMOS_BUSCA]
+    if not termos:
+        raise ValueError("Informe ao menos um termo de busca")
+    return termos
+
+
+def buscar_ids(
+        db: Session,
+        chave: str,
+        texto: str,
+        limite: int,
+        deslocamento: int = 0,
+        dentre: Optional[Select] = None
+) -> List[int]:
+    """
+    Retorna os IDs que contêm todos os termos (cada termo como prefixo),
+    do mais relevante para o menos relevante.
+
+    `dentre`: SELECT de uma coluna com os IDs permitidos (ex.: escopo do
+    usuário), aplicado na própria consulta para manter a paginação correta.
+    """
+    indice = INDICES_BUSCA[chave]
+    termos = termos_busca(texto)
+    parametros = {"limite": limite, "deslocamento": deslocamento}
+    restricao = ""
+    if dentre is not None:  # Só IDs inteiros do escopo: seguro como literais
+        restricao = f" IN ({dentre.compile(dialect=db.get_bind().dialect, compile_kwargs={'literal_binds': True})})"
+
+    if db.get_bind().dialect.name == "postgresql":
+        parametros["consulta"] = " & ".join(f"{t}:*" for t in termos)
+        sql = (
+            f"SELECT id FROM {indice.tabela}, "
+            f"to_tsquery('portuguese', sghss_unaccent(:consulta)) AS consulta "
+            f"WHERE busca @@ consulta{' AND id' + restricao if restricao else ''} "
+            f"ORDER BY ts_rank(busca, consulta) DESC, id "
+            f"LIMIT :limite OFFSET :deslocamento"
+        )
+    else:
+        parametros["consulta"] = " ".join(f'"{t}"*' for t in termos)
+        sql = (
+            f"SELECT rowid FROM {indice.nome} WHERE {indice.nome} MATCH :consulta"
+            f"{' AND rowid' + restricao if restricao else ''} "
+            f"ORDER BY rank LIMIT :limite OFFSET :deslocamento"
+        )
+
+    return [linha[0] for linha in db.execute(text(sql), parametros)]
+
+
+def buscar_trechos(
+        db: Session,
+        chave: str,
+        texto: str,
+        limite: int,
+        deslocamento: int = 0,
+        filtros: Optional[Dict[str, object]] = None,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        colunas: Sequence[str] = (),
+        coluna_data: str = "data_hora"
+) -> List[dict]:
+    """
+    Busca textual combinada com filtros de atributo, em ordem de relevância.
+
+    - `filtros`: igualdade por coluna ({"paciente_id": 3}); valores None são ignorados
+    - `inicio`/`fim`: intervalo fechado sobre `coluna_data`
+    - Retorna, por registro, `id`, as `colunas` pedidas e um `trecho` da
+      primeira coluna indexada com os termos destacados entre « », sem carregar o
+      texto completo
+    """
+    indice = INDICES_BUSCA[chave]
+    termos = termos_busca(texto)
+    parametros = {"limite": limite, "deslocamento": deslocamento}
+
+    condicoes = []
+    for coluna, valor in (filtros or {}).items():
+        if valor is not None:
+            condicoes.append(f"t.{coluna} = :f_{coluna}")
+            parametros[f"f_{coluna}"] = valor
+    if inicio is not None:
+        condicoes.append(f"t.{coluna_data} >= :inicio")
+        parametros["inicio"] = inicio
+    if fim is not None:
+        condicoes.append(f"t.{coluna_data} <= :fim")
+        parametros["fim"] = fim
+    filtro_sql = "".join(f" AND {c}" for c in condicoes)
+    selecao = "".join(f", t.{c} AS {c}" for c in colunas)
+
+    if db.get_bind().dialect.name == "postgresql":
+        parametros["consulta"] = " & ".join(f"{t}:*" for t in termos)
+        parametros["opcoes"] = (
+            f"StartSel={MARCA_INICIO}, StopSel={MARCA_FIM}, "
+            f"MaxWords={PALAVRAS_TRECHO}, MinWords={PALAVRAS_TRECHO // 2}, MaxFragments=2"
+        )
+        sql = (
+            f"SELECT t.id AS id{selecao}, "
+            f"ts_headline('portuguese', t.{indice.colunas[0]}, consulta, :opcoes) AS trecho "
+            f"FROM {indice.tabela} t, to_tsquery('portuguese', sghss_unaccent(:consulta)) AS consulta "
+            f"WHERE t.busca @@ consulta{filtro_sql} "
+            f"ORDER BY ts_rank(t.busca, consulta) DESC, t.id LIMIT :limite OFFSET :deslocamento"
+        )
+    else:
+        parametros["consulta"] = " ".join(f'"{t}"*' for t in termos)
+        sql = (
+            f"SELECT t.id AS id{selecao}, "
+            f"snippet({indice.nome}, 0, '{MARCA_INICIO}', '{MARCA_FIM}', '…', {PALAVRAS_TRECHO}) AS trecho "
+            f"FROM {indice.nome} JOIN {indice.tabela} t ON t.id = {indice.nome}.rowid "
+            f"WHERE {indice.nome} MATCH :consulta{filtro_sql} "
+            f"ORDER BY {indice.nome}.rank LIMIT :limite OFFSET :deslocamento"
+        )
+
+    consulta = text(sql).bindparams(  # Datas no mesmo formato gravado pelo ORM
+        *(bindparam(nome, type_=DateTime) for nome in ("inicio", "fim") if nome in parametros)
+    )
+    return [dict(linha) for linha in db.execute(consulta, parametros).mappings()]
+
+
+def carregar_em_ordem(db: Session, modelo, ids: List[int]) -> list:
+    """Carrega os registros pelos IDs preservando a ordem de relevância."""
+    if not ids:
+        return []
+    por_id = {registro.id: registro for registro in db.query(modelo).filter(modelo.id.in_(ids))}
+    return [por_id[i] for i in ids if i in por_id]
@@ -0,0 +1,180 @@
+# D:\ProjectSGHSS\app\core\censo.py
+# Histórico de eventos de leitos e censo de ocupação ao longo do tempo
+
+from datetime import datetime, timedelta  # Intervalos de tempo
+from typing import Dict, List, Optional  # Tipagens
+
+from sqlalchemy import func, or_  # Agregações e filtros compostos
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+from app.models import StatusLeito, TipoEventoLeito  # Enums de status e de evento
+
+# Tamanho de cada intervalo do censo
+GRANULARIDADES = {
+    "hora": timedelta(hours=1),
+    "dia": timedelta(days=1),
+}
+MAX_PONTOS_CENSO = 5000  # Limite de intervalos por consulta (~7 meses por hora)
+
+
+# ============================================================
+# Registro de eventos
+# ============================================================
+def classificar_evento(
+        status_anterior: Optional[StatusLeito],
+        status_novo: Optional[StatusLeito]
+) -> TipoEventoLeito:
+    """Deduz o tipo do evento a partir da transição de status do leito."""
+    if status_anterior is None:
+        return TipoEventoLeito.CADASTRO
+    if status_novo is None:
+        return TipoEventoLeito.EXCLUSAO
+    if status_anterior == status_novo:
+        return TipoEventoLeito.ALTERACAO
+    if status_novo == StatusLeito.OCUPADO:
+        return TipoEventoLeito.ADMISSAO
+    if status_novo == StatusLeito.MANUTENCAO:
+        return TipoEventoLeito.MANUTENCAO
+    if status_anterior == StatusLeito.OCUPADO:
+        return TipoEventoLeito.ALTA
+    return TipoEventoLeito.DISPONIVEL  # MANUTENCAO -> LIVRE
+
+
+def registrar_evento(
+        db: Session,
+        leito_id: int,
+        status_anterior: Optional[StatusLeito],
+        status_novo: Optional[StatusLeito],
+        ala_anterior: Optional[str] = None,
+        ala: Optional[str] = None,
+        paciente_id: Optional[int] = None,
+        usuario_email: Optional[str] = None,
+        tipo: Optional[TipoEventoLeito] = None,
+        leito_relacionado_id: Optional[int] = None
+) -> m.EventoLeito:
+    """
+    Adiciona um evento de leito à sessão, sem commit: o evento é gravado
+    na mesma transação que altera o leito.
+    """
+    evento = m.EventoLeito(
+        leito_id=leito_id,
+        tipo=tipo or classificar_evento(status_anterior, status_novo),
+        ala_anterior=ala_anterior,
+        status_anterior=status_anterior,
+        ala=ala,
+        status_novo=status_novo,
+        paciente_id=paciente_id,
+        leito_relacionado_id=leito_relacionado_id,
+        usuario_email=usuario_email,
+        data_hora=datetime.utcnow()  # Mesmo relógio (UTC) das demais fontes da linha do tempo
+    )
+    db.add(evento)
+    return evento
+
+
+# ============================================================
+# Censo de ocupação
+# ============================================================
+def truncar(momento: datetime, granularidade: str) -> datetime:
+    """Trunca o instante para o início da hora ou do dia."""
+    if granularidade == "dia":
+        return momento.replace(hour=0, minute=0, second=0, microsecond=0)
+    return momento.replace(minute=0, second=0, microsecond=0)
+
+
+def estado_inicial(db: Session, momento: datetime, ala: Optional[str] = None) -> Dict[StatusLeito, int]:
+    """
+    Quantidade de leitos em cada status imediatamente antes de `momento`,
+    somando no banco as entradas (status_novo) e saídas (status_anterior)
+    de todos os eventos anteriores.
+    """
+    contagem = {s: 0 for s in StatusLeito}
+    E = m.EventoLeito
+
+    entradas = db.query(E.status_novo, func.count()).filter(E.data_hora < momento, E.status_novo.isnot(None))
+    saidas = db.query(E.status_anterior, func.count()).filter(E.data_hora < momento, E.status_anterior.isnot(None))
+    if ala is not None:
+        entradas = entradas.filter(E.ala == ala)
+        saidas = saidas.filter(E.ala_anterior == ala)
+
+    for status_leito, quantidade in entradas.group_by(E.status_novo):
+        contagem[status_leito] += quantidade
+    for status_leito, quantidade in saidas.group_by(E.status_anterior):
+        contagem[status_leito] -= quantidade
+    return contagem
+
+
+def calcular_censo(
+        db: Session,
+        inicio: datetime,
+        fim: datetime,
+        granularidade: str = "hora",
+        ala: Optional[str] = None
+) -> List[dict]:
+    """
+    Calcula a ocupação de leitos em intervalos regulares entre `inicio` e `fim`.
+
+    O estado no início vem de uma agregação SQL; em seguida os eventos do
+    período são lidos uma única vez, em ordem de data, e aplicados como
+    deltas (varredura). Para cada intervalo retorna a situação ao final
+    dele, o pico de ocupação e a contagem de admissões, altas e
+    transferências recebidas.
+
+    Lança ValueError para granularidade desconhecida ou período longo demais.
+    """
+    if granularidade not in GRANULARIDADES:
+        raise ValueError(f"Granularidade inválida: {granularidade} (use {', '.join(GRANULARIDADES)})")
+    passo = GRANULARIDADES[granularidade]
+    inicio = truncar(inicio, granularidade)
+    quantidade_pontos = -(-(fim - inicio) // passo)  # Divisão com arredondamento para cima
+    if quantidade_pontos <= 0:
+        return []
+    if quantidade_pontos > MAX_PONTOS_CENSO:
+        raise ValueError(f"Período longo demais: máximo de {MAX_PONTOS_CENSO} intervalos por consulta")
+    fim = inicio + quantidade_pontos * passo
+
+    contagem = estado_inicial(db, inicio, ala)
+
+    E = m.EventoLeito
+    eventos = db.query(E.tipo, E.ala_anterior, E.status_anterior, E.ala, E.status_novo, E.data_hora).filter(
+        E.data_hora >= inicio,
+        E.data_hora < fim
+    )
+    if ala is not None:
+        eventos = eventos.filter(or_(E.ala == ala, E.ala_anterior == ala))
+    eventos = iter(eventos.order_by(E.data_hora, E.id).yield_per(1000))
+    evento = next(eventos, None)
+
+    pontos = []
+    for i in range(quantidade_pontos):
+        limite = inicio + (i + 1) * passo
+        pico = contagem[StatusLeito.OCUPADO]
+        fluxo = {TipoEventoLeito.ADMISSAO: 0, TipoEventoLeito.ALTA: 0, TipoEventoLeito.TRANSFERENCIA: 0}
+
+        while evento is not None and evento.data_hora < limite:
+            if evento.status_anterior is not None and (ala is None or evento.ala_anterior == ala):
+                contagem[evento.status_anterior] -= 1
+            if evento.status_novo is not None and (ala is None or evento.ala == ala):
+                contagem[evento.status_novo] += 1
+                if evento.tipo in fluxo and (evento.tipo != TipoEventoLeito.TRANSFERENCIA
+                                             or evento.status_novo == StatusLeito.OCUPADO):
+                    fluxo[evento.tipo] += 1  # Transferência conta só no leito de destino
+            pico = max(pico, contagem[StatusLeito.OCUPADO])
+            evento = next(eventos, None)
+
+        ocupados = contagem[StatusLeito.OCUPADO]
+        livres = contagem[StatusLeito.LIVRE]
+        em_uso = ocupados + livres
+        pontos.append({
+            "inicio": limite - passo,
+            "ocupados": ocupados,
+            "livres": livres,
+            "manutencao": contagem[StatusLeito.MANUTENCAO],
+            "taxa_ocupacao": round(ocupados / em_uso, 4) if em_uso else 0.0,
+            "pico_ocupados": pico,
+            "admissoes": fluxo[TipoEventoLeito.ADMISSAO],
+            "altas": fluxo[TipoEventoLeito.ALTA],
+            "transferencias": fluxo[TipoEventoLeito.TRANSFERENCIA],
+        })
+    return pontos
@@ -0,0 +1,134 @@
+# D:\ProjectSGHSS\app\core\escopo.py
+# Escopo de acesso por papel: restringe as consultas SQL às linhas do próprio usuário
+
+from dataclasses import dataclass  # Escopo imutável por requisição
+from typing import Optional  # Tipagens
+
+from sqlalchemy import Select, false, select  # Condição vazia e subconsultas
+from sqlalchemy.orm import Query, Session  # Consultas ORM
+
+from app import models as m  # Models do projeto
+from app.models import PapelUsuario  # Papéis de usuário
+
+
+@dataclass(frozen=True)
+class Escopo:
+    """
+    O que o usuário autenticado pode listar:
+
+    - ADMIN: tudo
+    - MEDICO: registros em que é o médico (`Usuario.medico_id`)
+    - PACIENTE: registros em que é o paciente (`Usuario.paciente_id`)
+
+    Usuários MEDICO/PACIENTE sem vínculo não enxergam nenhuma linha.
+    """
+    papel: str
+    paciente_id: Optional[int] = None
+    medico_id: Optional[int] = None
+
+    @property
+    def irrestrito(self) -> bool:
+        return self.papel == PapelUsuario.ADMIN.value
+
+    @property
+    def chave(self) -> tuple:
+        """Identifica o conjunto de linhas visível (ex.: chave de cache de totais)."""
+        return (self.papel, self.paciente_id, self.medico_id)
+
+
+def escopo_do_usuario(usuario_atual: dict) -> Escopo:
+    """Escopo a partir do usuário retornado por `security.get_current_user`."""
+    return Escopo(
+        papel=usuario_atual.get("papel"),
+        paciente_id=usuario_atual.get("paciente_id"),
+        medico_id=usuario_atual.get("medico_id"),
+    )
+
+
+def filtro_escopo(escopo: Escopo, coluna_paciente=None, coluna_medico=None):
+    """
+    Condição SQL que limita as linhas ao escopo, a partir das colunas de
+    paciente e médico da tabela. Retorna None quando não há restrição.
+    """
+    if escopo.irrestrito:
+        return None
+    if escopo.papel == PapelUsuario.MEDICO.value and coluna_medico is not None and escopo.medico_id:
+        return coluna_medico == escopo.medico_id
+    if escopo.papel == PapelUsuario.PACIENTE.value and coluna_paciente is not None and escopo.paciente_id:
+        return coluna_paciente == escopo.paciente_id
+    return false()
+
+
+def no_escopo(escopo: Escopo, paciente_id: Optional[int] = None, medico_id: Optional[int] = None) -> bool:
+    """Equivalente de `filtro_escopo` para um registro já carregado (rotas por ID)."""
+    if escopo.irrestrito:
+        return True
+    if escopo.papel == PapelUsuario.MEDICO.value:
+        return escopo.medico_id is not None and medico_id == escopo.medico_id
+    if escopo.papel == PapelUsuario.PACIENTE.value:
+        return escopo.paciente_id is not None and paciente_id == escopo.paciente_id
+    return False
+
+
+def aplicar_escopo(query: Query, escopo: Escopo, coluna_paciente=None, coluna_medico=None) -> Query:
+    """Aplica `filtro_escopo` a uma consulta ORM."""
+    condicao = filtro_escopo(escopo, coluna_paciente, coluna_medico)
+    return query if condicao is None else query.filter(condicao)
+
+
+# ============================================================
+# Tabelas sem colunas diretas de paciente/médico
+# ============================================================
+def ids_pacientes(escopo: Escopo) -> Optional[Select]:
+    """
+    SELECT dos IDs de pacientes visíveis (None quando não há restrição), para
+    filtrar consultas que não passam pelo ORM (ex.: busca textual).
+    """
+    if escopo.irrestrito:
+        return None
+    if escopo.papel == PapelUsuario.MEDICO.value and escopo.medico_id:
+        return select(m.Consulta.paciente_id).where(m.Consulta.medico_id == escopo.medico_id)  # ix_consultas_medico_paciente
+    return select(m.Paciente.id).where(filtro_escopo(escopo, coluna_paciente=m.Paciente.id))
+
+
+def escopo_pacientes(query: Query, escopo: Escopo) -> Query:
+    """Pacientes visíveis: o próprio (PACIENTE) ou os que têm consulta com o médico (MEDICO)."""
+    visiveis = ids_pacientes(escopo)
+    return query if visiveis is None else query.filter(m.Paciente.id.in_(visiveis))
+
+
+def paciente_no_escopo(db: Session, escopo: Escopo, paciente_id: int) -> bool:
+    """Equivalente de `escopo_pacientes` para um paciente (rotas por ID)."""
+    if escopo.papel == PapelUsuario.MEDICO.value and escopo.medico_id:
+        return db.scalar(
+            select(m.Consulta.id)
+            .where(m.Consulta.medico_id == escopo.medico_id, m.Consulta.paciente_id == paciente_id)
+            .limit(1)
+        ) is not None  # ix_consultas_medico_paciente
+    return no_escopo(escopo, paciente_id=paciente_id)
+
+
+def escopo_teleconsultas(query: Query, escopo: Escopo) -> Query:
+    """Teleconsultas visíveis: as das consultas do escopo."""
+    condicao = filtro_escopo(escopo, m.Consulta.paciente_id, m.Consulta.medico_id)
+    if condicao is None:
+        return query
+    return query.filter(m.Teleconsulta.consulta_id.in_(select(m.Consulta.id).where(condicao)))
+
+
+# ============================================================
+# Vínculo usuário → paciente/médico
+# ============================================================
+def vincular_por_email(db: Session, usuario) -> bool:
+    """
+    Vincula um usuário PACIENTE/MEDICO sem vínculo ao cadastro com o mesmo
+    email. Não faz commit. Retorna True se criou o vínculo.
+    """
+    papel = getattr(usuario.papel, "value", usuario.papel)
+    if papel == PapelUsuario.PACIENTE.value and usuario.paciente_id is None:
+        usuario.paciente_id = db.scalar(select(m.Paciente.id).where(m.Paciente.email == usuario.email))
+        return usuario.paciente_id is not None
+    if papel == PapelUsuario.MEDICO.value and usuario.medico_id is None:
+        usuario.medico_id = db.scalar(select(m.Medico.id).where(m.Medico.email == usuario.email))
+        return usuario.medico_id is not None
+    return False
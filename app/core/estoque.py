@@ -0,0 +1,88 @@
+# D:\ProjectSGHSS\app\core\estoque.py
+# Movimentações atômicas de estoque de suprimentos, com livro append-only
+
+from typing import Optional  # Tipagens
+
+from sqlalchemy import update  # UPDATE condicional
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+from app.models import TipoMovimentoSuprimento  # Enum de tipo de movimento
+
+
+def movimentar(
+        db: Session,
+        suprimento_id: int,
+        delta: int,
+        tipo: TipoMovimentoSuprimento,
+        motivo: Optional[str] = None,
+        usuario_email: Optional[str] = None,
+        lote: Optional[str] = None
+) -> Optional[m.MovimentoSuprimento]:
+    """
+    Aplica `delta` à quantidade do suprimento em um único UPDATE
+    (`quantidade = quantidade + delta`), que para saídas só casa se houver
+    saldo suficiente, e registra o movimento no livro. Não faz commit.
+
+    Retorna o movimento registrado (com o saldo resultante), ou None se o
+    suprimento não existe ou o saldo é insuficiente (nada é alterado).
+    """
+    condicoes = [m.Suprimento.id == suprimento_id]
+    if delta < 0:
+        condicoes.append(m.Suprimento.quantidade >= -delta)  # Nunca deixa o estoque negativo
+
+    saldo = db.execute(
+        update(m.Suprimento)
+        .where(*condicoes)
+        .values(quantidade=m.Suprimento.quantidade + delta)
+        .returning(m.Suprimento.quantidade)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if saldo is None:
+        return None
+
+    movimento = m.MovimentoSuprimento(
+        suprimento_id=suprimento_id,
+        tipo=tipo,
+        quantidade=delta,
+        saldo_resultante=saldo,
+        motivo=motivo,
+        lote=lote,
+        usuario_email=usuario_email
+    )
+    db.add(movimento)
+    return movimento
+
+
+def definir_quantidade(
+        db: Session,
+        suprimento_id: int,
+        nova_quantidade: int,
+        quantidade_esperada: int,
+        motivo: Optional[str] = None,
+        usuario_email: Optional[str] = None
+) -> bool:
+    """
+    Compare-and-set: grava `nova_quantidade` somente se a quantidade atual
+    ainda for `quantidade_esperada`, registrando a diferença como AJUSTE.
+    Não faz commit. Retorna False se outra operação alterou o estoque.
+    """
+    resultado = db.execute(
+        update(m.Suprimento)
+        .where(m.Suprimento.id == suprimento_id, m.Suprimento.quantidade == quantidade_esperada)
+        .values(quantidade=nova_quantidade)
+        .execution_options(synchronize_session=False)
+    )
+    if resultado.rowcount != 1:
+        return False
+
+    if nova_quantidade != quantidade_esperada:
+        db.add(m.MovimentoSuprimento(
+            suprimento_id=suprimento_id,
+            tipo=TipoMovimentoSuprimento.AJUSTE,
+            quantidade=nova_quantidade - quantidade_esperada,
+            saldo_resultante=nova_quantidade,
+            motivo=motivo,
+            usuario_email=usuario_email
+        ))
+    return True
@@ -0,0 +1,121 @@
+# D:\ProjectSGHSS\app\core\eventos.py
+# Barramento de eventos em processo (pub/sub) para notificações em tempo real
+
+import asyncio  # Filas dos assinantes no loop do servidor
+import threading  # Exclusão mútua entre publicadores (threadpool do FastAPI)
+from collections import deque  # Histórico circular para recuperação
+from dataclasses import dataclass, field  # Estruturas simples
+from datetime import datetime  # Momento do evento
+from typing import Deque, List, Optional, Set, Tuple  # Tipagens
+
+TAMANHO_HISTORICO = 1000  # Eventos mantidos para recuperação por número de sequência
+TAMANHO_FILA_ASSINANTE = 500  # Eventos pendentes por conexão antes de descartá-la
+
+
+@dataclass(frozen=True)
+class Evento:
+    """Evento publicado: número de sequência, tópico (leito, suprimento...), ação e dados."""
+    seq: int
+    topico: str
+    acao: str
+    dados: dict
+    data_hora: datetime
+
+
+@dataclass(eq=False)
+class Assinatura:
+    """
+    Conexão inscrita no barramento. Os eventos aceitos pelos filtros são
+    entregues em `fila`, no loop asyncio da conexão.
+    """
+    loop: asyncio.AbstractEventLoop
+    topicos: Optional[Set[str]] = None  # None = todos os tópicos
+    ala: Optional[str] = None  # Filtro de ala para eventos de leito
+    fila: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(TAMANHO_FILA_ASSINANTE))
+    atrasada: bool = False  # Fila encheu: a conexão deve ser encerrada e retomada pelo cliente
+
+    def aceita(self, evento: Evento) -> bool:
+        if self.topicos is not None and evento.topico not in self.topicos:
+            return False
+        if self.ala is not None and evento.topico == "leito" and evento.dados.get("ala") != self.ala:
+            return False
+        return True
+
+    def _entregar(self, evento: Evento):
+        """Executado no loop da conexão."""
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.atrasada = True
+
+
+class BarramentoEventos:
+    """
+    Pub/sub em memória com números de sequência crescentes.
+
+    - `publicar` pode ser chamado das threads dos endpoints síncronos
+    - Os últimos eventos ficam num buffer circular; um cliente que
+      reconecta informando o último `seq` recebido recupera o que perdeu
+    - Se o `seq` informado já saiu do buffer (ou é de outro processo),
+      o cliente é avisado para recarregar o estado completo
+
+    O barramento é local ao processo: com vários workers, cada conexão
+    recebe apenas os eventos do worker que a atende.
+    """
+
+    def __init__(self, tamanho_historico: int = TAMANHO_HISTORICO):
+        self._trava = threading.Lock()
+        self._sequencia = 0
+        self._historico: Deque[Evento] = deque(maxlen=tamanho_historico)
+        self._assinantes: Set[Assinatura] = set()
+
+    def publicar(self, topico: str, acao: str, dados: dict) -> Evento:
+        """Registra o evento no histórico e o encaminha aos assinantes interessados."""
+        with self._trava:
+            self._sequencia += 1
+            evento = Evento(self._sequencia, topico, acao, dados, datetime.now())
+            self._historico.append(evento)
+            destinatarios = [a for a in self._assinantes if a.aceita(evento)]
+
+        for assinatura in destinatarios:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura._entregar, evento)
+            except RuntimeError:  # Loop encerrado: conexão já não existe
+                self.cancelar(assinatura)
+        return evento
+
+    def assinar(
+            self,
+            topicos: Optional[Set[str]] = None,
+            ala: Optional[str] = None,
+            desde: Optional[int] = None
+    ) -> Tuple[Assinatura, List[Evento], bool]:
+        """
+        Inscreve uma conexão (deve ser chamado dentro do loop asyncio).
+
+        Retorna a assinatura, os eventos posteriores a `desde` ainda no
+        histórico e se houve lacuna (eventos perdidos além do histórico).
+        A inscrição e a leitura do histórico são atômicas, sem perdas nem
+        duplicatas entre os dois.
+        """
+        assinatura = Assinatura(loop=asyncio.get_running_loop(), topicos=topicos, ala=ala)
+        with self._trava:
+            self._assinantes.add(assinatura)
+            if desde is None:
+                return assinatura, [], False
+            mais_antigo = self._historico[0].seq if self._historico else self._sequencia + 1
+            if desde > self._sequencia or desde < mais_antigo - 1:
+                return assinatura, [], True  # Cliente deve recarregar o estado completo
+            pendentes = [e for e in self._historico if e.seq > desde and assinatura.aceita(e)]
+        return assinatura, pendentes, False
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._trava:
+            self._assinantes.discard(assinatura)
+
+    @property
+    def sequencia_atual(self) -> int:
+        return self._sequencia
+
+
+barramento_eventos = BarramentoEventos()  # Instância única do processo
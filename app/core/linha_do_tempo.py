@@ -0,0 +1,153 @@
+# D:\ProjectSGHSS\app\core\linha_do_tempo.py
+# Linha do tempo do paciente: consultas, teleconsultas, prontuários, prescrições e leitos
+
+import heapq  # Intercalação das fontes já ordenadas
+from dataclasses import dataclass  # Especificação das fontes
+from datetime import datetime  # Chave de ordenação
+from typing import Callable, Dict, List, Optional, Sequence, Tuple  # Tipagens
+
+from sqlalchemy import and_, func, or_  # Filtros compostos e trechos de texto
+from sqlalchemy.orm import Query, Session  # Consultas ORM
+
+from app import models as m  # Models do projeto
+
+TAMANHO_RESUMO = 200  # Caracteres de texto livre exibidos por item
+
+# Cursor: (data_hora, ordem da fonte, id) do último item da página
+CursorLinhaDoTempo = Tuple[datetime, int, int]
+
+
+@dataclass(frozen=True)
+class FonteLinhaDoTempo:
+    """
+    Tabela que compõe a linha do tempo.
+
+    `consulta(db, paciente_id)` devolve as linhas do paciente com colunas
+    rotuladas `id`, `data_hora`, `status`, `medico_id` e `resumo`; `coluna_data`
+    e `coluna_id` são usadas no filtro e na ordenação por chave, servidos
+    pelo índice (paciente_id, data_hora) da tabela. `ordem` desempata itens
+    de fontes diferentes no mesmo instante.
+    """
+    nome: str
+    ordem: int
+    consulta: Callable[[Session, int], Query]
+    coluna_data: object
+    coluna_id: object
+
+
+def _consultas(db: Session, paciente_id: int) -> Query:
+    C = m.Consulta
+    return db.query(
+        C.id.label("id"), C.data_hora.label("data_hora"), C.status.label("status"),
+        C.medico_id.label("medico_id"), func.substr(C.observacoes, 1, TAMANHO_RESUMO).label("resumo")
+    ).filter(C.paciente_id == paciente_id)
+
+
+def _teleconsultas(db: Session, paciente_id: int) -> Query:
+    T, C = m.Teleconsulta, m.Consulta
+    return db.query(
+        T.id.label("id"), T.data_hora.label("data_hora"), T.status.label("status"),
+        C.medico_id.label("medico_id"), T.link_video.label("resumo")
+    ).join(C, C.id == T.consulta_id).filter(C.paciente_id == paciente_id)
+
+
+def _prontuarios(db: Session, paciente_id: int) -> Query:
+    P = m.Prontuario
+    return db.query(
+        P.id.label("id"), P.data_hora.label("data_hora"), P.status.label("status"),
+        P.medico_id.label("medico_id"), func.substr(P.descricao, 1, TAMANHO_RESUMO).label("resumo")
+    ).filter(P.paciente_id == paciente_id)
+
+
+def _prescricoes(db: Session, paciente_id: int) -> Query:
+    R = m.Receita
+    return db.query(
+        R.id.label("id"), R.data_hora.label("data_hora"), R.status.label("status"),
+        R.medico_id.label("medico_id"), (R.medicamento + " " + R.dosagem).label("resumo")
+    ).filter(R.paciente_id == paciente_id)
+
+
+def _leitos(db: Session, paciente_id: int) -> Query:
+    E = m.EventoLeito
+    return db.query(
+        E.id.label("id"), E.data_hora.label("data_hora"), E.tipo.label("status"),
+        E.leito_id.label("leito_id"), E.ala.label("ala")
+    ).filter(E.paciente_id == paciente_id)
+
+
+FONTES: Dict[str, FonteLinhaDoTempo] = {
+    f.nome: f for f in (
+        FonteLinhaDoTempo("consulta", 0, _consultas, m.Consulta.data_hora, m.Consulta.id),
+        FonteLinhaDoTempo("teleconsulta", 1, _teleconsultas, m.Teleconsulta.data_hora, m.Teleconsulta.id),
+        FonteLinhaDoTempo("prontuario", 2, _prontuarios, m.Prontuario.data_hora, m.Prontuario.id),
+        FonteLinhaDoTempo("prescricao", 3, _prescricoes, m.Receita.data_hora, m.Receita.id),
+        FonteLinhaDoTempo("leito", 4, _leitos, m.EventoLeito.data_hora, m.EventoLeito.id),
+    )
+}
+
+
+def _formatar(fonte: FonteLinhaDoTempo, linha) -> dict:
+    item = {
+        "tipo": fonte.nome,
+        "id": linha.id,
+        "data_hora": linha.data_hora,
+        "status": getattr(linha.status, "value", linha.status),
+    }
+    if fonte.nome == "leito":
+        item["resumo"] = f"{item['status']} - leito {linha.leito_id}" + (f" ({linha.ala})" if linha.ala else "")
+    else:
+        item["medico_id"] = linha.medico_id
+        item["resumo"] = linha.resumo
+    return item
+
+
+def _pagina_da_fonte(
+        db: Session,
+        fonte: FonteLinhaDoTempo,
+        paciente_id: int,
+        limite: int,
+        apos: Optional[CursorLinhaDoTempo]
+) -> List[dict]:
+    """
+    Próximos `limite` itens da fonte em ordem decrescente de (data_hora, id),
+    estritamente depois do cursor na ordem global (data_hora, ordem, id).
+    """
+    consulta = fonte.consulta(db, paciente_id).filter(fonte.coluna_data.isnot(None))
+    if apos is not None:
+        data, ordem, ultimo_id = apos
+        if fonte.ordem < ordem:  # Mesmo instante: itens desta fonte vêm depois
+            consulta = consulta.filter(fonte.coluna_data <= data)
+        elif fonte.ordem > ordem:  # Mesmo instante: itens desta fonte já foram entregues
+            consulta = consulta.filter(fonte.coluna_data < data)
+        else:
+            consulta = consulta.filter(or_(
+                fonte.coluna_data < data,
+                and_(fonte.coluna_data == data, fonte.coluna_id < ultimo_id)
+            ))
+    linhas = consulta.order_by(fonte.coluna_data.desc(), fonte.coluna_id.desc()).limit(limite)
+    return [_formatar(fonte, linha) for linha in linhas]
+
+
+def chave_item(item: dict) -> CursorLinhaDoTempo:
+    """Chave de ordenação (e de cursor) de um item da linha do tempo."""
+    return item["data_hora"], FONTES[item["tipo"]].ordem, item["id"]
+
+
+def montar_linha_do_tempo(
+        db: Session,
+        paciente_id: int,
+        limite: int,
+        apos: Optional[CursorLinhaDoTempo] = None,
+        fontes: Optional[Sequence[str]] = None
+) -> List[dict]:
+    """
+    Retorna até `limite` itens do paciente, do mais recente para o mais antigo.
+
+    Cada fonte lê no máximo `limite` linhas por faixa do seu índice
+    (paciente_id, data_hora) a partir do cursor; as listas já ordenadas
+    são intercaladas com um heap, sem ordenar tudo em memória.
+    """
+    selecionadas = [FONTES[nome] for nome in (fontes or FONTES)]
+    paginas = [_pagina_da_fonte(db, fonte, paciente_id, limite, apos) for fonte in selecionadas]
+    intercalados = heapq.merge(*paginas, key=chave_item, reverse=True)
+    return [item for _, item in zip(range(limite), intercalados)]
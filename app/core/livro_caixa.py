@@ -0,0 +1,140 @@
+# D:\ProjectSGHSS\app\core\livro_caixa.py
+# Motor do livro caixa: valores em centavos inteiros e totais agregados no banco
+
+from datetime import datetime, date, time  # Limites de período
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation  # Conversão exata de valores
+from itertools import accumulate  # Saldo corrente (soma prefixada)
+from typing import Callable, Dict, Optional, Tuple  # Tipagens
+
+from sqlalchemy import case, func, select  # Expressões SQL
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+
+
+# ============================================================
+# Conversão de valores monetários
+# ============================================================
+def para_centavos(valor) -> int:
+    """
+    Converte um valor em reais (str, int, float ou Decimal) para centavos inteiros.
+    Aceita vírgula como separador decimal e arredonda meio centavo para cima.
+    """
+    if isinstance(valor, str):
+        valor = valor.strip().replace(",", ".")
+    try:
+        decimal = Decimal(str(valor))  # str() evita herdar o erro binário de floats
+    except InvalidOperation:
+        raise ValueError(f"Valor monetário inválido: {valor}")
+    if not decimal.is_finite():
+        raise ValueError(f"Valor monetário inválido: {valor}")
+    return int((decimal * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def de_centavos(centavos: int) -> Decimal:
+    """Converte centavos inteiros para Decimal em reais (2 casas)."""
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def valor_assinado():
+    """Expressão SQL do valor com sinal: ENTRADA positiva, SAIDA negativa (centavos)."""
+    return case(
+        (m.Financeiro.tipo == "SAIDA", -m.Financeiro.valor_centavos),
+        else_=m.Financeiro.valor_centavos
+    )
+
+
+def _inicio_do_dia(dia: date) -> datetime:
+    return datetime(dia.year, dia.month, dia.day)
+
+
+def _fim_do_dia(dia: date) -> datetime:
+    return datetime.combine(dia, time.max)  # Sem somar um dia (31/12/9999 não estoura)
+
+
+# ============================================================
+# Livro caixa agregado no banco
+# ============================================================
+def chave_dia():
+    """Expressão SQL do dia da movimentação (AAAA-MM-DD)."""
+    return func.strftime("%Y-%m-%d", m.Financeiro.data)
+
+
+class LivroCaixa:
+    """
+    Totais de um período agregados no SQLite (`SUM ... GROUP BY` sobre
+    `valor_centavos`, usando o índice por data): o Python só recebe uma
+    linha por grupo (ex.: um por dia do mês), nunca as movimentações.
+
+    Os valores são inteiros em centavos, portanto sem acúmulo de erro.
+    """
+
+    def __init__(self, grupos: Dict[str, Tuple[int, int, int]], saldo_inicial: int = 0):
+        self.grupos = grupos  # {chave: (entradas, saidas, quantidade)} em ordem cronológica
+        self.saldo_inicial = saldo_inicial  # Saldo (centavos) antes do período
+
+    # ----------------------------
+    # Carregamento
+    # ----------------------------
+    @classmethod
+    def carregar(
+            cls,
+            db: Session,
+            inicio: Optional[date] = None,
+            fim: Optional[date] = None,
+            chave: Callable = chave_dia
+    ) -> "LivroCaixa":
+        """
+        Agrega as movimentações de [inicio, fim] (fim inclusivo) por `chave()` com um
+        único GROUP BY e calcula o saldo anterior ao período com um SUM no banco.
+        """
+        expressao = chave().label("chave")
+        entradas = func.coalesce(func.sum(case((m.Financeiro.tipo == "SAIDA", 0), else_=m.Financeiro.valor_centavos)), 0)
+        saidas = func.coalesce(func.sum(case((m.Financeiro.tipo == "SAIDA", m.Financeiro.valor_centavos), else_=0)), 0)
+        consulta = select(expressao, entradas, saidas, func.count()).group_by(expressao).order_by(expressao)
+        saldo_inicial = 0
+
+        if inicio:
+            consulta = consulta.where(m.Financeiro.data >= _inicio_do_dia(inicio))
+            anterior = select(func.coalesce(func.sum(valor_assinado()), 0)).where(
+                m.Financeiro.data < _inicio_do_dia(inicio)
+            )
+            saldo_inicial = int(db.execute(anterior).scalar())
+        if fim:
+            consulta = consulta.where(m.Financeiro.data <= _fim_do_dia(fim))
+
+        grupos = {
+            str(grupo): (int(ent), int(sai), int(qtd))
+            for grupo, ent, sai, qtd in db.execute(consulta)
+        }
+        return cls(grupos, saldo_inicial)
+
+    # ----------------------------
+    # Cálculos
+    # ----------------------------
+    def __len__(self) -> int:
+        return sum(qtd for _, _, qtd in self.grupos.values())
+
+    def totais(self) -> Tuple[int, int]:
+        """Retorna (entradas, saídas) do período, em centavos."""
+        return (
+            sum(ent for ent, _, _ in self.grupos.values()),
+            sum(sai for _, sai, _ in self.grupos.values())
+        )
+
+    def saldo_final(self) -> int:
+        """Saldo ao fim do período, em centavos."""
+        entradas, saidas = self.totais()
+        return self.saldo_inicial + entradas - saidas
+
+    def totais_por_periodo(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Retorna {chave: (entradas, saidas, saldo_ao_fim_do_grupo)} em centavos,
+        preservando a ordem cronológica.
+        """
+        saldos = accumulate((ent - sai for ent, sai, _ in self.grupos.values()), initial=self.saldo_inicial)
+        next(saldos)  # Descarta o saldo inicial
+        return {
+            grupo: (ent, sai, saldo)
+            for (grupo, (ent, sai, _)), saldo in zip(self.grupos.items(), saldos)
+        }
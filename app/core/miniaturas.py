@@ -0,0 +1,100 @@
+# D:\ProjectSGHSS\app\core\miniaturas.py
+# Miniaturas e prévias de anexos (imagens e PDFs) geradas em um pool de processos
+
+import asyncio  # Tarefas de geração no loop da aplicação
+import multiprocessing  # Contexto "spawn" para os processos do pool
+import os  # Variáveis de ambiente
+import shutil  # Cópia de conteúdos de backends remotos
+import tempfile  # Diretório de trabalho de cada geração
+from concurrent.futures import ProcessPoolExecutor  # Renderização fora do processo do servidor
+from pathlib import Path  # Manipulação de caminhos
+from typing import Dict, Optional  # Tipagens
+
+from app.core.anexos import DIRETORIO_ENVIOS  # Área temporária no mesmo disco dos envios
+from app.core.armazenamento import chave_derivado, obter_backend  # Armazenamento por conteúdo
+from app.utils.imagens import gerar_derivados, suporta  # Renderização (executada nos processos)
+
+# -------------------------------
+# Configurações
+# -------------------------------
+VARIANTES = {"miniatura": 256, "previa": 1024}  # Lado máximo (px) de cada derivado
+PROCESSOS_MINIATURAS = int(os.getenv("PROCESSOS_MINIATURAS", 2))  # Processos do pool
+
+
+class GeradorDerivados:
+    """
+    Gera os derivados de cada conteúdo uma única vez: como os anexos são
+    endereçados pelo hash, o mesmo exame anexado a vários prontuários
+    compartilha miniatura e prévia. A renderização (decodificar imagens
+    grandes, rasterizar PDF) roda em processos separados para não competir
+    com as requisições pelo GIL; o pool é criado no primeiro uso.
+    """
+
+    def __init__(self, processos: int = PROCESSOS_MINIATURAS):
+        self._processos = processos
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._em_andamento: Dict[str, asyncio.Task] = {}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self._processos, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def solicitar(self, sha256: str, tipo_conteudo: Optional[str]) -> Optional[asyncio.Task]:
+        """
+        Agenda a geração dos derivados (deve ser chamado dentro do loop) e
+        retorna a tarefa, compartilhada por pedidos simultâneos do mesmo
+        conteúdo. Retorna None se o tipo não tem prévia.
+        """
+        if not sha256 or not suporta(tipo_conteudo):
+            return None
+        tarefa = self._em_andamento.get(sha256)
+        if tarefa is None:
+            tarefa = asyncio.create_task(self._gerar(sha256, tipo_conteudo))
+            self._em_andamento[sha256] = tarefa
+            tarefa.add_done_callback(lambda _: self._em_andamento.pop(sha256, None))
+        return tarefa
+
+    async def _gerar(self, sha256: str, tipo_conteudo: str) -> bool:
+        backend = obter_backend()
+        pendentes = {
+            variante: lado for variante, lado in VARIANTES.items()
+            if not await asyncio.to_thread(backend.existe, chave_derivado(sha256, variante))
+        }
+        if not pendentes:
+            return True
+
+        DIRETORIO_ENVIOS.mkdir(parents=True, exist_ok=True)
+        trabalho = Path(tempfile.mkdtemp(dir=DIRETORIO_ENVIOS, prefix=".derivados-"))
+        try:
+            origem = backend.caminho_local(sha256)
+            if origem is None:  # Backend remoto: renderiza a partir de uma cópia local
+                origem = trabalho / "origem"
+                await asyncio.to_thread(self._copiar, sha256, origem)
+
+            destinos = {variante: (str(trabalho / f"{variante}.jpg"), lado) for variante, lado in pendentes.items()}
+            gerados = await asyncio.get_running_loop().run_in_executor(
+                self._executor(), gerar_derivados, str(origem), tipo_conteudo, destinos
+            )
+            for variante, caminho in gerados.items():
+                await asyncio.to_thread(backend.gravar, chave_derivado(sha256, variante), Path(caminho))
+            return True
+        except Exception as e:  # Arquivo corrompido ou formato não reconhecido: sem prévia
+            print(f"❌ Erro ao gerar prévias do anexo {sha256[:12]}: {e}")
+            return False
+        finally:
+            shutil.rmtree(trabalho, ignore_errors=True)
+
+    @staticmethod
+    def _copiar(sha256: str, destino: Path):
+        with obter_backend().abrir(sha256) as origem, open(destino, "wb") as arquivo:
+            shutil.copyfileobj(origem, arquivo, 1024 * 1024)
+
+    def encerrar(self):
+        """Encerra o pool no desligamento da aplicação."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+gerador_derivados = GeradorDerivados()  # Instância única do processo
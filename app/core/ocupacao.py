@@ -0,0 +1,39 @@
+# D:\ProjectSGHSS\app\core\ocupacao.py
+# Ocupação de leitos por ala, agregada no banco
+
+from typing import Dict, Optional  # Tipagens
+
+from sqlalchemy import func  # Contagens em SQL
+from sqlalchemy.orm import Session  # Sessão do SQLAlchemy
+
+from app import models as m  # Models do projeto
+from app.models import StatusLeito  # Enum de status do leito
+
+
+def resumo_ocupacao(db: Session, ala: Optional[str] = None) -> Dict[Optional[str], dict]:
+    """
+    Retorna, por ala, as contagens por status e os IDs dos leitos livres.
+    Com `ala` informada, retorna apenas essa ala (zerada se não tiver leitos).
+
+    Lido da tabela a cada chamada, com um `COUNT ... GROUP BY ala, status`
+    e a lista de livres, ambos resolvidos pelo índice `ix_leitos_ala_status`:
+    o resultado é o mesmo em todos os workers e não depende de quem alterou
+    os leitos (rotas, restauração de backup, outro processo).
+    """
+    L = m.Leito
+    contagens = db.query(L.ala, L.status, func.count()).group_by(L.ala, L.status)
+    livres = db.query(L.ala, L.id).filter(L.status == StatusLeito.LIVRE)
+    if ala is not None:
+        contagens = contagens.filter(L.ala == ala)
+        livres = livres.filter(L.ala == ala)
+
+    def vazio():
+        return {"livres": 0, "ocupados": 0, "manutencao": 0, "leitos_livres": []}
+
+    campos = {StatusLeito.LIVRE: "livres", StatusLeito.OCUPADO: "ocupados", StatusLeito.MANUTENCAO: "manutencao"}
+    resultado: Dict[Optional[str], dict] = {ala: vazio()} if ala is not None else {}
+    for nome, status, quantidade in contagens.order_by(L.ala):
+        resultado.setdefault(nome, vazio())[campos[StatusLeito(status)]] = quantidade
+    for nome, leito_id in livres.order_by(L.ala, L.id):
+        resultado[nome]["leitos_livres"].append(leito_id)
+    return resultado
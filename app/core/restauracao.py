@@ -0,0 +1,199 @@
+# D:\ProjectSGHSS\app\core\restauracao.py
+# Restauração do banco: descompressão em fluxo, validação e troca atômica com o pool em pausa
+
+import os  # Troca atômica do arquivo
+import sqlite3  # Validação do banco recebido
+import threading  # Pausa das conexões durante a troca
+import time  # Espera pelas conexões em uso
+import zlib  # Descompressão gzip em fluxo
+from pathlib import Path  # Manipulação de caminhos
+from typing import BinaryIO, Callable  # Tipagens
+
+from sqlalchemy import event, exc, text  # Eventos do pool, reconexão e SQL bruto
+
+from app.db import engine  # Engine principal
+from app.db.session import engine as engine_sessao  # Engine do financeiro/migrações (mesmo arquivo)
+from app.db.migrations import VERSAO_ESQUEMA, criar_tabelas  # Versão do schema e migrações
+from app.core.backup import CAMINHO_BANCO, BackupInvalido, verificar_integridade  # Banco em uso e verificação
+from app.utils.cache import limpar_caches  # Caches com valores do banco anterior
+
+# -------------------------------
+# Configurações
+# -------------------------------
+TAMANHO_BLOCO = 1024 * 1024  # Bytes lidos por vez do arquivo enviado
+TEMPO_QUIESCENCIA = float(os.getenv("RESTAURACAO_ESPERA_SEGUNDOS", 30))  # Espera pelas conexões em uso
+TABELAS_OBRIGATORIAS = {"usuarios", "pacientes", "medicos", "consultas"}  # Presentes desde a primeira versão
+
+# Assinaturas dos formatos aceitos
+MAGICA_SQLITE = b"SQLite format 3\x00"
+MAGICA_GZIP = b"\x1f\x8b"
+MAGICA_ZSTD = b"\x28\xb5\x2f\xfd"
+
+ENGINES = (engine, engine_sessao)  # Pools que abrem o arquivo do banco
+
+
+class RestauracaoInvalida(Exception):
+    """O arquivo enviado não é um backup restaurável deste sistema."""
+
+
+class BancoEmUso(Exception):
+    """Conexões não foram devolvidas ao pool dentro do prazo."""
+
+
+# ============================================================
+# Recebimento em fluxo
+# ============================================================
+def _descompressor(cabecalho: bytes) -> Callable[[bytes], bytes]:
+    """Escolhe a descompressão pelos primeiros bytes do arquivo (não pela extensão)."""
+    if cabecalho.startswith(MAGICA_SQLITE[:4]):
+        return lambda bloco: bloco
+    if cabecalho.startswith(MAGICA_GZIP):
+        descompressor, erros = zlib.decompressobj(wbits=31), (zlib.error,)  # 31: formato gzip
+    elif cabecalho.startswith(MAGICA_ZSTD):
+        try:
+            import zstandard  # Dependência opcional
+        except ImportError:
+            raise RestauracaoInvalida("Backup comprimido com zstd requer o pacote zstandard")
+        descompressor, erros = zstandard.ZstdDecompressor().decompressobj(), (zstandard.ZstdError,)
+    else:
+        raise RestauracaoInvalida("Formato não reconhecido: envie um banco SQLite (.db), .db.gz ou .db.zst")
+
+    def descomprimir(bloco: bytes) -> bytes:
+        try:
+            return descompressor.decompress(bloco)
+        except erros as e:
+            raise RestauracaoInvalida(f"Arquivo comprimido inválido: {e}")
+
+    return descomprimir
+
+
+def gravar_descomprimido(origem: BinaryIO, destino: Path):
+    """
+    Copia `origem` para `destino` em blocos, descomprimindo gzip/zstd
+    conforme a assinatura, sem carregar o arquivo em memória.
+    """
+    with open(destino, "wb") as saida:
+        bloco = origem.read(TAMANHO_BLOCO)
+        descomprimir = _descompressor(bloco)
+        while bloco:
+            saida.write(descomprimir(bloco))
+            bloco = origem.read(TAMANHO_BLOCO)
+        saida.flush()
+        os.fsync(saida.fileno())  # Conteúdo em disco antes da troca
+
+
+def validar_banco(caminho: Path) -> int:
+    """
+    Confere assinatura, integridade e schema do banco recebido.
+    Retorna a versão do schema (`PRAGMA user_version`); versões antigas
+    são migradas após a troca, versões mais novas que a aplicação são recusadas.
+    """
+    with open(caminho, "rb") as arquivo:
+        if arquivo.read(len(MAGICA_SQLITE)) != MAGICA_SQLITE:
+            raise RestauracaoInvalida("O conteúdo não é um banco SQLite (backups incrementais: use /reconstruir)")
+    try:
+        verificar_integridade(caminho)
+    except (BackupInvalido, sqlite3.DatabaseError) as e:
+        raise RestauracaoInvalida(f"Banco corrompido: {e}")
+
+    conexao = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+    try:
+        versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+        tabelas = {linha[0] for linha in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conexao.close()
+    if versao > VERSAO_ESQUEMA:
+        raise RestauracaoInvalida(f"Backup de uma versão mais nova do schema ({versao} > {VERSAO_ESQUEMA})")
+    if faltando := TABELAS_OBRIGATORIAS - tabelas:
+        raise RestauracaoInvalida(f"Banco sem as tabelas do sistema: {', '.join(sorted(faltando))}")
+    return versao
+
+
+# ============================================================
+# Pausa do pool e troca
+# ============================================================
+class PausaConexoes:
+    """
+    Suspende a entrega de conexões dos pools durante a troca do arquivo:
+    requisições que precisarem do banco aguardam no checkout até a troca
+    terminar, e a troca só começa quando as conexões em uso são devolvidas.
+    A thread que executa a troca continua usando o banco normalmente.
+    """
+
+    def __init__(self):
+        self._liberado = threading.Event()
+        self._liberado.set()
+        self._trava = threading.Lock()
+        self._aguardando = 0  # Checkouts parados na pausa (já sem conexão aberta)
+        self._dono = None
+        for motor in ENGINES:
+            event.listen(motor, "checkout", self._aguardar)
+
+    def _aguardar(self, conexao_dbapi, *_):
+        if self._liberado.is_set() or threading.get_ident() == self._dono:
+            return
+        conexao_dbapi.close()  # Nenhum descritor aberto para o arquivo que será trocado
+        with self._trava:
+            self._aguardando += 1
+        try:
+            self._liberado.wait(TEMPO_QUIESCENCIA * 2)
+        finally:
+            with self._trava:
+                self._aguardando -= 1
+        raise exc.DisconnectionError("Banco restaurado: nova conexão")  # O pool abre outra, já no banco novo
+
+    def pausar(self, espera: float = TEMPO_QUIESCENCIA):
+        self._dono = threading.get_ident()
+        self._liberado.clear()
+        limite = time.monotonic() + espera
+        while sum(motor.pool.checkedout() for motor in ENGINES) > self._aguardando:
+            if time.monotonic() > limite:
+                self.liberar()
+                raise BancoEmUso("Há conexões em uso com o banco; tente novamente")
+            time.sleep(0.05)
+        for motor in ENGINES:
+            motor.dispose()  # Fecha as conexões ociosas: nenhum descritor aberto para o arquivo antigo
+
+    def liberar(self):
+        self._dono = None
+        self._liberado.set()
+
+
+pausa_conexoes = PausaConexoes()  # Instância única do processo
+
+
+def substituir_banco(novo: Path):
+    """
+    Coloca `novo` no lugar do banco em uso: pausa as conexões, troca o
+    arquivo com `os.replace` (atômico no mesmo sistema de arquivos), descarta
+    `-wal`/`-shm` do banco anterior, reativa o WAL, aplica as migrações e
+    limpa o que é mantido em memória.
+    """
+    pausa_conexoes.pausar()
+    try:
+        os.replace(novo, CAMINHO_BANCO)
+        for sufixo in ("-wal", "-shm"):
+            Path(f"{CAMINHO_BANCO}{sufixo}").unlink(missing_ok=True)
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL;"))
+        criar_tabelas()  # Bancos de versões anteriores recebem as colunas e índices atuais
+        limpar_caches()  # Totais em cache (ex.: TOTAIS_CONSULTAS) eram do banco anterior
+    finally:
+        pausa_conexoes.liberar()
+
+
+def restaurar_arquivo(origem: BinaryIO, diretorio: Path) -> int:
+    """
+    Restauração completa a partir de um arquivo (opcionalmente comprimido):
+    grava descomprimido em `diretorio`, valida e troca. Retorna a versão
+    do schema do backup. E/S bloqueante: execute no worker de backup.
+    """
+    temporario = diretorio / f".restauracao-{os.getpid()}-{threading.get_ident()}.db"
+    try:
+        gravar_descomprimido(origem, temporario)
+        versao = validar_banco(temporario)
+        substituir_banco(temporario)
+        return versao
+    finally:
+        for sufixo in ("", "-wal", "-shm"):  # -wal/-shm: abertura do arquivo na validação
+            Path(f"{temporario}{sufixo}").unlink(missing_ok=True)
@@ -85,4 +85,11 @@ def get_current_user(request: Request, db=Depends(get_db)):
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
 
     # ✅ Corrigido: campo 'papel' no lugar de 'role', já retorna o valor do Enum
-    return {"id": usuario.id, "email": usuario.email, "papel": usuario.papel.value}
+    # Vínculos com paciente/médico definem o escopo das listagens (app.core.escopo)
+    return {
+        "id": usuario.id,
+        "email": usuario.email,
+        "papel": usuario.papel.value,
+        "paciente_id": usuario.paciente_id,
+        "medico_id": usuario.medico_id,
+    }
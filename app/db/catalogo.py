@@ -0,0 +1,27 @@
+# D:\ProjectSGHSS\app\db\catalogo.py
+# Catálogo de backups em um banco SQLite próprio, no diretório dos backups
+# Fica fora do sghss.db para não ser sobrescrito ao restaurar um backup anterior
+
+import os  # Variáveis de ambiente
+from pathlib import Path  # Manipulação de caminhos
+from sqlalchemy import create_engine  # Engine do catálogo
+from sqlalchemy.orm import sessionmaker, declarative_base  # Sessão e base declarativa
+
+# Diretório dos arquivos de backup e do catálogo
+DIRETORIO_BACKUPS = Path(os.getenv("DIRETORIO_BACKUPS", "backups"))
+DIRETORIO_BACKUPS.mkdir(parents=True, exist_ok=True)  # Garante que a pasta exista
+
+# Engine do catálogo (mesmas opções do banco principal)
+engine_catalogo = create_engine(
+    f"sqlite:///{DIRETORIO_BACKUPS / 'catalogo.db'}",
+    connect_args={
+        "check_same_thread": False,
+        "timeout": 30
+    }
+)
+
+# Sessão do catálogo
+SessaoCatalogo = sessionmaker(autocommit=False, autoflush=False, bind=engine_catalogo)
+
+# Base declarativa dos modelos do catálogo
+BaseCatalogo = declarative_base()
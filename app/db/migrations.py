@@ -1,7 +1,20 @@
 from datetime import datetime  # Para datas de criação e nascimento
+from sqlalchemy import inspect, text  # Inspeção do schema existente e SQL bruto
+from sqlalchemy.schema import CreateIndex  # Criação de índices ausentes
 from app.db.session import Base, engine, SessionLocal  # Base declarativa, engine e sessão
+from app.db import Base as BaseModelos  # Base declarativa dos demais modelos (médico, leito, suprimento...)
+from app.db.catalogo import BaseCatalogo, engine_catalogo  # Catálogo de backups (banco próprio)
 from app.models import Usuario, Medico, Paciente, StatusConsulta, AuditLog, Financeiro  # Modelos principais
+from app.models import StatusLeito  # Normalização de status de leitos
 from app.core import security  # Para hash de senha
+from app.core.busca import criar_indices_busca  # Índices de busca textual
+from app.core.armazenamento import importar_anexos_legados  # Anexos gravados por caminho
+
+# Metadados de todas as bases declarativas do projeto
+METADADOS = (Base.metadata, BaseModelos.metadata)
+
+# Versão do schema gravada em `PRAGMA user_version` (incrementar ao mudar as migrações)
+VERSAO_ESQUEMA = 3
 
 
 # ============================================================
@@ -12,10 +25,238 @@ def criar_tabelas():
     Cria todas as tabelas do banco caso não existam.
     Inclui entidades principais, auditoria e financeiro.
     """
-    Base.metadata.create_all(bind=engine)  # Criação física das tabelas
+    aplicar_migracoes()  # Ajusta tabelas de versões anteriores antes do create_all
+    for metadados in METADADOS:
+        metadados.create_all(bind=engine)  # Criação física das tabelas
+    migrar_catalogo()  # Colunas novas no catálogo de backups
+    BaseCatalogo.metadata.create_all(bind=engine_catalogo)  # Catálogo de backups
+    criar_indices_ausentes()  # Índices novos em tabelas que já existiam
+    criar_indices_busca(engine)  # Índices textuais (FTS5 / tsvector) e triggers
+    semear_eventos_leito()  # Estado inicial do histórico de leitos
+    semear_movimentos_suprimento()  # Saldo inicial do livro de estoque
+    importar_anexos()  # Anexos antigos passam ao armazenamento por conteúdo
+    vincular_usuarios()  # Usuários PACIENTE/MEDICO ligados ao próprio cadastro
+    with engine.begin() as conn:
+        conn.execute(text(f"PRAGMA user_version = {VERSAO_ESQUEMA}"))  # Banco no schema atual
     print("✅ Todas as tabelas foram criadas (se ainda não existiam)")
 
 
+# ============================================================
+# Função: migrações incrementais
+# ============================================================
+def aplicar_migracoes():
+    """
+    Aplica alterações de schema em bancos já existentes.
+    O `create_all` só cria tabelas ausentes; colunas novas ou
+    alteradas em tabelas existentes são tratadas aqui.
+    """
+    with engine.begin() as conn:
+        inspetor = inspect(conn)
+        tabelas = set(inspetor.get_table_names())
+        versao = conn.execute(text("PRAGMA user_version")).scalar()
+
+        # Eventos de leito: horário local -> UTC (relógio das demais fontes da linha do tempo)
+        if "eventos_leito" in tabelas and versao < 3:
+            conn.execute(text(
+                "UPDATE eventos_leito "
+                "SET data_hora = datetime(substr(data_hora, 1, 19), 'utc') || substr(data_hora, 20)"
+            ))
+            conn.execute(text("PRAGMA user_version = 3"))  # Na mesma transação: não converte duas vezes
+
+        # Financeiro: valor FLOAT -> valor_centavos INTEGER (valores exatos)
+        if "financeiro" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("financeiro")}
+            if "valor_centavos" not in colunas:
+                conn.execute(text("ALTER TABLE financeiro ADD COLUMN valor_centavos INTEGER NOT NULL DEFAULT 0"))
+                conn.execute(text("UPDATE financeiro SET valor_centavos = CAST(ROUND(valor * 100) AS INTEGER)"))
+                print("🔄 financeiro.valor convertido para valor_centavos")
+            if "valor" in colunas:
+                conn.execute(text("ALTER TABLE financeiro DROP COLUMN valor"))
+            if "hash_importacao" not in colunas:
+                conn.execute(text("ALTER TABLE financeiro ADD COLUMN hash_importacao VARCHAR(64)"))
+
+        # Saldo corrente em ponto flutuante: é derivado, então é recriado em centavos
+        if "financeiro_saldo" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("financeiro_saldo")}
+            if "entradas_centavos" not in colunas:
+                conn.execute(text("DROP TABLE financeiro_saldo"))
+
+        # Usuários: vínculo com o cadastro de paciente/médico (escopo das listagens)
+        if "usuarios" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("usuarios")}
+            if "paciente_id" not in colunas:
+                conn.execute(text("ALTER TABLE usuarios ADD COLUMN paciente_id INTEGER REFERENCES pacientes(id)"))
+            if "medico_id" not in colunas:
+                conn.execute(text("ALTER TABLE usuarios ADD COLUMN medico_id INTEGER REFERENCES medicos(id)"))
+
+        # Suprimentos: nível de reposição por item
+        if "suprimentos" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("suprimentos")}
+            if "nivel_reposicao" not in colunas:
+                conn.execute(text("ALTER TABLE suprimentos ADD COLUMN nivel_reposicao INTEGER NOT NULL DEFAULT 0"))
+
+        # Prontuários: referência ao conteúdo do anexo no armazenamento
+        if "prontuarios" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("prontuarios")}
+            if "anexo_sha256" not in colunas:
+                conn.execute(text("ALTER TABLE prontuarios ADD COLUMN anexo_sha256 VARCHAR(64)"))
+
+        # Leitos: colunas de ala/tipo e status livre ("Livre", "ocupado"...) normalizado no enum
+        if "leitos" in tabelas:
+            colunas = {c["name"] for c in inspetor.get_columns("leitos")}
+            if "ala" not in colunas:
+                conn.execute(text("ALTER TABLE leitos ADD COLUMN ala VARCHAR(50)"))
+            if "tipo" not in colunas:
+                conn.execute(text("ALTER TABLE leitos ADD COLUMN tipo VARCHAR(50)"))
+            for (status_atual,) in conn.execute(text("SELECT DISTINCT status FROM leitos")).all():
+                try:
+                    status_normalizado = StatusLeito.normalizar(status_atual).value
+                except ValueError:
+                    status_normalizado = StatusLeito.MANUTENCAO.value  # Status desconhecido: fora de uso
+                    print(f"⚠️ Status de leito desconhecido '{status_atual}' migrado para MANUTENCAO")
+                if status_normalizado != status_atual:
+                    conn.execute(
+                        text("UPDATE leitos SET status = :novo WHERE status = :antigo"),
+                        {"novo": status_normalizado, "antigo": status_atual}
+                    )
+
+            # Um paciente por leito (índice único ux_leitos_paciente): só leitos OCUPADO têm paciente,
+            # e o paciente em mais de um leito permanece no de menor ID; os demais são liberados
+            conn.execute(text("UPDATE leitos SET paciente_id = NULL WHERE status <> 'OCUPADO' AND paciente_id IS NOT NULL"))
+            duplicados = (
+                "FROM leitos WHERE status = 'OCUPADO' AND paciente_id IS NOT NULL "
+                "AND id > (SELECT MIN(l.id) FROM leitos l WHERE l.paciente_id = leitos.paciente_id)"
+            )
+            if "eventos_leito" in tabelas:  # Histórico: alta dos leitos liberados
+                conn.execute(
+                    text(
+                        "INSERT INTO eventos_leito "
+                        "(leito_id, tipo, ala_anterior, status_anterior, ala, status_novo, paciente_id, data_hora) "
+                        f"SELECT id, 'ALTA', ala, 'OCUPADO', ala, 'LIVRE', paciente_id, :agora {duplicados}"
+                    ),
+                    {"agora": datetime.utcnow()}
+                )
+            liberados = conn.execute(text(
+                f"UPDATE leitos SET status = 'LIVRE', paciente_id = NULL WHERE id IN (SELECT id {duplicados})"
+            )).rowcount
+            if liberados:
+                print(f"⚠️ {liberados} leito(s) liberado(s): paciente ocupava mais de um leito")
+
+
+# ============================================================
+# Função: migrações do catálogo de backups
+# ============================================================
+def migrar_catalogo():
+    """Ajusta o catálogo de backups (banco próprio) criado por versões anteriores."""
+    with engine_catalogo.begin() as conn:
+        inspetor = inspect(conn)
+        if "backups" in inspetor.get_table_names():
+            colunas = {c["name"] for c in inspetor.get_columns("backups")}
+            if "codec" not in colunas:  # Backups anteriores ao codec configurável são gzip
+                conn.execute(text("ALTER TABLE backups ADD COLUMN codec VARCHAR(10) NOT NULL DEFAULT 'gzip'"))
+
+
+# ============================================================
+# Função: índices ausentes
+# ============================================================
+def criar_indices_ausentes():
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco.
+    O `create_all` só cria índices junto com tabelas novas.
+    """
+    with engine.begin() as conn:
+        for metadados in METADADOS:
+            for tabela in metadados.sorted_tables:
+                for indice in tabela.indexes:
+                    # IF NOT EXISTS no próprio banco: a reflexão não enxerga índices de expressão
+                    conn.execute(CreateIndex(indice, if_not_exists=True))
+
+
+# ============================================================
+# Função: estado inicial do histórico de leitos
+# ============================================================
+def semear_eventos_leito():
+    """
+    Em bancos anteriores ao histórico de leitos, registra um evento
+    CADASTRO com o estado atual de cada leito, para que o censo parta
+    da situação existente em vez de zero.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM eventos_leito LIMIT 1")).first():
+            return
+        inseridos = conn.execute(
+            text(
+                "INSERT INTO eventos_leito (leito_id, tipo, ala, status_novo, paciente_id, data_hora) "
+                "SELECT id, 'CADASTRO', ala, status, paciente_id, :agora FROM leitos"
+            ),
+            {"agora": datetime.utcnow()}
+        ).rowcount
+        if inseridos:
+            print(f"🔄 Histórico de leitos iniciado com {inseridos} leito(s) existente(s)")
+
+
+# ============================================================
+# Função: saldo inicial do livro de estoque
+# ============================================================
+def semear_movimentos_suprimento():
+    """
+    Em bancos anteriores ao livro de estoque, registra um AJUSTE com a
+    quantidade atual de cada suprimento, para que a soma dos movimentos
+    de cada item corresponda ao seu saldo.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM movimentos_suprimento LIMIT 1")).first():
+            return
+        inseridos = conn.execute(
+            text(
+                "INSERT INTO movimentos_suprimento "
+                "(suprimento_id, tipo, quantidade, saldo_resultante, motivo, data_hora) "
+                "SELECT id, 'AJUSTE', quantidade, quantidade, 'Saldo inicial', :agora "
+                "FROM suprimentos WHERE quantidade <> 0"
+            ),
+            {"agora": datetime.now()}
+        ).rowcount
+        if inseridos:
+            print(f"🔄 Livro de estoque iniciado com {inseridos} suprimento(s) existente(s)")
+
+
+# ============================================================
+# Função: anexos anteriores ao armazenamento por conteúdo
+# ============================================================
+def importar_anexos():
+    """
+    Move para o armazenamento endereçado por hash os anexos que ainda
+    estão referenciados pelo caminho do arquivo.
+    """
+    with SessionLocal() as session:
+        importados = importar_anexos_legados(session)
+    if importados:
+        print(f"🔄 {importados} anexo(s) de prontuário importado(s) para o armazenamento")
+
+
+# ============================================================
+# Função: vínculo dos usuários com pacientes/médicos
+# ============================================================
+def vincular_usuarios():
+    """
+    Liga ao cadastro de mesmo email os usuários PACIENTE/MEDICO ainda sem
+    vínculo (contas criadas antes do vínculo ou antes do cadastro).
+    """
+    with engine.begin() as conn:
+        vinculados = conn.execute(text(
+            "UPDATE usuarios SET paciente_id = (SELECT p.id FROM pacientes p WHERE p.email = usuarios.email) "
+            "WHERE papel = 'PACIENTE' AND paciente_id IS NULL "
+            "AND EXISTS (SELECT 1 FROM pacientes p WHERE p.email = usuarios.email)"
+        )).rowcount
+        vinculados += conn.execute(text(
+            "UPDATE usuarios SET medico_id = (SELECT m.id FROM medicos m WHERE m.email = usuarios.email) "
+            "WHERE papel = 'MEDICO' AND medico_id IS NULL "
+            "AND EXISTS (SELECT 1 FROM medicos m WHERE m.email = usuarios.email)"
+        )).rowcount
+    if vinculados:
+        print(f"🔄 {vinculados} usuário(s) vinculado(s) ao cadastro de paciente/médico")
+
+
 # ============================================================
 # Função: popular dados iniciais
 # ============================================================
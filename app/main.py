@@ -7,14 +7,13 @@ e executa as migrações de banco de dados no início da aplicação.
 
 🧩 Estrutura:
 - Inicialização da aplicação FastAPI.
-- Configuração dos diretórios de upload.
 - Registro de todos os endpoints da API.
 - Execução automática de migrações na inicialização.
 """
 
 from fastapi import FastAPI  # Importa o framework principal para criação da API
-from fastapi.staticfiles import StaticFiles  # Permite servir arquivos estáticos (imagens, PDFs, etc.)
-from contextlib import asynccontextmanager  # Gerencia o ciclo de vida assíncrono da aplicação
+from contextlib import asynccontextmanager, suppress  # Ciclo de vida assíncrono e cancelamento de tarefas
+import asyncio  # Tarefas agendadas em segundo plano
 import os  # Biblioteca padrão para manipulação de caminhos e arquivos
 
 # ----------------------------
@@ -33,9 +32,15 @@ from app.api.v1.auditoria import roteador as roteador_auditoria  # Roteador de a
 from app.api.v1.financeiro import roteador as roteador_financeiro  # Roteador do módulo financeiro
 from app.api.v1.relatorios import roteador as roteador_relatorios  # Roteador de relatórios e estatísticas
 from app.api.v1.backup import roteador as roteador_backup  # Roteador de backup do sistema
+from app.api.v1.eventos import roteador as roteador_eventos  # Roteador de eventos em tempo real (SSE)
 
 # Banco de dados e migrações
 from app.db.migrations import criar_tabelas, popular_dados  # Funções para criação e inicialização do banco
+from app.core.alertas import agendar_alertas  # Recálculo periódico dos alertas de suprimentos
+from app.core.armazenamento import agendar_coleta  # Coleta periódica de anexos sem referência
+from app.core.miniaturas import gerador_derivados  # Pool de geração de miniaturas
+from app.core.backup import agendar_backups  # Backups periódicos do banco
+from app.utils.respostas import RespostaJSON  # Serialização JSON com orjson
 
 
 # ----------------------------
@@ -69,8 +74,20 @@ async def ciclo_vida(app: FastAPI):
         traceback.print_exc()  # Mostra o stack trace completo
         raise  # Relança a exceção para interromper a inicialização
 
+    tarefas = [
+        asyncio.create_task(agendar_alertas()),  # Alertas de validade/estoque em segundo plano
+        asyncio.create_task(agendar_coleta()),  # Remoção de anexos sem referência
+        asyncio.create_task(agendar_backups()),  # Backups agendados com retenção GFS
+    ]
+
     yield  # Pausa e permite a execução da aplicação após as migrações
 
+    for tarefa in tarefas:  # Encerra as tarefas agendadas no desligamento
+        tarefa.cancel()
+        with suppress(asyncio.CancelledError):
+            await tarefa
+    gerador_derivados.encerrar()  # Encerra os processos de miniaturas
+
 
 # ----------------------------
 # Instanciação da aplicação FastAPI
@@ -79,16 +96,10 @@ app = FastAPI(
     title="SGHSS - Protótipo",  # Nome exibido na documentação
     description="🩺 API do Sistema de Gestão Hospitalar e Saúde Simplificada (SGHSS)",  # Descrição
     version="1.0",  # Versão da API
+    default_response_class=RespostaJSON,  # Respostas JSON renderizadas com orjson
     lifespan=ciclo_vida  # Vincula o ciclo de vida assíncrono
 )
 
-# ----------------------------
-# Configuração de arquivos estáticos
-# ----------------------------
-UPLOAD_DIR = os.path.join("app", "uploads")  # Define o diretório de uploads
-os.makedirs(UPLOAD_DIR, exist_ok=True)  # Cria o diretório se não existir
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")  # Monta o diretório como rota pública
-
 # ----------------------------
 # Registro de Roteadores (Endpoints da API)
 # ----------------------------
@@ -105,6 +116,7 @@ app.include_router(roteador_financeiro, prefix="/api/v1/financeiro", tags=["Fina
 app.include_router(roteador_relatorios, prefix="/api/v1/relatorios", tags=["Relatórios"])  # Relatórios do sistema
 app.include_router(roteador_auditoria, prefix="/api/v1/auditoria", tags=["Auditoria"])  # Auditoria do sistema
 app.include_router(roteador_backup, prefix="/api/v1/backup")  # Backup e restauração de dados
+app.include_router(roteador_eventos, prefix="/api/v1/eventos", tags=["Eventos"])  # Notificações em tempo real
 
 
 # ----------------------------
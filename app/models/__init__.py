@@ -24,14 +24,30 @@ from .medical import (
 # ----------------------------
 # Financeiro
 # ----------------------------
-from .financeiro import Financeiro  # Modelo de movimentações financeiras
+from .financeiro import Financeiro, SaldoFinanceiro  # Movimentações financeiras e saldo corrente
 
 # ----------------------------
 # Suprimentos
 # ----------------------------
-from .suprimento import Suprimento  # Modelo de suprimentos do sistema
+from .suprimento import (
+    Suprimento,  # Suprimentos hospitalares
+    MovimentoSuprimento,  # Livro de movimentações de estoque
+    TipoMovimentoSuprimento,  # Enum de tipo de movimento
+    AlertaSuprimento,  # Alertas materializados (validade e estoque)
+    TipoAlertaSuprimento,  # Enum de tipo de alerta
+)
 
 # ----------------------------
 # Leitos
 # ----------------------------
-from .leito import Leito  # Modelo de leitos hospitalares
+from .leito import Leito, StatusLeito, EventoLeito, TipoEventoLeito  # Leitos, status e histórico de eventos
+
+# ----------------------------
+# Anexos
+# ----------------------------
+from .anexo import Blob  # Conteúdos de anexos endereçados por hash
+
+# ----------------------------
+# Backups (catálogo em banco próprio)
+# ----------------------------
+from .backup import Backup, TipoBackup  # Backups completos e incrementais
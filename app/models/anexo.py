@@ -0,0 +1,28 @@
+# D:\ProjectSGHSS\app\models\anexo.py
+# Conteúdos armazenados (blobs) endereçados pelo SHA-256, com contagem de referências
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index  # Tipos de colunas SQLAlchemy
+from datetime import datetime  # Para default de timestamp
+from app.db import Base  # Base declarativa do projeto
+
+
+class Blob(Base):
+    """
+    Conteúdo único no armazenamento de anexos, identificado pelo SHA-256.
+
+    `referencias` conta os registros (prontuários) que apontam para o
+    conteúdo: anexos repetidos reutilizam o mesmo blob. Ao chegar a zero,
+    `sem_referencia_desde` marca o início do prazo de carência após o qual
+    a coleta de lixo remove o blob e o arquivo.
+    """
+    __tablename__ = "blobs"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_blobs_referencias_desde", "referencias", "sem_referencia_desde"),  # Candidatos à coleta
+    )
+
+    sha256 = Column(String(64), primary_key=True)  # Hash do conteúdo (hex), também a chave no backend
+    tamanho = Column(BigInteger, nullable=False)  # Bytes
+    tipo_conteudo = Column(String(100), nullable=True)  # MIME informado no primeiro envio
+    referencias = Column(Integer, nullable=False, default=0)  # Registros que usam o conteúdo
+    criado_em = Column(DateTime, nullable=False, default=datetime.now)  # Primeiro envio
+    sem_referencia_desde = Column(DateTime, nullable=True)  # Momento em que ficou sem referências
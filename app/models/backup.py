@@ -0,0 +1,48 @@
+# D:\ProjectSGHSS\app\models\backup.py
+# Catálogo de backups: completos e incrementais, encadeados pelo backup de origem
+
+from sqlalchemy import Column, Integer, BigInteger, Float, String, DateTime, ForeignKey, Enum, Index  # Tipos de colunas
+from datetime import datetime  # Para default de timestamp
+from app.db.catalogo import BaseCatalogo  # Base do catálogo (banco próprio)
+import enum  # Para definir enums
+
+
+# =============================================================
+# Enum TipoBackup
+# =============================================================
+class TipoBackup(str, enum.Enum):
+    """Enum para o tipo de backup"""
+    COMPLETO = "COMPLETO"  # Cópia integral do banco (base de uma cadeia)
+    INCREMENTAL = "INCREMENTAL"  # Apenas as páginas alteradas desde o backup de origem
+
+
+# =============================================================
+# Modelo Backup
+# =============================================================
+class Backup(BaseCatalogo):
+    """
+    Backup registrado no catálogo.
+
+    Um backup incremental guarda as páginas do banco que mudaram desde
+    `origem_id` (completo ou outro incremental); `base_id` aponta para o
+    completo que inicia a cadeia. Restaurar um incremental aplica, sobre
+    o completo, os incrementais da cadeia até ele, em ordem.
+    """
+    __tablename__ = "backups"  # Nome da tabela no catálogo
+    __table_args__ = (
+        Index("ix_backups_criado_em", "criado_em"),  # Restauração por momento
+    )
+
+    id = Column(Integer, primary_key=True, index=True)  # ID do backup
+    tipo = Column(Enum(TipoBackup, native_enum=False, length=20), nullable=False)  # Completo ou incremental
+    origem_id = Column(Integer, ForeignKey("backups.id"), nullable=True)  # Backup sobre o qual o incremental foi gerado
+    base_id = Column(Integer, ForeignKey("backups.id"), nullable=True, index=True)  # Completo que inicia a cadeia
+    arquivo = Column(String(255), nullable=False, unique=True)  # Nome do arquivo em DIRETORIO_BACKUPS
+    codec = Column(String(10), nullable=False, default="gzip")  # Compressão do arquivo (gzip, zstd, nenhum)
+    criado_em = Column(DateTime, nullable=False, default=datetime.now)  # Momento do instantâneo do banco
+    tamanho_pagina = Column(Integer, nullable=False)  # Tamanho de página do banco
+    total_paginas = Column(Integer, nullable=False)  # Páginas do banco no instantâneo
+    paginas_gravadas = Column(Integer, nullable=False)  # Páginas contidas no arquivo
+    tamanho = Column(BigInteger, nullable=False)  # Bytes do arquivo
+    sha256 = Column(String(64), nullable=False)  # Checksum do arquivo
+    duracao = Column(Float, nullable=True)  # Segundos para gerar o backup
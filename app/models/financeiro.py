@@ -1,7 +1,8 @@
 # Modelo ORM para registros financeiros
 
-from sqlalchemy import Column, Integer, String, Float, DateTime  # Tipos de coluna do SQLAlchemy
+from sqlalchemy import Column, Integer, String, DateTime, Index  # Tipos de coluna e índices do SQLAlchemy
 from datetime import datetime  # Para default de timestamp
+from decimal import Decimal  # Representação exata de valores monetários
 from app.db.session import Base  # Base declarativa para modelos
 
 
@@ -13,20 +14,53 @@ class Financeiro(Base):
     Modelo Financeiro:
     - tipo: ENTRADA ou SAIDA
     - descricao: descrição da movimentação financeira
-    - valor: valor da entrada ou saída
+    - valor_centavos: valor da entrada ou saída em centavos (inteiro, exato)
     - data: timestamp da operação
+    - hash_importacao: chave de deduplicação de movimentações importadas
     """
     __tablename__ = "financeiro"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_financeiro_tipo_data", "tipo", "data", "id"),  # Filtro por tipo + faixa de datas
+        Index("ix_financeiro_data_id", "data", "id"),  # Paginação por (data, id) sem filtro de tipo
+        Index("ix_financeiro_hash_importacao", "hash_importacao", unique=True),  # Deduplicação de importações
+    )
 
     id = Column(Integer, primary_key=True, index=True)  # PK auto-increment
     tipo = Column(String, nullable=False)  # Tipo da movimentação: ENTRADA ou SAIDA
     descricao = Column(String, nullable=False)  # Descrição textual da movimentação
-    valor = Column(Float, nullable=False)  # Valor monetário da movimentação
+    valor_centavos = Column(Integer, nullable=False)  # Valor monetário em centavos
     data = Column(DateTime, default=datetime.now)  # Timestamp da operação
+    hash_importacao = Column(String(64), nullable=True)  # Hash da linha importada (CSV/OFX), se houver
 
     # =========================================================
-    # Propriedade compatível com Pydantic para retorno
+    # Propriedades compatíveis com Pydantic para retorno
     # =========================================================
+    @property
+    def valor(self) -> Decimal:
+        return Decimal(self.valor_centavos).scaleb(-2)  # Centavos -> reais, sem erro de ponto flutuante
+
     @property
     def data_registro(self):
         return self.data
+
+
+# =============================================================
+# Classe SaldoFinanceiro
+# =============================================================
+class SaldoFinanceiro(Base):
+    """
+    Saldo corrente do livro financeiro (linha única, id = 1):
+    - entradas_centavos / saidas_centavos: somatórios acumulados por tipo
+    - quantidade: número de movimentações registradas
+    - atualizado_em: momento da última atualização
+
+    Atualizado a cada `registrar_movimento`, permitindo que o resumo
+    geral seja lido sem percorrer a tabela `financeiro`.
+    """
+    __tablename__ = "financeiro_saldo"  # Nome da tabela no banco
+
+    id = Column(Integer, primary_key=True)  # Sempre 1 (linha única)
+    entradas_centavos = Column(Integer, nullable=False, default=0)  # Soma das ENTRADAS (centavos)
+    saidas_centavos = Column(Integer, nullable=False, default=0)  # Soma das SAIDAS (centavos)
+    quantidade = Column(Integer, nullable=False, default=0)  # Total de movimentações
+    atualizado_em = Column(DateTime, default=datetime.now)  # Última atualização
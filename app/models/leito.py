@@ -1,8 +1,41 @@
 # Modelo ORM para leitos hospitalares
 
-from sqlalchemy import Column, Integer, String, ForeignKey  # Tipos de coluna e FK
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, text  # Tipos de coluna, FK e índices
 from sqlalchemy.orm import relationship  # Para relacionamento ORM
+from datetime import datetime  # Para default de timestamp
 from app.db import Base  # Base declarativa para modelos
+import enum  # Para definir enums
+import unicodedata  # Remoção de acentos na normalização de status
+
+
+# =============================================================
+# Enum StatusLeito
+# =============================================================
+class StatusLeito(str, enum.Enum):
+    """Enum para status de um leito hospitalar"""
+    LIVRE = "LIVRE"
+    OCUPADO = "OCUPADO"
+    MANUTENCAO = "MANUTENCAO"
+
+    @classmethod
+    def normalizar(cls, texto: str) -> "StatusLeito":
+        """
+        Converte textos livres ("Livre", "ocupado", "Manutenção"...) no enum.
+        Lança ValueError se o texto não corresponder a nenhum status.
+        """
+        sem_acentos = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode("ascii")
+        chave = " ".join(sem_acentos.upper().split())
+        sinonimos = {
+            "DISPONIVEL": cls.LIVRE,
+            "EM MANUTENCAO": cls.MANUTENCAO,
+            "BLOQUEADO": cls.MANUTENCAO,
+        }
+        if chave in sinonimos:
+            return sinonimos[chave]
+        try:
+            return cls(chave)
+        except ValueError:
+            raise ValueError(f"Status de leito inválido: {texto}")
 
 
 # =============================================================
@@ -11,14 +44,79 @@ from app.db import Base  # Base declarativa para modelos
 class Leito(Base):
     """
     Modelo de banco de dados que representa um leito hospitalar.
-    Contém informações de número, status e paciente associado.
+    Contém informações de número, ala, tipo, status e paciente associado.
     """
     __tablename__ = "leitos"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_leitos_ala_status", "ala", "status"),  # Leitos livres por ala
+        Index("ix_leitos_status_tipo", "status", "tipo"),  # Leitos livres por tipo
+        Index("ix_leitos_paciente_status", "paciente_id", "status"),  # Leito atual de um paciente
+        Index(  # Um paciente ocupa no máximo um leito
+            "ux_leitos_paciente", "paciente_id", unique=True,
+            sqlite_where=text("paciente_id IS NOT NULL"), postgresql_where=text("paciente_id IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)  # PK auto-increment
     numero = Column(String(50), nullable=False)  # Número ou identificador do leito
-    status = Column(String(50), nullable=False)  # Status do leito (ex.: LIVRE, OCUPADO)
+    ala = Column(String(50), nullable=True)  # Ala/setor do leito (ex.: UTI, Pediatria)
+    tipo = Column(String(50), nullable=True)  # Tipo do leito (ex.: UTI, ENFERMARIA, ISOLAMENTO)
+    status = Column(
+        Enum(StatusLeito, native_enum=False, length=50),
+        nullable=False,
+        default=StatusLeito.LIVRE,
+        index=True
+    )  # Status normalizado do leito (LIVRE, OCUPADO, MANUTENCAO)
     paciente_id = Column(Integer, ForeignKey("pacientes.id"), nullable=True)  # FK opcional para paciente
 
     # Relacionamento ORM opcional com o paciente
     paciente = relationship("Paciente", back_populates="leitos")
+
+
+# =============================================================
+# Enum TipoEventoLeito
+# =============================================================
+class TipoEventoLeito(str, enum.Enum):
+    """Enum para os eventos do histórico de um leito"""
+    CADASTRO = "CADASTRO"  # Leito passou a existir
+    ADMISSAO = "ADMISSAO"  # Paciente ocupou o leito
+    TRANSFERENCIA = "TRANSFERENCIA"  # Paciente mudou de leito (um evento por leito envolvido)
+    ALTA = "ALTA"  # Paciente deixou o leito
+    MANUTENCAO = "MANUTENCAO"  # Leito retirado de uso
+    DISPONIVEL = "DISPONIVEL"  # Leito voltou ao uso após manutenção
+    ALTERACAO = "ALTERACAO"  # Mudança de ala ou de paciente sem mudar o status
+    EXCLUSAO = "EXCLUSAO"  # Leito deixou de existir
+
+
+# =============================================================
+# Classe EventoLeito
+# =============================================================
+class EventoLeito(Base):
+    """
+    Histórico append-only de transições de estado dos leitos.
+
+    Cada evento registra a situação anterior (ala_anterior, status_anterior)
+    e a nova (ala, status_novo) de um leito; o censo de ocupação em
+    qualquer instante é a soma dessas transições até ele. Os eventos não
+    têm FK para `leitos`, para sobreviverem à exclusão do leito.
+    """
+    __tablename__ = "eventos_leito"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_eventos_leito_data_id", "data_hora", "id"),  # Varredura ordenada por período
+        Index("ix_eventos_leito_ala_data", "ala", "data_hora"),  # Censo filtrado por ala (destino)
+        Index("ix_eventos_leito_ala_anterior_data", "ala_anterior", "data_hora"),  # Censo filtrado por ala (origem)
+        Index("ix_eventos_leito_leito_data", "leito_id", "data_hora"),  # Histórico de um leito
+        Index("ix_eventos_leito_paciente_data", "paciente_id", "data_hora"),  # Linha do tempo do paciente
+    )
+
+    id = Column(Integer, primary_key=True, index=True)  # PK auto-increment
+    leito_id = Column(Integer, nullable=False)  # Leito afetado
+    tipo = Column(Enum(TipoEventoLeito, native_enum=False, length=20), nullable=False)  # Tipo do evento
+    ala_anterior = Column(String(50), nullable=True)  # Ala antes do evento
+    status_anterior = Column(Enum(StatusLeito, native_enum=False, length=50), nullable=True)  # None = inexistente
+    ala = Column(String(50), nullable=True)  # Ala após o evento
+    status_novo = Column(Enum(StatusLeito, native_enum=False, length=50), nullable=True)  # None = excluído
+    paciente_id = Column(Integer, nullable=True)  # Paciente envolvido, se houver
+    leito_relacionado_id = Column(Integer, nullable=True)  # Outro leito da transferência
+    usuario_email = Column(String, nullable=True)  # Usuário que originou o evento
+    data_hora = Column(DateTime, nullable=False, default=datetime.utcnow)  # Momento do evento (UTC)
@@ -3,7 +3,7 @@
 # Inclui enums para status e papéis
 
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Date, Text, ForeignKey, Enum
+    Column, Integer, String, Boolean, DateTime, Date, Text, ForeignKey, Enum, Index
 )  # Colunas e tipos
 from sqlalchemy.orm import relationship  # Para relacionamentos ORM
 from datetime import datetime  # Datas e timestamps
@@ -55,6 +55,10 @@ class Usuario(Base):
     ativo = Column(Boolean, default=True)
     criado_em = Column(DateTime, default=datetime.utcnow)
 
+    # Cadastro do próprio usuário (define o escopo das listagens de PACIENTE/MEDICO)
+    paciente_id = Column(Integer, ForeignKey("pacientes.id"), nullable=True, index=True)
+    medico_id = Column(Integer, ForeignKey("medicos.id"), nullable=True, index=True)
+
     # Relacionamento com logs de auditoria
     logs_auditoria = relationship("LogAuditoria", back_populates="usuario")
 
@@ -112,6 +116,13 @@ class Consulta(Base):
     Inclui data/hora, duração, status e observações.
     """
     __tablename__ = "consultas"
+    __table_args__ = (
+        Index("ix_consultas_paciente_data", "paciente_id", "data_hora"),  # Histórico de um paciente
+        Index("ix_consultas_medico_data", "medico_id", "data_hora"),  # Agenda/histórico de um médico
+        Index("ix_consultas_status_data", "status", "data_hora"),  # Filtro por status
+        Index("ix_consultas_data", "data_hora"),  # Listagem geral, mais recentes primeiro
+        Index("ix_consultas_medico_paciente", "medico_id", "paciente_id"),  # Pacientes atendidos por um médico
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     paciente_id = Column(Integer, ForeignKey("pacientes.id"), nullable=False)
@@ -135,12 +146,18 @@ class Prontuario(Base):
     Pode conter descrições, anexos e status.
     """
     __tablename__ = "prontuarios"
+    __table_args__ = (
+        Index("ix_prontuarios_paciente_data", "paciente_id", "data_hora"),  # Histórico de um paciente
+        Index("ix_prontuarios_medico_data", "medico_id", "data_hora"),  # Registros de um médico
+        Index("ix_prontuarios_status_data", "status", "data_hora"),  # Filtro por status no período
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     paciente_id = Column(Integer, ForeignKey("pacientes.id"), nullable=False)
     medico_id = Column(Integer, ForeignKey("medicos.id"), nullable=True)
     descricao = Column(Text, nullable=False)
-    anexo = Column(String(255), nullable=True)  # Arquivo opcional
+    anexo = Column(String(255), nullable=True)  # Nome original do arquivo anexo (opcional)
+    anexo_sha256 = Column(String(64), nullable=True, index=True)  # Conteúdo do anexo no armazenamento (blobs)
     data_hora = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="ATIVO")
 
@@ -155,6 +172,10 @@ class Receita(Base):
     Contém medicamento, dosagem, instruções e status.
     """
     __tablename__ = "prescricoes"
+    __table_args__ = (
+        Index("ix_prescricoes_paciente_data", "paciente_id", "data_hora"),  # Histórico de um paciente
+        Index("ix_prescricoes_medico_data", "medico_id", "data_hora"),  # Prescrições emitidas por um médico
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     paciente_id = Column(Integer, ForeignKey("pacientes.id"), nullable=False)
@@ -178,6 +199,9 @@ class Teleconsulta(Base):
     Relacionada à consulta principal.
     """
     __tablename__ = "teleconsultas"
+    __table_args__ = (
+        Index("ix_teleconsultas_consulta_data", "consulta_id", "data_hora"),  # Teleconsultas de um paciente (via consulta)
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     consulta_id = Column(Integer, ForeignKey("consultas.id"), nullable=False)
@@ -1,19 +1,108 @@
 # D:\ProjectSGHSS\app\models\suprimento.py
 # Modelo de suprimentos hospitalares
 
-from sqlalchemy import Column, Integer, String, Date  # Tipos de colunas SQLAlchemy
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Index  # Tipos de colunas SQLAlchemy
+from datetime import datetime  # Para default de timestamp
 from app.db import Base  # Base declarativa do projeto
+import enum  # Para definir enums
 
 
 class Suprimento(Base):
     """
     Representa um suprimento hospitalar.
-    Armazena nome, quantidade em estoque, data de validade e descrição opcional.
+    Armazena nome, quantidade em estoque, nível de reposição, data de validade e descrição opcional.
     """
     __tablename__ = "suprimentos"
+    __table_args__ = (
+        Index("ix_suprimentos_validade_id", "data_validade", "id"),  # Vencidos / a vencer, paginado
+        Index("ix_suprimentos_quantidade", "quantidade"),  # Faixas de estoque
+    )
 
     id = Column(Integer, primary_key=True, index=True)  # ID único do suprimento
     nome = Column(String(150), nullable=False)  # Nome do item
     quantidade = Column(Integer, nullable=False)  # Quantidade disponível
+    nivel_reposicao = Column(Integer, nullable=False, default=0, server_default="0")  # Estoque mínimo desejado
     data_validade = Column(Date, nullable=True)  # Data de validade (opcional)
     descricao = Column(String(255), nullable=True)  # Descrição adicional (opcional)
+
+
+# Estoque baixo é `quantidade <= nivel_reposicao`; o índice sobre a diferença
+# permite buscar e ordenar por essa folga sem varrer a tabela
+Index(
+    "ix_suprimentos_folga_reposicao",
+    Suprimento.quantidade - Suprimento.nivel_reposicao,
+    Suprimento.id
+)
+
+
+# =============================================================
+# Enum TipoMovimentoSuprimento
+# =============================================================
+class TipoMovimentoSuprimento(str, enum.Enum):
+    """Enum para os tipos de movimentação de estoque"""
+    ENTRADA = "ENTRADA"  # Recebimento (delta positivo)
+    SAIDA = "SAIDA"  # Dispensação/consumo (delta negativo)
+    AJUSTE = "AJUSTE"  # Correção de inventário (delta com sinal)
+
+
+# =============================================================
+# Classe MovimentoSuprimento
+# =============================================================
+class MovimentoSuprimento(Base):
+    """
+    Livro de movimentações de estoque (append-only).
+
+    Cada linha registra o delta aplicado à quantidade de um suprimento e o
+    saldo resultante; a soma dos deltas de um item é a sua quantidade
+    atual. Movimentos de uma mesma dispensação em lote compartilham `lote`.
+    Sem FK para `suprimentos`, para o histórico sobreviver à exclusão do item.
+    """
+    __tablename__ = "movimentos_suprimento"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_movimentos_suprimento_item_data", "suprimento_id", "data_hora", "id"),  # Extrato por item
+        Index("ix_movimentos_suprimento_lote", "lote"),  # Itens de uma dispensação
+    )
+
+    id = Column(Integer, primary_key=True, index=True)  # PK auto-increment
+    suprimento_id = Column(Integer, nullable=False)  # Suprimento movimentado
+    tipo = Column(Enum(TipoMovimentoSuprimento, native_enum=False, length=20), nullable=False)  # Tipo
+    quantidade = Column(Integer, nullable=False)  # Delta aplicado (positivo entra, negativo sai)
+    saldo_resultante = Column(Integer, nullable=False)  # Quantidade do item após o movimento
+    motivo = Column(String(255), nullable=True)  # Justificativa/observação
+    lote = Column(String(32), nullable=True)  # Identificador da dispensação em lote
+    usuario_email = Column(String, nullable=True)  # Usuário que registrou o movimento
+    data_hora = Column(DateTime, nullable=False, default=datetime.now)  # Momento do movimento
+
+
+# =============================================================
+# Enum TipoAlertaSuprimento
+# =============================================================
+class TipoAlertaSuprimento(str, enum.Enum):
+    """Enum para os tipos de alerta de suprimento"""
+    VENCIDO = "VENCIDO"  # Validade já passou
+    VENCENDO = "VENCENDO"  # Vence dentro do prazo de aviso
+    ESTOQUE_BAIXO = "ESTOQUE_BAIXO"  # Quantidade no nível de reposição ou abaixo
+
+
+# =============================================================
+# Classe AlertaSuprimento
+# =============================================================
+class AlertaSuprimento(Base):
+    """
+    Lista materializada de alertas de suprimentos (vencidos, a vencer e
+    estoque baixo), recalculada periodicamente por uma tarefa agendada
+    para que os painéis leiam apenas os itens em alerta.
+    """
+    __tablename__ = "alertas_suprimento"  # Nome da tabela no banco
+    __table_args__ = (
+        Index("ix_alertas_suprimento_tipo", "tipo", "data_validade", "suprimento_id"),  # Filtro por tipo
+    )
+
+    id = Column(Integer, primary_key=True, index=True)  # PK auto-increment
+    suprimento_id = Column(Integer, nullable=False)  # Suprimento em alerta
+    tipo = Column(Enum(TipoAlertaSuprimento, native_enum=False, length=20), nullable=False)  # Tipo do alerta
+    nome = Column(String(150), nullable=False)  # Nome do item no momento do cálculo
+    quantidade = Column(Integer, nullable=False)  # Quantidade no momento do cálculo
+    nivel_reposicao = Column(Integer, nullable=False)  # Nível de reposição no momento do cálculo
+    data_validade = Column(Date, nullable=True)  # Validade do item
+    gerado_em = Column(DateTime, nullable=False, default=datetime.now)  # Momento do cálculo
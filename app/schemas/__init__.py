@@ -68,5 +68,10 @@ from .leito import (
 from .financeiro import (
     FinanceiroBase,  # Schema base de movimentação financeira
     FinanceiroResponse,  # Schema de retorno financeiro
+    PaginaFinanceiroResponse,  # Página de movimentações com cursor
     ResumoFinanceiroResponse,  # Schema resumido de financeiro
+    ItemResumoFinanceiro,  # Item de detalhamento do resumo financeiro
+    FechamentoFinanceiroResponse,  # Fechamento mensal do livro caixa
+    ImportacaoFinanceiraResponse,  # Resultado da importação em lote
+    ItemFechamentoFinanceiro,  # Movimento diário do fechamento
 )
@@ -0,0 +1,32 @@
+from pydantic import BaseModel  # BaseModel para schemas
+from datetime import datetime  # Momento do backup
+from typing import List, Optional  # Listas e campos opcionais
+
+from app.models.backup import TipoBackup  # Enum de tipo de backup
+
+
+# ----------------------------
+# Schema de resposta do catálogo
+# ----------------------------
+class BackupResponse(BaseModel):
+    id: int  # ID do backup
+    tipo: TipoBackup  # COMPLETO ou INCREMENTAL
+    origem_id: Optional[int] = None  # Backup sobre o qual o incremental foi gerado
+    base_id: Optional[int] = None  # Completo que inicia a cadeia
+    arquivo: str  # Nome do arquivo
+    codec: str  # gzip, zstd ou nenhum
+    criado_em: datetime  # Momento do instantâneo
+    total_paginas: int  # Páginas do banco
+    paginas_gravadas: int  # Páginas no arquivo
+    tamanho: int  # Bytes do arquivo
+    sha256: str  # Checksum do arquivo
+    duracao: Optional[float] = None  # Segundos para gerar
+
+    class Config:
+        from_attributes = True  # Compatível com objetos ORM
+
+
+class CatalogoBackups(BaseModel):
+    items: List[BackupResponse]  # Do mais recente para o mais antigo
+    quantidade: int  # Backups no catálogo
+    tamanho_total: int  # Bytes ocupados por todos os backups
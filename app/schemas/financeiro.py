@@ -1,5 +1,7 @@
 from pydantic import BaseModel, validator  # BaseModel para schemas e validator para validações personalizadas
 from datetime import datetime  # datetime para datas
+from decimal import Decimal, InvalidOperation  # Valores monetários exatos (serializados como texto)
+from typing import List, Optional  # Tipagens para campos opcionais e listas
 
 
 # ----------------------------
@@ -8,12 +10,12 @@ from datetime import datetime  # datetime para datas
 class FinanceiroBase(BaseModel):
     tipo: str  # Tipo da movimentação: ENTRADA ou SAIDA
     descricao: str  # Descrição da movimentação
-    valor: float  # Valor da movimentação
+    valor: Decimal  # Valor da movimentação (JSON: texto com 2 casas, ex.: "2500.48")
 
     @validator("valor", pre=True)
     def converter_valor(cls, v):
         """
-        🔢 Converte valores com vírgula (ex: '2500,48') para float (2500.48)
+        🔢 Converte valores com vírgula (ex: '2500,48') para Decimal (2500.48)
         e valida se o valor é numérico.
         """
         if v is None or v == "":
@@ -21,9 +23,12 @@ class FinanceiroBase(BaseModel):
         if isinstance(v, str):
             v = v.replace(",", ".")  # substitui vírgula por ponto
         try:
-            return float(v)
-        except ValueError:
+            valor = Decimal(str(v))  # str() evita herdar o erro binário de floats
+        except InvalidOperation:
             raise ValueError("O campo 'valor' deve ser um número válido.")
+        if not valor.is_finite():
+            raise ValueError("O campo 'valor' deve ser um número válido.")
+        return valor
 
 
 # ----------------------------
@@ -31,19 +36,77 @@ class FinanceiroBase(BaseModel):
 # ----------------------------
 class FinanceiroResponse(FinanceiroBase):
     id: int  # ID da movimentação
-    data_registro: datetime  # Data/hora da movimentação no modelo SQLAlchemy
+    data_registro: Optional[datetime] = None  # Data/hora da movimentação (ausente em registros antigos)
 
     class Config:
         from_attributes = True  # Compatível com Pydantic v2, substitui orm_mode
 
 
+# ----------------------------
+# Página de movimentações (paginação por cursor)
+# ----------------------------
+class PaginaFinanceiroResponse(BaseModel):
+    items: List[FinanceiroResponse]  # Movimentações da página, da mais recente para a mais antiga
+    proximo_cursor: Optional[str] = None  # Cursor da próxima página (None na última)
+    total: Optional[int] = None  # Total de movimentações do filtro, quando solicitado
+
+
+# ----------------------------
+# Item de detalhamento do resumo (por período ou categoria)
+# ----------------------------
+class ItemResumoFinanceiro(BaseModel):
+    chave: str  # Período (dia, semana, mês) ou categoria (descrição)
+    total_entradas: Decimal  # Soma das entradas do grupo
+    total_saidas: Decimal  # Soma das saídas do grupo
+    saldo: Decimal  # Entradas - saídas do grupo
+
+
 # ----------------------------
 # Resumo financeiro (entradas, saídas e saldo)
 # ----------------------------
 class ResumoFinanceiroResponse(BaseModel):
-    total_entradas: float  # Soma das entradas
-    total_saidas: float  # Soma das saídas
-    saldo: float  # Saldo atual
+    total_entradas: Decimal  # Soma das entradas
+    total_saidas: Decimal  # Soma das saídas
+    saldo: Decimal  # Saldo atual
+    quantidade_movimentos: int = 0  # Número de movimentações consideradas
+    agrupado_por: Optional[str] = None  # Dimensão do detalhamento (dia, semana, mes, categoria)
+    detalhamento: Optional[List[ItemResumoFinanceiro]] = None  # Totais por grupo, quando solicitado
 
     class Config:
         from_attributes = True  # Compatível com objetos ORM
+
+
+# ----------------------------
+# Movimento diário do fechamento
+# ----------------------------
+class ItemFechamentoFinanceiro(BaseModel):
+    dia: str  # Dia (AAAA-MM-DD)
+    total_entradas: Decimal  # Entradas do dia
+    total_saidas: Decimal  # Saídas do dia
+    saldo: Decimal  # Saldo acumulado ao fim do dia
+
+
+# ----------------------------
+# Fechamento mensal
+# ----------------------------
+class FechamentoFinanceiroResponse(BaseModel):
+    periodo: str  # Mês de referência (AAAA-MM)
+    saldo_inicial: Decimal  # Saldo acumulado antes do período
+    total_entradas: Decimal  # Soma das entradas do período
+    total_saidas: Decimal  # Soma das saídas do período
+    saldo_final: Decimal  # Saldo ao fim do período
+    quantidade_movimentos: int  # Número de movimentações do período
+    diario: List[ItemFechamentoFinanceiro]  # Movimento por dia com saldo corrente
+
+
+# ----------------------------
+# Resultado da importação em lote
+# ----------------------------
+class ImportacaoFinanceiraResponse(BaseModel):
+    formato: str  # csv ou ofx
+    importados: int  # Movimentações inseridas
+    duplicados: int  # Linhas ignoradas por já existirem (hash)
+    invalidos: int  # Linhas rejeitadas na validação
+    total_entradas: Decimal  # Soma das entradas importadas
+    total_saidas: Decimal  # Soma das saídas importadas
+    erros: List[str] = []  # Primeiras mensagens de erro (linha: motivo)
@@ -11,7 +11,8 @@ class LeitoBase(BaseModel):
     Contém apenas os campos essenciais que podem ser enviados via API.
     """
     numero: str  # Número do leito (obrigatório)
-    status: str  # Status do leito (ex: LIVRE, OCUPADO)
+    status: str  # Status do leito (LIVRE, OCUPADO, MANUTENCAO)
+    ala: Optional[str] = None  # Ala/setor do leito (opcional)
     paciente_id: Optional[int] = None  # ID do paciente associado (opcional)
 
 
@@ -26,6 +27,7 @@ class LeitoResponse(BaseModel):
     id: int  # ID único do leito
     numero: str  # Número do leito
     status: str  # Status do leito
+    ala: Optional[str] = None  # Ala/setor do leito (opcional)
     paciente_id: Optional[int] = None  # ID do paciente associado (opcional)
 
     # Futuramente, pode incluir campos de data, ex:
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr  # BaseModel para schemas, EmailStr valida emails
 from datetime import date, datetime  # date para nascimento, datetime para registros
-from typing import Optional  # Para campos que podem ser None
+from typing import List, Optional  # Listas e campos que podem ser None
 
 
 # ----------------------------
@@ -42,3 +42,32 @@ class PacienteResponse(PacienteBase):
 
     class Config:
         from_attributes = True  # Compatível com ORM (Pydantic v2)
+
+
+# ----------------------------
+# Resultado de busca de pacientes
+# ----------------------------
+class ResultadoBuscaPacientes(BaseModel):
+    items: List[PacienteResponse]  # Pacientes em ordem de relevância
+    pagina: int  # Página retornada
+    proxima_pagina: Optional[int] = None  # None quando não há mais resultados
+
+
+# ----------------------------
+# Item da linha do tempo do paciente
+# ----------------------------
+class ItemLinhaDoTempo(BaseModel):
+    tipo: str  # consulta, teleconsulta, prontuario, prescricao ou leito
+    id: int  # ID do registro na tabela de origem
+    data_hora: datetime  # Momento do registro
+    status: Optional[str] = None  # Status do registro (ou tipo do evento de leito)
+    medico_id: Optional[int] = None  # Médico responsável, quando houver
+    resumo: Optional[str] = None  # Descrição curta do registro
+
+
+# ----------------------------
+# Página da linha do tempo do paciente
+# ----------------------------
+class LinhaDoTempoResponse(BaseModel):
+    items: List[ItemLinhaDoTempo]  # Do mais recente para o mais antigo
+    proximo_cursor: Optional[str] = None  # None quando não há mais páginas
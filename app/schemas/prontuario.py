@@ -1,6 +1,6 @@
 from pydantic import BaseModel  # BaseModel para validação e estruturação de dados
 from datetime import datetime  # Para campos de data/hora
-from typing import Optional  # Permite campos opcionais
+from typing import List, Optional  # Listas e campos opcionais
 
 
 # ----------------------------
@@ -25,7 +25,30 @@ class ProntuarioMedicoCreate(ProntuarioMedicoBase):
 class ProntuarioMedicoResponse(ProntuarioMedicoBase):
     id: int  # ID único do prontuário no banco
     data_hora: datetime  # Data/hora de criação do prontuário
-    anexo: Optional[str] = None  # Campo opcional para anexos ou links de arquivo
+    anexo: Optional[str] = None  # Nome original do arquivo anexo, se houver
+    anexo_sha256: Optional[str] = None  # Identificador (SHA-256) do conteúdo do anexo
 
     class Config:
         from_attributes = True  # Compatível com objetos ORM (Pydantic v2)
+
+
+# ----------------------------
+# Trecho de prontuário retornado pela busca
+# ----------------------------
+class ProntuarioTrecho(BaseModel):
+    id: int  # ID do prontuário
+    paciente_id: int  # Paciente vinculado
+    medico_id: Optional[int] = None  # Médico responsável
+    data_hora: Optional[datetime] = None  # Data/hora do registro
+    status: Optional[str] = None  # Status do prontuário
+    tem_anexo: bool = False  # Indica se há arquivo anexo
+    trecho: str  # Parte da descrição com os termos destacados entre « »
+
+
+# ----------------------------
+# Resultado de busca de prontuários
+# ----------------------------
+class ResultadoBuscaProntuarios(BaseModel):
+    items: List[ProntuarioTrecho]  # Trechos em ordem de relevância (ou do mais recente, sem termos)
+    pagina: int  # Página retornada
+    proxima_pagina: Optional[int] = None  # None quando não há mais resultados
@@ -1,7 +1,7 @@
 # D:\ProjectSGHSS\app\schemas\suprimento.py
-from pydantic import BaseModel, validator  # BaseModel para schemas, validator para validação de campos
+from pydantic import BaseModel, Field, validator  # BaseModel para schemas, Field/validator para validação de campos
 from datetime import date, datetime  # date para datas, datetime para parsing de string
-from typing import Optional  # Campos opcionais
+from typing import List, Optional  # Listas e campos opcionais
 
 
 # ----------------------------
@@ -14,6 +14,7 @@ class SuprimentoBase(BaseModel):
     """
     nome: str  # Nome do suprimento, obrigatório
     quantidade: int  # Quantidade em estoque, obrigatório
+    nivel_reposicao: int = 0  # Estoque mínimo antes de alertar reposição
     data_validade: Optional[date] = None  # Data de validade, opcional
     descricao: Optional[str] = None  # Descrição adicional, opcional
 
@@ -44,3 +45,101 @@ class SuprimentoResponse(SuprimentoBase):
 
     class Config:
         from_attributes = True  # Compatível com objetos ORM (Pydantic v2)
+
+
+# ----------------------------
+# Schema de movimento de estoque
+# ----------------------------
+class MovimentoSuprimentoResponse(BaseModel):
+    """
+    Linha do livro de movimentações de um suprimento.
+    `quantidade` é o delta aplicado (negativo para saídas).
+    """
+    id: int
+    suprimento_id: int
+    tipo: str  # ENTRADA, SAIDA ou AJUSTE
+    quantidade: int
+    saldo_resultante: int
+    motivo: Optional[str] = None
+    lote: Optional[str] = None
+    usuario_email: Optional[str] = None
+    data_hora: datetime
+
+    class Config:
+        from_attributes = True  # Compatível com objetos ORM (Pydantic v2)
+
+
+class PaginaMovimentosResponse(BaseModel):
+    """
+    Página do extrato de movimentações, da mais recente para a mais antiga.
+    """
+    items: List[MovimentoSuprimentoResponse]
+    proximo_cursor: Optional[str] = None  # None quando não há mais páginas
+
+
+# ----------------------------
+# Schemas de dispensação em lote
+# ----------------------------
+class ItemDispensacao(BaseModel):
+    """Item de uma dispensação: suprimento e quantidade a retirar."""
+    suprimento_id: int
+    quantidade: int = Field(..., gt=0)
+
+
+class DispensacaoRequest(BaseModel):
+    """
+    Dispensação de vários itens em uma única transação (tudo ou nada).
+    """
+    itens: List[ItemDispensacao] = Field(..., min_length=1, max_length=500)
+    motivo: Optional[str] = None  # Ex.: prescrição, setor solicitante
+
+
+class DispensacaoResponse(BaseModel):
+    """
+    Resultado da dispensação: identificador do lote e saldos resultantes.
+    """
+    lote: str
+    movimentos: List[MovimentoSuprimentoResponse]
+
+
+# ----------------------------
+# Schemas de consultas de validade/estoque e alertas
+# ----------------------------
+class PaginaSuprimentosResponse(BaseModel):
+    """
+    Página de suprimentos filtrados (a vencer, vencidos, estoque baixo).
+    """
+    items: List[SuprimentoResponse]
+    proximo_cursor: Optional[str] = None  # None quando não há mais páginas
+
+
+class AlertaSuprimentoResponse(BaseModel):
+    """
+    Alerta materializado de um suprimento.
+    """
+    suprimento_id: int
+    tipo: str  # VENCIDO, VENCENDO ou ESTOQUE_BAIXO
+    nome: str
+    quantidade: int
+    nivel_reposicao: int
+    data_validade: Optional[date] = None
+
+    class Config:
+        from_attributes = True  # Compatível com objetos ORM (Pydantic v2)
+
+
+class AlertasSuprimentoResponse(BaseModel):
+    """
+    Lista de alertas e o momento em que foi calculada.
+    """
+    gerado_em: Optional[datetime] = None  # None se não há alertas (ou ainda não houve cálculo)
+    items: List[AlertaSuprimentoResponse]
+
+
+class ResultadoBuscaSuprimentos(BaseModel):
+    """
+    Página de resultados da busca textual, em ordem de relevância.
+    """
+    items: List[SuprimentoResponse]
+    pagina: int
+    proxima_pagina: Optional[int] = None  # None quando não há mais resultados
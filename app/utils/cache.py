@@ -0,0 +1,64 @@
+# D:\ProjectSGHSS\app\utils\cache.py
+# Cache em memória com expiração (TTL) para valores caros de recalcular, como totais de listagens
+
+import threading  # Acesso concorrente (threadpool do FastAPI)
+import time  # Relógio monotônico para a expiração
+import weakref  # Registro dos caches do processo (limpeza geral na restauração)
+from collections import OrderedDict  # Ordem de uso para descartar os mais antigos
+from typing import Any, Callable, Hashable  # Tipagens
+
+
+class CacheTTL:
+    """
+    Guarda valores por chave durante `ttl` segundos, até `tamanho_maximo`
+    chaves (descarta as usadas há mais tempo).
+
+    O cache é local ao processo: com vários workers os valores podem
+    divergir por até `ttl` segundos. Quem altera os dados chama `limpar()`
+    para que o próprio processo veja o valor novo imediatamente.
+
+    Cada `limpar()` avança a geração do cache; um valor calculado antes da
+    limpeza (possivelmente com dados antigos) não é guardado depois dela.
+    """
+
+    def __init__(self, ttl: float, tamanho_maximo: int = 1024):
+        self._ttl = ttl
+        self._tamanho_maximo = tamanho_maximo
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()  # chave -> (expira_em, valor)
+        self._geracao = 0  # Incrementada a cada limpar()
+        self._trava = threading.Lock()
+        _CACHES.add(self)
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor da chave, calculando-o (fora da trava) se ausente ou expirado."""
+        agora = time.monotonic()
+        with self._trava:
+            item = self._itens.get(chave)
+            if item and item[0] > agora:
+                self._itens.move_to_end(chave)
+                return item[1]
+            geracao = self._geracao
+
+        valor = calcular()
+        with self._trava:
+            if geracao != self._geracao:  # Limpo durante o cálculo: devolve sem guardar
+                return valor
+            self._itens[chave] = (agora + self._ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self._tamanho_maximo:
+                self._itens.popitem(last=False)
+        return valor
+
+    def limpar(self):
+        with self._trava:
+            self._geracao += 1
+            self._itens.clear()
+
+
+_CACHES: "weakref.WeakSet[CacheTTL]" = weakref.WeakSet()  # Todos os caches criados no processo
+
+
+def limpar_caches():
+    """Limpa todos os caches do processo (ex.: após restaurar o banco)."""
+    for cache in list(_CACHES):
+        cache.limpar()
@@ -0,0 +1,28 @@
+# D:\ProjectSGHSS\app\utils\datas.py
+# Formatação de datas no padrão brasileiro para listagens (sem strftime por linha)
+
+from datetime import date, datetime  # Tipos formatados
+from functools import lru_cache  # Datas repetidas entre as linhas de uma listagem
+from typing import Optional  # Tipagens
+
+# Todas as horas do dia ("00:00" a "23:59"), indexadas por minuto do dia
+HORAS_MINUTOS = tuple(f"{hora:02d}:{minuto:02d}" for hora in range(24) for minuto in range(60))
+
+
+@lru_cache(maxsize=4096)
+def _data_br(dia: date) -> str:
+    return f"{dia.day:02d}/{dia.month:02d}/{dia.year:04d}"
+
+
+def data_br(valor: Optional[date]) -> Optional[str]:
+    """dd/mm/yyyy (datetime ou date); None se vazio. Equivale a `strftime("%d/%m/%Y")`."""
+    if valor is None:
+        return None
+    return _data_br(valor.date() if isinstance(valor, datetime) else valor)
+
+
+def hora_br(valor: Optional[datetime]) -> Optional[str]:
+    """HH:MM; None se vazio. Equivale a `strftime("%H:%M")`."""
+    if valor is None:
+        return None
+    return HORAS_MINUTOS[valor.hour * 60 + valor.minute]
@@ -0,0 +1,33 @@
+# D:\ProjectSGHSS\app\utils\download.py
+# Envio de arquivos: ETag forte, requisições condicionais e transferência sem cópia
+
+from typing import Optional  # Tipagens
+
+from starlette.responses import FileResponse  # Resposta de arquivo com suporte a Range e pathsend
+
+
+def etag_forte(sha256: str) -> str:
+    """ETag derivada do hash do conteúdo: muda se, e somente se, o conteúdo mudar."""
+    return f'"{sha256}"'
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Avalia `If-None-Match` (lista de ETags ou `*`) com comparação fraca,
+    como pede a RFC 9110 para este cabeçalho.
+    """
+    if not if_none_match:
+        return False
+    candidatas = [valor.strip() for valor in if_none_match.split(",")]
+    if "*" in candidatas:
+        return True
+    return etag in (c[2:] if c.startswith("W/") else c for c in candidatas)
+
+
+class RespostaArquivo(FileResponse):
+    """
+    FileResponse do Starlette (Range, If-Range, HEAD e `pathsend`, quando o
+    servidor ASGI oferece a extensão) com blocos maiores na leitura comum.
+    Usa apenas a API pública: o envio sem cópia fica a cargo do `pathsend`.
+    """
+    chunk_size = 1024 * 1024  # 1 MiB por bloco na leitura comum
@@ -0,0 +1,78 @@
+# D:\ProjectSGHSS\app\utils\imagens.py
+# Renderização de miniaturas e prévias (executada nos processos do pool de derivados)
+# Não importa nada da aplicação: o módulo é carregado em cada processo filho
+
+import importlib.util  # Detecção do Pillow sem importá-lo
+import shutil  # Localização do pdftoppm
+import subprocess  # Renderização de PDF
+from pathlib import Path  # Manipulação de caminhos
+from typing import Dict, Optional, Tuple  # Tipagens
+
+QUALIDADE_JPEG = 80  # Qualidade das imagens geradas
+TEMPO_MAXIMO_PDF = 60  # Segundos para renderizar a primeira página
+
+
+def pillow_disponivel() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def pdftoppm_disponivel() -> bool:
+    return shutil.which("pdftoppm") is not None
+
+
+def suporta(tipo_conteudo: Optional[str]) -> bool:
+    """Indica se é possível gerar prévias para o tipo de conteúdo neste ambiente."""
+    tipo = (tipo_conteudo or "").lower()
+    if tipo == "application/pdf":
+        return pdftoppm_disponivel()
+    return tipo.startswith("image/") and tipo != "image/svg+xml" and pillow_disponivel()
+
+
+def gerar_derivados(origem: str, tipo_conteudo: str, destinos: Dict[str, Tuple[str, int]]) -> Dict[str, str]:
+    """
+    Gera uma imagem JPEG por variante em `destinos` ({variante: (caminho, lado máximo em px)}),
+    a partir de uma imagem ou da primeira página de um PDF.
+    Retorna {variante: caminho} das imagens geradas.
+    """
+    if (tipo_conteudo or "").lower() == "application/pdf":
+        return _derivados_pdf(origem, destinos)
+    return _derivados_imagem(origem, destinos)
+
+
+def _derivados_pdf(origem: str, destinos: Dict[str, Tuple[str, int]]) -> Dict[str, str]:
+    gerados = {}
+    for variante, (caminho, lado) in destinos.items():
+        prefixo = str(Path(caminho).with_suffix(""))
+        subprocess.run(
+            [
+                "pdftoppm", "-f", "1", "-l", "1", "-singlefile", "-jpeg",
+                "-jpegopt", f"quality={QUALIDADE_JPEG}", "-scale-to", str(lado), origem, prefixo
+            ],
+            check=True, capture_output=True, timeout=TEMPO_MAXIMO_PDF
+        )
+        gerados[variante] = f"{prefixo}.jpg"
+    return gerados
+
+
+def _derivados_imagem(origem: str, destinos: Dict[str, Tuple[str, int]]) -> Dict[str, str]:
+    from PIL import Image, ImageOps  # Dependência importada apenas nos processos do pool
+
+    gerados = {}
+    with Image.open(origem) as original:
+        maior = max(lado for _, lado in destinos.values())
+        original.draft("RGB", (maior, maior))  # JPEG: decodifica já em escala reduzida
+        imagem = ImageOps.exif_transpose(original)
+        if imagem.mode in ("RGBA", "LA", "P"):  # Transparência sobre fundo branco
+            imagem = imagem.convert("RGBA")
+            fundo = Image.new("RGB", imagem.size, "white")
+            fundo.paste(imagem, mask=imagem.getchannel("A"))
+            imagem = fundo
+        else:
+            imagem = imagem.convert("RGB")
+
+        # Da maior para a menor: cada variante parte da anterior, já reduzida
+        for variante, (caminho, lado) in sorted(destinos.items(), key=lambda item: -item[1][1]):
+            imagem.thumbnail((lado, lado))
+            imagem.save(caminho, "JPEG", quality=QUALIDADE_JPEG, optimize=True)
+            gerados[variante] = caminho
+    return gerados
@@ -0,0 +1,188 @@
+# D:\ProjectSGHSS\app\utils\importacao.py
+# Leitura em streaming de extratos financeiros (CSV e OFX) para importação em lote
+
+import csv  # Leitura de CSV linha a linha
+import hashlib  # Hash de deduplicação
+import re  # Tokenização de OFX
+from collections import Counter  # Ocorrências de linhas idênticas no mesmo arquivo
+from dataclasses import dataclass  # Estrutura de uma movimentação lida
+from datetime import datetime  # Datas das movimentações
+from typing import Iterator, Optional, TextIO, Tuple  # Tipagens
+
+from app.core.livro_caixa import para_centavos  # Conversão exata para centavos
+
+TAMANHO_BLOCO_LEITURA = 64 * 1024  # Bytes lidos por vez do arquivo OFX
+
+# Formatos de data aceitos no CSV
+FORMATOS_DATA_CSV = ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S",
+                     "%Y-%m-%dT%H:%M:%S")
+
+
+@dataclass
+class MovimentoImportado:
+    """Movimentação validada a partir de uma linha do arquivo."""
+    data: datetime
+    tipo: str  # ENTRADA ou SAIDA
+    descricao: str
+    valor_centavos: int  # Sempre positivo; o sentido vem de `tipo`
+    hash_importacao: str  # Chave de deduplicação
+
+
+# Resultado de cada linha: (número da linha, movimento ou None, mensagem de erro ou None)
+LinhaImportacao = Tuple[int, Optional[MovimentoImportado], Optional[str]]
+
+
+# ============================================================
+# Funções auxiliares
+# ============================================================
+def normalizar_valor(texto: str) -> int:
+    """
+    Converte um valor textual em centavos com sinal.
+    Aceita '1234.56', '1234,56', '1.234,56' e '-10,00'.
+    """
+    texto = texto.strip().replace(" ", "").replace("R$", "")
+    if "," in texto and "." in texto:
+        texto = texto.replace(".", "")  # Separador de milhar no formato brasileiro
+    return para_centavos(texto.replace(",", "."))
+
+
+def calcular_hash(*partes) -> str:
+    """Hash SHA-256 das partes que identificam a movimentação."""
+    return hashlib.sha256("|".join(str(p) for p in partes).encode("utf-8")).hexdigest()
+
+
+def _tipo_e_valor(tipo: Optional[str], centavos: int) -> Tuple[str, int]:
+    """Determina o tipo (explícito ou pelo sinal do valor) e devolve o valor absoluto."""
+    if tipo:
+        tipo = tipo.strip().upper()
+        if tipo in ("C", "CREDITO", "CRÉDITO", "CREDIT"):
+            tipo = "ENTRADA"
+        elif tipo in ("D", "DEBITO", "DÉBITO", "DEBIT"):
+            tipo = "SAIDA"
+        if tipo not in ("ENTRADA", "SAIDA"):
+            raise ValueError(f"tipo inválido '{tipo}'")
+    else:
+        tipo = "SAIDA" if centavos < 0 else "ENTRADA"
+    return tipo, abs(centavos)
+
+
+# ============================================================
+# CSV
+# ============================================================
+def ler_csv(fluxo: TextIO) -> Iterator[LinhaImportacao]:
+    """
+    Lê um CSV com cabeçalho contendo `data`, `descricao`, `valor` e, opcionalmente, `tipo`.
+    O separador (`;` ou `,`) é detectado pelo cabeçalho. Sem `tipo`, valores negativos
+    são SAIDA. Linhas idênticas no mesmo arquivo recebem hashes distintos pela ordem de ocorrência.
+    """
+    cabecalho = fluxo.readline()
+    separador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+    colunas = [c.strip().lower() for c in next(csv.reader([cabecalho], delimiter=separador))]
+    faltando = {"data", "descricao", "valor"} - set(colunas)
+    if faltando:
+        yield 1, None, f"cabeçalho sem as colunas: {', '.join(sorted(faltando))}"
+        return
+
+    ocorrencias = Counter()
+    for numero, registro in enumerate(csv.DictReader(fluxo, fieldnames=colunas, delimiter=separador), start=2):
+        try:
+            texto_data = (registro.get("data") or "").strip()
+            data = None
+            for formato in FORMATOS_DATA_CSV:
+                try:
+                    data = datetime.strptime(texto_data, formato)
+                    break
+                except ValueError:
+                    continue
+            if data is None:
+                raise ValueError(f"data inválida '{texto_data}'")
+
+            descricao = (registro.get("descricao") or "").strip()
+            if not descricao:
+                raise ValueError("descrição vazia")
+
+            tipo, centavos = _tipo_e_valor(registro.get("tipo"), normalizar_valor(registro.get("valor") or ""))
+            if centavos == 0:
+                raise ValueError("valor zerado")
+        except ValueError as e:
+            yield numero, None, str(e)
+            continue
+
+        chave = (data.isoformat(), tipo, centavos, descricao)
+        ocorrencias[chave] += 1
+        yield numero, MovimentoImportado(
+            data=data,
+            tipo=tipo,
+            descricao=descricao,
+            valor_centavos=centavos,
+            hash_importacao=calcular_hash("csv", *chave, ocorrencias[chave])
+        ), None
+
+
+# ============================================================
+# OFX
+# ============================================================
+_TOKEN_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _tokens_ofx(fluxo: TextIO) -> Iterator[Tuple[bool, str, str]]:
+    """Gera (fechamento, tag, valor) lendo o arquivo em blocos (OFX 1.x SGML e 2.x XML)."""
+    resto = ""
+    while True:
+        bloco = fluxo.read(TAMANHO_BLOCO_LEITURA)
+        texto = resto + bloco
+        if not bloco:  # Fim do arquivo: processa o que sobrou
+            for encontrado in _TOKEN_OFX.finditer(texto):
+                yield encontrado.group(1) == "/", encontrado.group(2).upper(), encontrado.group(3).strip()
+            return
+
+        # O último token pode estar incompleto: fica para o próximo bloco
+        corte = max(texto.rfind("<"), 0)
+        for encontrado in _TOKEN_OFX.finditer(texto, 0, corte):
+            yield encontrado.group(1) == "/", encontrado.group(2).upper(), encontrado.group(3).strip()
+        resto = texto[corte:]
+
+
+def _data_ofx(texto: str) -> datetime:
+    """Converte datas OFX (AAAAMMDD[HHMMSS[.XXX]][[-3:BRT]]) para datetime."""
+    digitos = re.match(r"\d+", texto)
+    if not digitos or len(digitos.group(0)) < 8:
+        raise ValueError(f"data inválida '{texto}'")
+    valor = digitos.group(0)
+    return datetime.strptime(valor[:14] if len(valor) >= 14 else valor[:8], "%Y%m%d%H%M%S" if len(valor) >= 14 else "%Y%m%d")
+
+
+def ler_ofx(fluxo: TextIO) -> Iterator[LinhaImportacao]:
+    """
+    Lê as transações (<STMTTRN>) de um extrato OFX.
+    A deduplicação usa o FITID do banco quando presente.
+    """
+    numero = 0
+    transacao = None
+    for fechamento, tag, valor in _tokens_ofx(fluxo):
+        if tag == "STMTTRN" and not fechamento:
+            numero += 1
+            transacao = {}
+        elif tag == "STMTTRN" and fechamento and transacao is not None:
+            try:
+                if "DTPOSTED" not in transacao or "TRNAMT" not in transacao:
+                    raise ValueError("transação sem DTPOSTED ou TRNAMT")
+                data = _data_ofx(transacao["DTPOSTED"])
+                tipo, centavos = _tipo_e_valor(None, normalizar_valor(transacao["TRNAMT"]))
+                if centavos == 0:
+                    raise ValueError("valor zerado")
+                descricao = transacao.get("MEMO") or transacao.get("NAME") or transacao.get("TRNTYPE") or "OFX"
+            except ValueError as e:
+                yield numero, None, str(e)
+            else:
+                identificador = transacao.get("FITID") or f"{data.isoformat()}|{centavos}|{descricao}|{numero}"
+                yield numero, MovimentoImportado(
+                    data=data,
+                    tipo=tipo,
+                    descricao=descricao,
+                    valor_centavos=centavos,
+                    hash_importacao=calcular_hash("ofx", identificador)
+                ), None
+            transacao = None
+        elif transacao is not None and not fechamento and valor:
+            transacao[tag] = valor
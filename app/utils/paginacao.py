@@ -0,0 +1,58 @@
+# D:\ProjectSGHSS\app\utils\paginacao.py
+# Cursores opacos para paginação por chave (keyset)
+
+import base64  # Codificação segura para URL
+from datetime import datetime  # Primeira chave do cursor
+from typing import Optional, Tuple  # Tipagens
+from fastapi import HTTPException  # Erro padronizado para cursor inválido
+
+
+def codificar_cursor(data: Optional[datetime], *chaves: int) -> str:
+    """
+    Gera um cursor opaco a partir da data/hora e das chaves de desempate
+    (ex.: id) do último item da página. Data ausente (NULL) vira texto vazio.
+    """
+    texto = "|".join([data.isoformat() if data is not None else ""] + [str(int(chave)) for chave in chaves])
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str, quantidade_chaves: int = 1, aceita_data_nula: bool = False) -> Tuple:
+    """
+    Converte um cursor gerado por `codificar_cursor` em (data, chave1, ...).
+    Com `aceita_data_nula`, a data vazia volta como None (listagens cuja
+    coluna de data admite NULL). Lança HTTPException 400 se o cursor estiver malformado.
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        partes = base64.urlsafe_b64decode(cursor + preenchimento).decode("utf-8").split("|")
+        if len(partes) != quantidade_chaves + 1:
+            raise ValueError("quantidade de chaves incorreta")
+        if partes[0] == "" and aceita_data_nula:
+            return (None, *(int(p) for p in partes[1:]))
+        return (datetime.fromisoformat(partes[0]), *(int(p) for p in partes[1:]))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+
+
+def codificar_cursor_inteiros(*chaves: int) -> str:
+    """
+    Gera um cursor opaco para ordenações por chaves inteiras
+    (ex.: folga de estoque e id).
+    """
+    texto = "|".join(str(int(chave)) for chave in chaves)
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor_inteiros(cursor: str, quantidade_chaves: int) -> Tuple[int, ...]:
+    """
+    Converte um cursor gerado por `codificar_cursor_inteiros` na tupla de chaves.
+    Lança HTTPException 400 se o cursor estiver malformado.
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        partes = base64.urlsafe_b64decode(cursor + preenchimento).decode("utf-8").split("|")
+        if len(partes) != quantidade_chaves:
+            raise ValueError("quantidade de chaves incorreta")
+        return tuple(int(p) for p in partes)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
@@ -0,0 +1,54 @@
+# D:\ProjectSGHSS\app\utils\projecao.py
+# Projeções esparsas (`fields=`) para listagens: só as colunas pedidas, sem instanciar objetos ORM
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple  # Tipagens
+
+from fastapi import HTTPException  # Erro padronizado para campos inválidos
+from sqlalchemy.orm import Query, Session  # Consultas ORM
+
+RESUMO = "resumo"  # Valor de `fields` que seleciona a projeção compacta do recurso
+
+
+class Projecao:
+    """
+    Colunas de um modelo que uma listagem pode devolver em `fields=`.
+
+    - `campos`: nomes permitidos (os do schema de resposta completo)
+    - `resumo`: projeção usada com `fields=resumo` (ex.: id + nome para autocompletar)
+
+    As linhas são lidas como tuplas (`db.query(coluna, ...)`) e convertidas
+    direto em dicionários, sem objetos ORM nem validação do schema completo;
+    datas e enums ficam para o orjson (`RespostaJSON`).
+    """
+
+    def __init__(self, modelo, campos: Iterable[str], resumo: Sequence[str]):
+        self.colunas = {nome: getattr(modelo, nome) for nome in campos}
+        self.resumo = tuple(resumo)
+
+    def resolver(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Nomes das colunas pedidas em `fields` (separados por vírgula), com
+        `id` sempre primeiro. Retorna None sem `fields` (resposta completa).
+        Lança HTTPException 400 para campos desconhecidos.
+        """
+        if fields is None or not fields.strip():
+            return None
+        if fields.strip().lower() == RESUMO:
+            return self.resumo
+        nomes = [nome.strip() for nome in fields.split(",") if nome.strip()]
+        desconhecidos = sorted(set(nomes) - set(self.colunas))
+        if desconhecidos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos: {', '.join(desconhecidos)} (disponíveis: {', '.join(self.colunas)}, ou '{RESUMO}')"
+            )
+        return tuple(dict.fromkeys(["id", *nomes]))  # Sem repetições, na ordem pedida
+
+    def consultar(self, db: Session, nomes: Sequence[str]) -> Query:
+        """Consulta que seleciona somente as colunas `nomes`."""
+        return db.query(*(self.colunas[nome] for nome in nomes))
+
+    @staticmethod
+    def serializar(linhas: Iterable[tuple], nomes: Sequence[str]) -> List[Dict[str, Any]]:
+        """Converte as tuplas de `consultar` em dicionários (responder com `RespostaJSON`)."""
+        return [dict(zip(nomes, linha)) for linha in linhas]
@@ -0,0 +1,52 @@
+# D:\ProjectSGHSS\app\utils\respostas.py
+# Respostas JSON: serialização com orjson e listas validadas por TypeAdapter pré-compilado
+
+from typing import Any, List, Type  # Tipagens
+
+import orjson  # Serialização JSON em código nativo (datas, enums e dataclasses sem conversão prévia)
+from fastapi.encoders import jsonable_encoder  # Tipos que o orjson não conhece (Decimal, modelos Pydantic...)
+from pydantic import BaseModel, TypeAdapter  # Validação e serialização das listas
+from starlette.responses import JSONResponse, Response  # Respostas HTTP
+
+OPCOES_ORJSON = orjson.OPT_NON_STR_KEYS  # Chaves int/date em dicionários (ex.: totais por dia)
+
+
+def _converter(valor: Any) -> Any:
+    """Chamado pelo orjson apenas para valores que ele não serializa sozinho."""
+    return jsonable_encoder(valor)
+
+
+def serializar_json(conteudo: Any) -> bytes:
+    """JSON em bytes, com a mesma representação de datas do `jsonable_encoder` (ISO 8601)."""
+    return orjson.dumps(conteudo, default=_converter, option=OPCOES_ORJSON)
+
+
+class RespostaJSON(JSONResponse):
+    """
+    Resposta padrão da aplicação (`default_response_class`): renderiza com
+    orjson. Rotas que retornam dicionários podem devolver `RespostaJSON(...)`
+    diretamente para dispensar também a passagem pelo `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return serializar_json(content)
+
+
+class ListaJSON:
+    """
+    Serializador de uma lista de `schema`, com o TypeAdapter compilado uma
+    única vez (no import do roteador). Valida objetos ORM ou dicionários
+    (`from_attributes`) e gera o JSON direto no núcleo do Pydantic, sem
+    montar a lista intermediária de dicionários.
+
+    A rota mantém `response_model=List[schema]` para a documentação.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.adaptador = TypeAdapter(List[schema])
+
+    def serializar(self, itens) -> bytes:
+        return self.adaptador.dump_json(self.adaptador.validate_python(itens, from_attributes=True))
+
+    def responder(self, itens, status_code: int = 200) -> Response:
+        return Response(self.serializar(itens), status_code=status_code, media_type="application/json")
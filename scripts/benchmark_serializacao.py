@@ -0,0 +1,148 @@
+# D:\ProjectSGHSS\scripts\benchmark_serializacao.py
+# Custo de serialização das listagens por 1.000 linhas: caminho anterior x atual
+#
+# Uso: python -m scripts.benchmark_serializacao [--linhas 1000] [--repeticoes 20]
+#
+# Mede só a montagem do JSON (sem banco nem HTTP), com objetos ORM em memória:
+# - anterior: strftime por linha + jsonable_encoder + json.dumps (JSONResponse padrão)
+# - atual: formatação de datas com cache/tabela, TypeAdapter pré-compilado e orjson
+
+import argparse  # Parâmetros da linha de comando
+import json  # Serialização anterior (JSONResponse do Starlette)
+import time  # Cronometragem
+from datetime import date, datetime, timedelta  # Dados sintéticos
+from typing import Callable, List  # Tipagens
+
+from fastapi.encoders import jsonable_encoder  # Conversão usada antes em toda resposta
+from pydantic import TypeAdapter  # Validação da resposta (response_model)
+
+from app import models as m  # Modelos ORM (instâncias transitórias, sem sessão)
+from app.api.v1.suprimento import formatar_data_retorno  # Formatação atual de suprimentos
+from app.schemas import PacienteResponse  # Schema da listagem de pacientes
+from app.schemas.suprimento import SuprimentoResponse  # Schema da listagem de suprimentos
+from app.utils.datas import data_br, hora_br  # Formatação atual de datas
+from app.utils.respostas import ListaJSON, serializar_json  # Serialização atual
+
+
+def json_padrao(conteudo) -> bytes:
+    """Renderização do JSONResponse padrão."""
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+# ============================================================
+# Dados sintéticos
+# ============================================================
+def gerar_dados(linhas: int):
+    inicio = datetime(2025, 1, 1, 8, 0)
+    consultas = [
+        m.Consulta(
+            id=i, paciente_id=i % 500 + 1, medico_id=i % 40 + 1, data_hora=inicio + timedelta(minutes=30 * i),
+            duracao_minutos=30, status=m.StatusConsulta.AGENDADA, observacoes="Retorno"
+        )
+        for i in range(linhas)
+    ]
+    pacientes = [
+        m.Paciente(
+            id=i, nome=f"Paciente {i}", email=f"paciente{i}@teste.com", telefone="47999999999",
+            cpf=f"{i:011d}", data_nascimento=date(1980, 1, 1) + timedelta(days=i), endereco="Rua Geral, 100",
+            criado_em=inicio, atualizado_em=inicio
+        )
+        for i in range(linhas)
+    ]
+    suprimentos = [
+        m.Suprimento(
+            id=i, nome=f"Item {i}", quantidade=i, nivel_reposicao=10,
+            data_validade=date(2026, 1, 1) + timedelta(days=i % 365), descricao="Caixa"
+        )
+        for i in range(linhas)
+    ]
+    return consultas, pacientes, suprimentos
+
+
+# ============================================================
+# Caminhos anterior e atual
+# ============================================================
+def consultas_anterior(consultas) -> bytes:
+    itens = [{
+        "id": c.id, "paciente_id": c.paciente_id, "medico_id": c.medico_id,
+        "data_consulta": c.data_hora.strftime("%d/%m/%Y"), "hora_consulta": c.data_hora.strftime("%H:%M"),
+        "duracao_minutos": c.duracao_minutos, "status": c.status.value, "observacoes": c.observacoes
+    } for c in consultas]
+    return json_padrao(jsonable_encoder({"items": itens, "proximo_cursor": None, "total": None}))
+
+
+def consultas_atual(consultas) -> bytes:
+    itens = [{
+        "id": c.id, "paciente_id": c.paciente_id, "medico_id": c.medico_id,
+        "data_consulta": data_br(c.data_hora), "hora_consulta": hora_br(c.data_hora),
+        "duracao_minutos": c.duracao_minutos, "status": c.status.value, "observacoes": c.observacoes
+    } for c in consultas]
+    return serializar_json({"items": itens, "proximo_cursor": None, "total": None})
+
+
+ADAPTADOR_PACIENTES = TypeAdapter(List[PacienteResponse])
+LISTA_PACIENTES = ListaJSON(PacienteResponse)
+
+
+def pacientes_anterior(pacientes) -> bytes:
+    validados = ADAPTADOR_PACIENTES.validate_python(pacientes, from_attributes=True)
+    return json_padrao(jsonable_encoder(validados))
+
+
+def pacientes_atual(pacientes) -> bytes:
+    return LISTA_PACIENTES.serializar(pacientes)
+
+
+ADAPTADOR_SUPRIMENTOS = TypeAdapter(List[SuprimentoResponse])
+LISTA_SUPRIMENTOS = ListaJSON(SuprimentoResponse)
+
+
+def suprimentos_anterior(suprimentos) -> bytes:
+    itens = [{
+        "id": s.id, "nome": s.nome, "quantidade": s.quantidade, "nivel_reposicao": s.nivel_reposicao,
+        "data_validade": s.data_validade.strftime("%d/%m/%Y") if s.data_validade else None, "descricao": s.descricao
+    } for s in suprimentos]
+    return json_padrao(jsonable_encoder(ADAPTADOR_SUPRIMENTOS.validate_python(itens)))
+
+
+def suprimentos_atual(suprimentos) -> bytes:
+    return LISTA_SUPRIMENTOS.serializar([formatar_data_retorno(s) for s in suprimentos])
+
+
+# ============================================================
+# Medição
+# ============================================================
+def medir(funcao: Callable, dados, repeticoes: int) -> float:
+    """Melhor tempo (ms) entre as repetições."""
+    funcao(dados)  # Aquecimento (caches, TypeAdapter)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(dados)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de serialização das listagens")
+    parser.add_argument("--linhas", type=int, default=1000, help="Linhas por listagem")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Repetições (vale o melhor tempo)")
+    args = parser.parse_args()
+
+    consultas, pacientes, suprimentos = gerar_dados(args.linhas)
+    casos = [
+        ("consultas", consultas, consultas_anterior, consultas_atual),
+        ("pacientes", pacientes, pacientes_anterior, pacientes_atual),
+        ("suprimentos", suprimentos, suprimentos_anterior, suprimentos_atual),
+    ]
+    escala = 1000 / args.linhas
+    print(f"{'listagem':<12} {'anterior (ms/1000)':>19} {'atual (ms/1000)':>16} {'ganho':>7}")
+    for nome, dados, anterior, atual in casos:
+        assert json.loads(anterior(dados)) == json.loads(atual(dados)), f"{nome}: JSON diferente"
+        antes = medir(anterior, dados, args.repeticoes) * escala
+        depois = medir(atual, dados, args.repeticoes) * escala
+        print(f"{nome:<12} {antes:>19.2f} {depois:>16.2f} {antes / depois:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
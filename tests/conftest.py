@@ -0,0 +1,50 @@
+# D:\ProjectSGHSS\tests\conftest.py
+# Configuração dos testes: banco, backups e anexos isolados em um diretório temporário
+
+import os  # Diretório de trabalho e variáveis de ambiente
+import shutil  # Remoção do diretório temporário
+import sys  # Raiz do projeto no caminho de importação
+import tempfile  # Diretório isolado por execução
+import uuid  # Sufixos únicos para e-mails, CRMs e CPFs
+from pathlib import Path  # Manipulação de caminhos
+
+import pytest  # Fixtures
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+# A aplicação usa caminhos relativos (./sghss.db, backups/, uploads/): roda dentro do diretório temporário
+DIRETORIO_TESTES = Path(tempfile.mkdtemp(prefix="sghss-testes-"))
+os.chdir(DIRETORIO_TESTES)
+os.environ["BACKUP_INTERVALO_HORAS"] = "0"  # Sem backups agendados durante os testes
+
+from fastapi.testclient import TestClient  # noqa: E402  (depois do chdir)
+from app.main import app  # noqa: E402
+
+ADMIN = ("admin@teste.com", "123456")  # Usuário criado por popular_dados
+
+
+def pytest_sessionfinish(session, exitstatus):
+    os.chdir(RAIZ)
+    shutil.rmtree(DIRETORIO_TESTES, ignore_errors=True)
+
+
+def sufixo() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def entrar(email: str, senha: str = "123456") -> TestClient:
+    """Cliente autenticado (cookie do login) como o usuário informado."""
+    cliente = TestClient(app)
+    resposta = cliente.post("/api/v1/autenticacao/login", data={"username": email, "password": senha})
+    assert resposta.status_code == 200, resposta.text
+    return cliente
+
+
+@pytest.fixture(scope="session")
+def admin():
+    """Cliente ADMIN; o `with` executa o ciclo de vida (migrações e dados iniciais)."""
+    with TestClient(app) as cliente:
+        resposta = cliente.post("/api/v1/autenticacao/login", data={"username": ADMIN[0], "password": ADMIN[1]})
+        assert resposta.status_code == 200, resposta.text
+        yield cliente
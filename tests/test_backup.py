@@ -0,0 +1,87 @@
+# D:\ProjectSGHSS\tests\test_backup.py
+# Backup completo -> incremental -> restauração: o banco volta exatamente ao estado do instantâneo
+
+import sqlite3  # Leitura dos bancos reconstruídos
+from datetime import datetime, timedelta  # Datas retroativas no catálogo
+from pathlib import Path  # Arquivos temporários
+
+import pytest  # Asserções de exceção
+
+from app.core.backup import (  # Geração, retenção e reconstrução
+    CAMINHO_BANCO,
+    RETER_DIARIOS,
+    OrigemForaDaRetencao,
+    criar_backup,
+    reconstruir,
+)
+from app.db.catalogo import SessaoCatalogo  # Catálogo dos backups
+from app.models import Backup  # Modelo do catálogo
+from app.core.restauracao import restaurar_arquivo  # Troca do banco em uso
+from conftest import sufixo  # Descrições únicas
+
+
+def lancar(cliente, descricao: str):
+    resposta = cliente.post("/api/v1/financeiro/financeiro", params={"tipo": "ENTRADA", "descricao": descricao, "valor": "10"})
+    assert resposta.status_code == 201, resposta.text
+
+
+def descricoes(caminho: Path, prefixo: str) -> set:
+    banco = sqlite3.connect(caminho)
+    try:
+        assert banco.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        return {linha[0] for linha in banco.execute("SELECT descricao FROM financeiro WHERE descricao LIKE ?", (f"{prefixo}%",))}
+    finally:
+        banco.close()
+
+
+def test_backup_incremental_e_restauracao(admin, tmp_path):
+    s = sufixo()
+    lancar(admin, f"{s}-antes-do-completo")
+    completo = criar_backup()
+
+    lancar(admin, f"{s}-antes-do-incremental")
+    incremental = criar_backup(desde=completo.id)
+    assert incremental.origem_id == completo.id
+    assert incremental.paginas_gravadas < incremental.total_paginas  # Só as páginas alteradas
+
+    lancar(admin, f"{s}-depois-do-incremental")
+
+    # Reconstrução de cada ponto da cadeia
+    reconstruir(completo.id, tmp_path / "completo.db")
+    assert descricoes(tmp_path / "completo.db", s) == {f"{s}-antes-do-completo"}
+
+    reconstruir(incremental.id, tmp_path / "incremental.db")
+    assert descricoes(tmp_path / "incremental.db", s) == {f"{s}-antes-do-completo", f"{s}-antes-do-incremental"}
+
+    # Restauração do banco em uso a partir do incremental reconstruído
+    with open(tmp_path / "incremental.db", "rb") as origem:
+        restaurar_arquivo(origem, tmp_path)
+    assert descricoes(CAMINHO_BANCO, s) == {f"{s}-antes-do-completo", f"{s}-antes-do-incremental"}
+
+    # A aplicação segue atendendo sobre o banco restaurado
+    resposta = admin.get("/api/v1/financeiro/financeiro", params={"tamanho": 500})
+    assert resposta.status_code == 200
+    assert {item["descricao"] for item in resposta.json()["items"] if item["descricao"].startswith(s)} == {
+        f"{s}-antes-do-completo", f"{s}-antes-do-incremental"
+    }
+
+
+def test_incremental_recusado_fora_da_retencao_diaria(admin):
+    # Um completo por dia (com o de hoje, RETER_DIARIOS dias) e um mais antigo, retido só como mensal
+    completos = []
+    for dias in [60, *range(RETER_DIARIOS - 1, 0, -1)]:
+        completos.append(criar_backup())
+        with SessaoCatalogo() as catalogo:  # Retroage antes do próximo, que aplica a retenção
+            catalogo.get(Backup, completos[-1].id).criado_em = datetime.now() - timedelta(days=dias)
+            catalogo.commit()
+    completos.append(criar_backup())
+    antigo = completos[0]
+
+    with pytest.raises(OrigemForaDaRetencao):
+        criar_backup(desde=antigo.id)
+    assert admin.get("/api/v1/backup/exportar", params={"desde": antigo.id}).status_code == 400
+
+    incremental = criar_backup(desde=completos[-1].id)  # Cadeia diária segue aceitando incrementais
+    with SessaoCatalogo() as catalogo:
+        assert catalogo.get(Backup, incremental.id) is not None
+        assert catalogo.get(Backup, antigo.id) is not None
@@ -0,0 +1,103 @@
+# D:\ProjectSGHSS\tests\test_escopo.py
+# Escopo por papel: médico só enxerga pacientes e prontuários com quem tem vínculo
+
+import pytest  # Fixtures
+
+from conftest import entrar, sufixo  # Login e dados únicos
+
+
+@pytest.fixture(scope="module")
+def cenario(admin):
+    """Médicos A e B com usuários vinculados; paciente atendido apenas por A."""
+    s = sufixo()
+    medicos = {}
+    for nome in ("a", "b"):
+        email = f"medico-{nome}-{s}@teste.com"
+        resposta = admin.post("/api/v1/medicos/", data={"nome": f"Dr. {nome.upper()}", "crm": f"{nome}{s}", "email": email})
+        assert resposta.status_code in (200, 201), resposta.text
+        medicos[nome] = resposta.json()["id"]
+        resposta = admin.post("/api/v1/autenticacao/register", data={"email": email, "password": "123456", "papel": "MEDICO"})
+        assert resposta.status_code in (200, 201), resposta.text
+
+    resposta = admin.post("/api/v1/pacientes/", data={
+        "nome": "Paciente do A", "email": f"paciente-{s}@teste.com", "cpf": f"{s}000"[:11], "data_nascimento": "01/01/1990"
+    })
+    assert resposta.status_code in (200, 201), resposta.text
+    paciente_id = resposta.json()["id"]
+
+    resposta = admin.post("/api/v1/consultas/", params={
+        "paciente_id": paciente_id, "medico_id": medicos["a"], "data_consulta": "10/10/2030", "hora_consulta": "10:00"
+    })
+    assert resposta.status_code in (200, 201), resposta.text
+    resposta = admin.post("/api/v1/teleconsultas/", data={"consulta_id": resposta.json()["id"], "link_video": "https://video/a"})
+    assert resposta.status_code in (200, 201), resposta.text
+
+    resposta = admin.post(
+        "/api/v1/prontuario/",
+        data={"paciente_id": paciente_id, "medico_id": medicos["a"], "descricao": "Evolução"},
+        files={"arquivo": ("exame.txt", b"resultado", "text/plain")}
+    )
+    assert resposta.status_code in (200, 201), resposta.text
+
+    return {
+        "paciente_id": paciente_id,
+        "prontuario_id": resposta.json()["id"],
+        "medico_a": entrar(f"medico-a-{s}@teste.com"),
+        "medico_b": entrar(f"medico-b-{s}@teste.com"),
+    }
+
+
+def rotas_do_paciente(cenario):
+    return [
+        f"/api/v1/pacientes/{cenario['paciente_id']}",
+        f"/api/v1/pacientes/{cenario['paciente_id']}/linha-do-tempo",
+        f"/api/v1/prontuario/{cenario['prontuario_id']}/anexo",
+    ]
+
+
+def test_medico_responsavel_acessa_paciente(cenario):
+    for rota in rotas_do_paciente(cenario):
+        assert cenario["medico_a"].get(rota).status_code == 200, rota
+
+
+def test_outro_medico_nao_le_paciente(cenario):
+    for rota in rotas_do_paciente(cenario):
+        assert cenario["medico_b"].get(rota).status_code == 403, rota
+
+
+def test_outro_medico_nao_substitui_anexo(cenario):
+    resposta = cenario["medico_b"].put(
+        f"/api/v1/prontuario/{cenario['prontuario_id']}/anexo",
+        content=b"alterado",
+        headers={"content-type": "text/plain"}
+    )
+    assert resposta.status_code == 403
+
+
+def test_listagens_filtradas_pelo_escopo(cenario):
+    ids_a = [p["id"] for p in cenario["medico_a"].get("/api/v1/pacientes/", params={"fields": "resumo"}).json()]
+    ids_b = [p["id"] for p in cenario["medico_b"].get("/api/v1/pacientes/", params={"fields": "resumo"}).json()]
+    assert cenario["paciente_id"] in ids_a
+    assert cenario["paciente_id"] not in ids_b
+
+    assert cenario["medico_b"].get("/api/v1/consultas/").json()["items"] == []
+    assert cenario["medico_b"].get("/api/v1/prontuario/").json() == []
+
+
+def test_busca_filtrada_pelo_escopo(cenario):
+    ids_a = [p["id"] for p in cenario["medico_a"].get("/api/v1/pacientes/busca", params={"q": "Paciente"}).json()["items"]]
+    assert cenario["paciente_id"] in ids_a
+    assert cenario["medico_b"].get("/api/v1/pacientes/busca", params={"q": "Paciente"}).json()["items"] == []
+
+
+def test_outro_medico_nao_atualiza_paciente(cenario):
+    resposta = cenario["medico_b"].put(f"/api/v1/pacientes/{cenario['paciente_id']}", params={"endereco": "Rua X"})
+    assert resposta.status_code == 403
+
+
+def test_relatorio_de_teleconsultas_filtrado_pelo_escopo(cenario):
+    rota = "/api/v1/relatorios/relatorios/teleconsultas"
+    params = {"data_inicial": "01/01/2000", "data_final": "31/12/2099"}
+    nomes_a = [t["paciente_nome"] for t in cenario["medico_a"].get(rota, params=params).json()["items"]]
+    assert "Paciente do A" in nomes_a
+    assert cenario["medico_b"].get(rota, params=params).json()["items"] == []
@@ -0,0 +1,29 @@
+# D:\ProjectSGHSS\tests\test_importacao.py
+# Importação de extratos: reimportar o mesmo arquivo não duplica movimentações
+
+from conftest import sufixo  # Descrições únicas
+
+
+def importar(cliente, conteudo: str):
+    resposta = cliente.post(
+        "/api/v1/financeiro/financeiro/importar",
+        files={"arquivo": ("extrato.csv", conteudo.encode("utf-8"), "text/csv")}
+    )
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def test_reimportacao_conta_duplicados(admin):
+    s = sufixo()
+    conteudo = f"data;descricao;valor\n01/02/2025;{s}-a;10,00\n02/02/2025;{s}-b;-4,50\n"
+
+    primeira = importar(admin, conteudo)
+    assert (primeira["importados"], primeira["duplicados"]) == (2, 0)
+
+    conteudo += f"03/02/2025;{s}-c;1,00\n"
+    segunda = importar(admin, conteudo)
+    assert (segunda["importados"], segunda["duplicados"]) == (1, 2)
+    assert float(segunda["total_entradas"]) == 1.0 and float(segunda["total_saidas"]) == 0.0
+
+    itens = admin.get("/api/v1/financeiro/financeiro", params={"tamanho": 500}).json()["items"]
+    assert sorted(i["descricao"] for i in itens if i["descricao"].startswith(s)) == [f"{s}-a", f"{s}-b", f"{s}-c"]
@@ -0,0 +1,33 @@
+# D:\ProjectSGHSS\tests\test_leito.py
+# Leitos: criação sem paciente e no máximo um leito por paciente
+
+from conftest import sufixo  # Dados únicos
+
+
+def criar(cliente, status_leito: str, **extras):
+    return cliente.post("/api/v1/leito/leitos", data={"numero": sufixo(), "status_leito": status_leito, **extras})
+
+
+def test_leito_nasce_sem_paciente(admin):
+    paciente_id = admin.get("/api/v1/pacientes/", params={"fields": "resumo"}).json()[0]["id"]
+    assert criar(admin, "Ocupado").status_code == 400
+    assert criar(admin, "Livre", paciente_id=paciente_id).status_code == 400
+    resposta = criar(admin, "Manutenção")
+    assert resposta.status_code == 201, resposta.text
+    assert resposta.json()["paciente_id"] is None
+
+
+def test_paciente_ocupa_um_leito(admin):
+    ala = f"ALA-{sufixo()}"
+    for _ in range(2):
+        assert criar(admin, "Livre", ala=ala).status_code == 201
+    resposta = admin.post("/api/v1/pacientes/", data={
+        "nome": "Internado", "email": f"internado-{sufixo()}@teste.com", "cpf": sufixo()[:8] + "000", "data_nascimento": "01/01/1980"
+    })
+    assert resposta.status_code in (200, 201), resposta.text
+    paciente_id = resposta.json()["id"]
+
+    assert admin.post("/api/v1/leito/alocar", data={"paciente_id": paciente_id, "ala": ala}).status_code == 200
+    assert admin.post("/api/v1/leito/alocar", data={"paciente_id": paciente_id, "ala": ala}).status_code == 409
+    ocupacao = admin.get("/api/v1/leito/ocupacao", params={"ala": ala}).json()
+    assert (ocupacao["ocupados"], ocupacao["livres"]) == (1, 1)
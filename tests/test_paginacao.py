@@ -0,0 +1,70 @@
+# D:\ProjectSGHSS\tests\test_paginacao.py
+# Cursores de paginação: ida e volta, cursores inválidos e percurso completo de uma listagem
+
+import sqlite3  # Datas nulas gravadas direto no banco
+from datetime import datetime  # Chaves dos cursores
+
+import pytest  # Asserções de exceção
+from fastapi import HTTPException  # Erro de cursor inválido
+
+from app.utils.paginacao import (
+    codificar_cursor,
+    decodificar_cursor,
+    codificar_cursor_inteiros,
+    decodificar_cursor_inteiros,
+)
+from conftest import sufixo  # Descrições únicas
+
+
+def test_cursor_ida_e_volta():
+    momento = datetime(2025, 3, 9, 14, 30, 15, 123456)
+    assert decodificar_cursor(codificar_cursor(momento, 42)) == (momento, 42)
+    assert decodificar_cursor(codificar_cursor(momento, 7, 3), 2) == (momento, 7, 3)
+    assert decodificar_cursor_inteiros(codificar_cursor_inteiros(-5, 12), 2) == (-5, 12)
+
+
+def test_cursor_com_data_nula():
+    cursor = codificar_cursor(None, 9)
+    assert decodificar_cursor(cursor, aceita_data_nula=True) == (None, 9)
+    with pytest.raises(HTTPException) as erro:
+        decodificar_cursor(cursor)  # Listagens com data obrigatória recusam
+    assert erro.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["", "###", "bm9wZQ", codificar_cursor(datetime(2025, 1, 1), 1, 2)])
+def test_cursor_invalido(cursor):
+    with pytest.raises(HTTPException) as erro:
+        decodificar_cursor(cursor)
+    assert erro.value.status_code == 400
+
+
+def test_listagem_por_cursor_percorre_tudo(admin):
+    s = sufixo()
+    for i in range(7):
+        resposta = admin.post("/api/v1/financeiro/financeiro", params={"tipo": "ENTRADA", "descricao": f"{s}-{i}", "valor": "1.50"})
+        assert resposta.status_code == 201, resposta.text
+
+    banco = sqlite3.connect("sghss.db")
+    try:  # Registros de versões antigas podem não ter data
+        banco.execute("UPDATE financeiro SET data = NULL WHERE descricao IN (?, ?)", (f"{s}-5", f"{s}-6"))
+        banco.commit()
+        esperado = [linha[0] for linha in banco.execute(
+            "SELECT id FROM financeiro ORDER BY data IS NULL, data DESC, id DESC"
+        )]
+    finally:
+        banco.close()
+
+    for tamanho in (1, 2, 3, 500):
+        vistos, cursor = [], None
+        while True:
+            params = {"tamanho": tamanho, **({"cursor": cursor} if cursor else {})}
+            resposta = admin.get("/api/v1/financeiro/financeiro", params=params)
+            assert resposta.status_code == 200, resposta.text
+            pagina = resposta.json()
+            vistos += [item["id"] for item in pagina["items"]]
+            cursor = pagina["proximo_cursor"]
+            if not cursor:
+                break
+        assert vistos == esperado, tamanho
+
+    assert admin.get("/api/v1/financeiro/financeiro", params={"cursor": "lixo"}).status_code == 400